@@ -1,11 +1,15 @@
+from app.backend.claude_sdk.claude_capacity_error import ClaudeCapacityError
 from app.backend.claude_sdk.claude_config_file_manager import ClaudeConfigFileManager
 from app.backend.claude_sdk.claude_message_serializer import ClaudeMessageSerializer
+from app.backend.claude_sdk.claude_process_slots import ClaudeProcessSlots
 from app.backend.claude_sdk.claude_runtime_registry import ClaudeRuntimeRegistry
 from app.backend.claude_sdk.default_permission_mode import DefaultPermissionModeResolver
 
 __all__ = [
+    "ClaudeCapacityError",
     "ClaudeConfigFileManager",
     "ClaudeMessageSerializer",
+    "ClaudeProcessSlots",
     "ClaudeRuntimeRegistry",
     "DefaultPermissionModeResolver",
 ]
@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+
+class ClaudeCapacityError(RuntimeError):
+    # Raised when a Claude CLI process cannot be started because every process slot is taken.
+    pass
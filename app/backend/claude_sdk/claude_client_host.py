@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from typing import Any
+
+from app.backend.claude_sdk.claude_capacity_error import ClaudeCapacityError
+from app.backend.claude_sdk.claude_process_slots import ClaudeProcessSlots
+from app.backend.claude_sdk.sdk_types import (
+    ClaudeOptions,
+    ClaudeSDKClient,
+    PermissionResultAllow,
+    PermissionResultDeny,
+    ToolPermissionContext,
+)
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
+
+ToolPermissionHandler = Callable[
+    [str, dict[str, Any], ToolPermissionContext],
+    Awaitable[PermissionResultAllow | PermissionResultDeny],
+]
+
+
+class ClaudeClientHost:
+    # The SDK client keeps an anyio task group open from connect() until disconnect(), and that
+    # task group must be entered and exited by the same task. The host owns a dedicated task so a
+    # connected client can be reused by later requests and still be disconnected cleanly.
+    def __init__(
+        self,
+        options: ClaudeOptions,
+        *,
+        route_tool_permissions: bool = False,
+        process_slots: ClaudeProcessSlots | None = None,
+    ) -> None:
+        # Permission prompts are answered by whichever runtime currently owns the host, so a pooled
+        # host can be spawned before anyone is there to answer them.
+        self._options = replace(options, can_use_tool=self._can_use_tool) if route_tool_permissions else options
+        self.tool_permission_handler: ToolPermissionHandler | None = None
+        self._client: ClaudeSDKClient | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._stop_event = asyncio.Event()
+        self._process_slots = process_slots
+        self._holds_slot = False
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+    @property
+    def client(self) -> ClaudeSDKClient:
+        if self._client is None:
+            raise RuntimeError("Claude client host is not connected")
+        return self._client
+
+    async def start(self, *, wait_for_slot: bool = True) -> None:
+        # The process slot is taken before the CLI is spawned; without waiting, a full cap raises at once.
+        if self._process_slots is not None:
+            if wait_for_slot:
+                await self._process_slots.acquire()
+            elif not self._process_slots.try_acquire():
+                raise ClaudeCapacityError("No free Claude process slot")
+            self._holds_slot = True
+        ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        self._task.add_done_callback(lambda _: self._release_slot())
+        try:
+            await ready
+        except BaseException:
+            # A caller cancelled mid-connect must not leave a connected CLI behind that nobody references.
+            self._stop_event.set()
+            task = self._task
+            task.cancel()
+            try:
+                await task
+            except BaseException:
+                pass
+            self._release_slot()
+            raise
+
+    def is_alive(self) -> bool:
+        if self._client is None or self._task is None or self._task.done():
+            return False
+        transport = getattr(self._client, "_transport", None)
+        if transport is None:
+            return False
+        is_ready = getattr(transport, "is_ready", None)
+        if callable(is_ready) and not is_ready():
+            return False
+        process = getattr(transport, "_process", None)
+        if process is not None and getattr(process, "returncode", None) is not None:
+            return False
+        return True
+
+    def mark_used(self) -> None:
+        self.last_used_at = time.monotonic()
+
+    async def close(self) -> None:
+        self._stop_event.set()
+        task = self._task
+        if task is None or task is asyncio.current_task():
+            return
+        try:
+            await task
+        except Exception as exc:
+            logging.getLogger(__name__).warning("[runtime] disconnect warning: %s", exc)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        if self._holds_slot and self._process_slots is not None:
+            self._holds_slot = False
+            self._process_slots.release()
+
+    async def _can_use_tool(
+        self,
+        tool_name: str,
+        tool_input: dict[str, Any],
+        context: ToolPermissionContext,
+    ) -> PermissionResultAllow | PermissionResultDeny:
+        handler = self.tool_permission_handler
+        if handler is None:
+            result = PermissionResultDeny(message=Constants.TOOL_PERMISSION_DENIED_MESSAGE)
+            return result
+        result = await handler(tool_name, tool_input, context)
+        return result
+
+    async def _run(self, ready: asyncio.Future[None]) -> None:
+        client = ClaudeSDKClient(options=self._options)
+        connect_started = time.perf_counter()
+        try:
+            await client.connect()
+        except BaseException as exc:
+            if not ready.done():
+                if isinstance(exc, asyncio.CancelledError):
+                    ready.cancel()
+                else:
+                    ready.set_exception(exc)
+            await self._disconnect(client)
+            if not isinstance(exc, Exception):
+                raise
+            return
+
+        Metrics.sdk_connect_seconds.observe(time.perf_counter() - connect_started)
+        self._client = client
+        ready.set_result(None)
+        try:
+            await self._stop_event.wait()
+        finally:
+            self._client = None
+            await self._disconnect(client)
+
+    @classmethod
+    async def _disconnect(cls, client: ClaudeSDKClient) -> None:
+        if not hasattr(client, "disconnect"):
+            return
+        try:
+            disconnect_method = getattr(client, "disconnect")
+            result = disconnect_method()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as exc:
+            logging.getLogger(__name__).warning(
+                "[runtime] disconnect warning: %s",
+                exc,
+            )
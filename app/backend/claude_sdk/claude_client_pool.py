@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import ClassVar
+
+from app.backend.core.constants import Constants
+from app.backend.claude_sdk.claude_capacity_error import ClaudeCapacityError
+from app.backend.claude_sdk.claude_client_host import ClaudeClientHost
+from app.backend.claude_sdk.claude_config_file_manager import ClaudeConfigFileManager
+from app.backend.claude_sdk.claude_options_factory import ClaudeOptionsFactory
+from app.backend.claude_sdk.claude_process_slots import ClaudeProcessSlots
+
+PoolKey = tuple[str, str, str | None, tuple[str, ...]]
+
+
+class ClaudeClientPool:
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = ("pool_hits", "pool_misses", "pool_spawn_failures")
+
+    def __init__(
+        self,
+        *,
+        size: int,
+        max_idle_seconds: float,
+        max_turns: int,
+        debug_stderr: bool,
+        include_partial_messages: bool,
+        route_tool_permissions: bool,
+        prewarm_keys: list[PoolKey],
+        process_slots: ClaudeProcessSlots | None = None,
+    ) -> None:
+        self._size = size
+        self._max_idle_seconds = max_idle_seconds
+        self._max_turns = max_turns
+        self._debug_stderr = debug_stderr
+        self._include_partial_messages = include_partial_messages
+        self._route_tool_permissions = route_tool_permissions
+        self._prewarm_keys = list(dict.fromkeys(prewarm_keys))
+        self._process_slots = process_slots
+
+        self._idle: dict[PoolKey, deque[ClaudeClientHost]] = {key: deque() for key in self._prewarm_keys}
+        self._retired: list[ClaudeClientHost] = []
+        self._wake_event = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+
+        self._hits = 0
+        self._misses = 0
+        self._spawn_failures = 0
+
+    @classmethod
+    def build_key(
+        cls,
+        *,
+        model: str,
+        permission_mode: str,
+        system_prompt: str | None,
+        allowed_tools: list[str] | None,
+    ) -> PoolKey:
+        result = (model, permission_mode, system_prompt or None, tuple(allowed_tools or ()))
+        return result
+
+    @property
+    def enabled(self) -> bool:
+        return self._size > 0 and bool(self._prewarm_keys)
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._maintain())
+
+    def acquire(self, key: PoolKey) -> ClaudeClientHost | None:
+        if not self.enabled:
+            return None
+
+        idle_hosts = self._idle.get(key)
+        result: ClaudeClientHost | None = None
+        while idle_hosts:
+            host = idle_hosts.popleft()
+            if self._is_usable(host):
+                result = host
+                break
+            self._retired.append(host)
+
+        if result is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        self._wake_event.set()
+        return result
+
+    async def shed_idle(self) -> bool:
+        # Spares are the cheapest processes to give up when a turn needs a slot; the oldest goes first.
+        oldest: deque[ClaudeClientHost] | None = None
+        for idle_hosts in self._idle.values():
+            if idle_hosts and (oldest is None or idle_hosts[0].created_at < oldest[0].created_at):
+                oldest = idle_hosts
+        if oldest is None:
+            return False
+        await oldest.popleft().close()
+        return True
+
+    def stats(self) -> dict[str, int]:
+        result = {
+            "pool_size": self._size,
+            "pool_idle_clients": sum(len(hosts) for hosts in self._idle.values()),
+            "pool_hits": self._hits,
+            "pool_misses": self._misses,
+            "pool_spawn_failures": self._spawn_failures,
+        }
+        return result
+
+    async def close(self) -> None:
+        self._closed = True
+        task = self._task
+        self._task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        hosts = list(self._retired)
+        self._retired.clear()
+        for idle_hosts in self._idle.values():
+            hosts.extend(idle_hosts)
+            idle_hosts.clear()
+        for host in hosts:
+            await host.close()
+
+    async def _maintain(self) -> None:
+        while not self._closed:
+            self._wake_event.clear()
+            await self._close_retired()
+            await self._refill()
+            try:
+                await asyncio.wait_for(
+                    self._wake_event.wait(),
+                    timeout=Constants.CLIENT_POOL_MAINTENANCE_INTERVAL_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _close_retired(self) -> None:
+        for idle_hosts in self._idle.values():
+            for host in [item for item in idle_hosts if not self._is_usable(item)]:
+                idle_hosts.remove(host)
+                self._retired.append(host)
+
+        retired = list(self._retired)
+        self._retired.clear()
+        for host in retired:
+            await host.close()
+
+    async def _refill(self) -> None:
+        for key in self._prewarm_keys:
+            idle_hosts = self._idle[key]
+            while not self._closed and len(idle_hosts) < self._size:
+                host = await self._spawn(key)
+                if host is None:
+                    break
+                idle_hosts.append(host)
+
+    async def _spawn(self, key: PoolKey) -> ClaudeClientHost | None:
+        model, permission_mode, system_prompt, allowed_tools = key
+        ClaudeConfigFileManager.ensure_files()
+        host = ClaudeClientHost(
+            ClaudeOptionsFactory.build(
+                model=model,
+                permission_mode=permission_mode,
+                max_turns=self._max_turns,
+                system_prompt=system_prompt,
+                allowed_tools=list(allowed_tools) or None,
+                debug_stderr=self._debug_stderr,
+                include_partial_messages=self._include_partial_messages,
+                resume=None,
+            ),
+            route_tool_permissions=self._route_tool_permissions,
+            process_slots=self._process_slots,
+        )
+        try:
+            # Spares only use a slot that is free right now; they never make a turn wait.
+            await host.start(wait_for_slot=False)
+        except ClaudeCapacityError:
+            return None
+        except Exception as exc:
+            self._spawn_failures += 1
+            logging.getLogger(__name__).warning(
+                "[runtime] warning: unable to pre-spawn Claude client model=%s: %s",
+                model,
+                exc,
+            )
+            return None
+        return host
+
+    def _is_usable(self, host: ClaudeClientHost) -> bool:
+        age_seconds = time.monotonic() - host.created_at
+        result = host.is_alive() and age_seconds < self._max_idle_seconds
+        return result
@@ -1,15 +1,46 @@
 from __future__ import annotations
 
 import logging
+import time
 from pathlib import Path
+from typing import ClassVar
+
+from app.backend.core.constants import Constants
 
 
 class ClaudeConfigFileManager:
+    # ensure_files() runs on every query attempt; once the files are verified, later calls only re-stat
+    # them every CONFIG_FILES_RECHECK_SECONDS instead of touching the filesystem on each prompt.
+    _verified_at: ClassVar[float | None] = None
+
     @classmethod
     def ensure_files(cls) -> None:
-        claude_config_path = Path.home() / ".claude.json"
-        claude_dir = Path.home() / ".claude"
-        remote_settings_path = claude_dir / "remote-settings.json"
+        verified_at = cls._verified_at
+        now = time.monotonic()
+        if verified_at is not None and now - verified_at < Constants.CONFIG_FILES_RECHECK_SECONDS:
+            return
+        if verified_at is not None and cls._files_present():
+            cls._verified_at = now
+            return
+
+        if cls._write_missing_files():
+            cls._verified_at = now
+        else:
+            cls._verified_at = None
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._verified_at = None
+
+    @classmethod
+    def _files_present(cls) -> bool:
+        claude_config_path, _, remote_settings_path = cls._paths()
+        result = claude_config_path.exists() and remote_settings_path.exists()
+        return result
+
+    @classmethod
+    def _write_missing_files(cls) -> bool:
+        claude_config_path, claude_dir, remote_settings_path = cls._paths()
 
         try:
             if not claude_config_path.exists():
@@ -22,3 +53,11 @@ class ClaudeConfigFileManager:
                 "[runtime] warning: unable to ensure Claude config files: %s",
                 exc,
             )
+            return False
+        return True
+
+    @classmethod
+    def _paths(cls) -> tuple[Path, Path, Path]:
+        claude_dir = Path.home() / ".claude"
+        result = (Path.home() / ".claude.json", claude_dir, claude_dir / "remote-settings.json")
+        return result
@@ -1,34 +1,85 @@
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
+from collections.abc import Callable
+from dataclasses import fields, is_dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, ClassVar
 
 from app.backend.core.constants import Constants
 
 
 class ClaudeMessageSerializer:
+    # One converter per concrete class, built the first time the class is seen.
+    _converters: ClassVar[dict[type, Callable[[Any, dict[int, tuple[Any, Any]]], Any]]] = {}
+
+    @classmethod
+    def serialize(cls, message: Any, *, compact_raw: bool = False) -> dict[str, Any]:
+        result = cls._serialize_full(message)
+        if compact_raw:
+            result = cls.compact_raw(result)
+        return result
+
+    @classmethod
+    def compact_raw(cls, serialized_message: dict[str, Any]) -> dict[str, Any]:
+        # Raw fields that equal a normalized top-level field are stored once and only referenced by
+        # name in "raw_shared"; "raw" keeps only what the normalized view does not already carry.
+        raw = serialized_message.get("raw")
+        if not isinstance(raw, dict):
+            return serialized_message
+
+        shared_keys = [
+            key
+            for key, value in raw.items()
+            if key != "raw"
+            and key in serialized_message
+            and (serialized_message[key] is value or serialized_message[key] == value)
+        ]
+        residual = {key: value for key, value in raw.items() if key not in shared_keys}
+
+        result = {key: value for key, value in serialized_message.items() if key != "raw"}
+        if shared_keys:
+            result["raw_shared"] = shared_keys
+        if residual:
+            result["raw"] = residual
+        return result
+
+    @classmethod
+    def expand_raw(cls, serialized_message: dict[str, Any]) -> dict[str, Any]:
+        # Inverse of compact_raw(): rebuilds the full "raw" view for API readers. Payloads stored
+        # without compaction come back unchanged.
+        if "raw_shared" not in serialized_message:
+            return serialized_message
+        raw = {key: serialized_message.get(key) for key in serialized_message["raw_shared"]}
+        residual = serialized_message.get("raw")
+        if isinstance(residual, dict):
+            raw.update(residual)
+        result = {key: value for key, value in serialized_message.items() if key != "raw_shared"}
+        result["raw"] = raw
+        return result
+
     @classmethod
-    def serialize(cls, message: Any) -> dict[str, Any]:
+    def _serialize_full(cls, message: Any) -> dict[str, Any]:
         message_type = type(message).__name__
+        # Sub-objects shared between the normalized fields and "raw" are converted only once.
+        memo: dict[int, tuple[Any, Any]] = {}
 
         if message_type == Constants.MESSAGE_TYPE_USER:
-            content = cls._normalize_content(getattr(message, "content", None))
+            content = cls._normalize_content(getattr(message, "content", None), memo)
             return {
                 "type": message_type,
                 "role": Constants.ROLE_USER,
                 "content": content,
-                "raw": cls._to_jsonable(message),
+                "raw": cls._to_jsonable(message, memo),
             }
 
         if message_type == Constants.MESSAGE_TYPE_ASSISTANT:
-            content = cls._normalize_content(getattr(message, "content", None))
+            content = cls._normalize_content(getattr(message, "content", None), memo)
             return {
                 "type": message_type,
                 "role": Constants.ROLE_ASSISTANT,
                 "model": getattr(message, "model", None),
                 "content": content,
-                "raw": cls._to_jsonable(message),
+                "raw": cls._to_jsonable(message, memo),
             }
 
         if message_type == Constants.MESSAGE_TYPE_SYSTEM:
@@ -36,8 +87,8 @@ class ClaudeMessageSerializer:
                 "type": message_type,
                 "role": Constants.ROLE_SYSTEM,
                 "subtype": getattr(message, "subtype", Constants.SYSTEM_SUBTYPE_INFO),
-                "data": cls._to_jsonable(getattr(message, "data", {})),
-                "raw": cls._to_jsonable(message),
+                "data": cls._to_jsonable(getattr(message, "data", {}), memo),
+                "raw": cls._to_jsonable(message, memo),
             }
 
         if message_type == Constants.MESSAGE_TYPE_RESULT:
@@ -52,8 +103,8 @@ class ClaudeMessageSerializer:
                 "is_error": getattr(message, "is_error", False),
                 "session_id": getattr(message, "session_id", None),
                 "total_cost_usd": getattr(message, "total_cost_usd", None),
-                "usage": cls._to_jsonable(getattr(message, "usage", None)),
-                "raw": cls._to_jsonable(message),
+                "usage": cls._to_jsonable(getattr(message, "usage", None), memo),
+                "raw": cls._to_jsonable(message, memo),
             }
 
         if message_type == Constants.MESSAGE_TYPE_STREAM_EVENT:
@@ -61,14 +112,14 @@ class ClaudeMessageSerializer:
                 "type": message_type,
                 "role": Constants.ROLE_STREAM_EVENT,
                 "event": getattr(message, "event", None),
-                "data": cls._to_jsonable(getattr(message, "data", None)),
-                "raw": cls._to_jsonable(message),
+                "data": cls._to_jsonable(getattr(message, "data", None), memo),
+                "raw": cls._to_jsonable(message, memo),
             }
 
         return {
             "type": message_type,
             "role": Constants.ROLE_UNKNOWN,
-            "raw": cls._to_jsonable(message),
+            "raw": cls._to_jsonable(message, memo),
         }
 
     @classmethod
@@ -97,29 +148,58 @@ class ClaudeMessageSerializer:
         return None
 
     @classmethod
-    def _normalize_content(cls, content: Any) -> Any:
+    def _normalize_content(cls, content: Any, memo: dict[int, tuple[Any, Any]] | None = None) -> Any:
         if isinstance(content, str):
             return content
-        if isinstance(content, list):
-            return [cls._to_jsonable(item) for item in content]
-        return cls._to_jsonable(content)
+        return cls._to_jsonable(content, memo)
 
     @classmethod
-    def _to_jsonable(cls, value: Any) -> Any:
+    def _to_jsonable(cls, value: Any, memo: dict[int, tuple[Any, Any]] | None = None) -> Any:
         if value is None:
             return None
-        if isinstance(value, (str, int, float, bool)):
+        value_type = type(value)
+        if value_type is str or value_type is int or value_type is float or value_type is bool:
             return value
-        if isinstance(value, datetime):
-            return value.isoformat()
-        if isinstance(value, list):
-            return [cls._to_jsonable(item) for item in value]
-        if isinstance(value, dict):
-            return {str(key): cls._to_jsonable(item) for key, item in value.items()}
-        if is_dataclass(value):
-            return cls._to_jsonable(asdict(value))
-        if hasattr(value, "model_dump"):
-            return cls._to_jsonable(value.model_dump(mode="json"))
-        if hasattr(value, "__dict__"):
-            return cls._to_jsonable(vars(value))
-        return str(value)
+
+        # The memo holds the source object next to its result: that keeps it alive for the whole call,
+        # so a transient value freed mid-walk cannot hand its id() to another object.
+        if memo is not None:
+            cached = memo.get(id(value))
+            if cached is not None and cached[0] is value:
+                return cached[1]
+
+        converter = cls._converters.get(value_type)
+        if converter is None:
+            converter = cls._build_converter(value_type, value)
+            cls._converters[value_type] = converter
+
+        result = converter(value, memo if memo is not None else {})
+        if memo is not None and isinstance(result, (dict, list)):
+            memo[id(value)] = (value, result)
+        return result
+
+    @classmethod
+    def _build_converter(
+        cls,
+        value_type: type,
+        sample: Any,
+    ) -> Callable[[Any, dict[int, tuple[Any, Any]]], Any]:
+        to_jsonable = cls._to_jsonable
+
+        if issubclass(value_type, (str, int, float, bool)):
+            return lambda value, memo: value
+        if issubclass(value_type, datetime):
+            return lambda value, memo: value.isoformat()
+        if issubclass(value_type, list):
+            return lambda value, memo: [to_jsonable(item, memo) for item in value]
+        if issubclass(value_type, dict):
+            return lambda value, memo: {str(key): to_jsonable(item, memo) for key, item in value.items()}
+        if is_dataclass(value_type):
+            # Direct attribute access over the cached field names; asdict() would deep-copy first.
+            field_names = tuple(field.name for field in fields(value_type))
+            return lambda value, memo: {name: to_jsonable(getattr(value, name), memo) for name in field_names}
+        if hasattr(sample, "model_dump"):
+            return lambda value, memo: value.model_dump(mode="json")
+        if hasattr(sample, "__dict__"):
+            return lambda value, memo: {str(key): to_jsonable(item, memo) for key, item in vars(value).items()}
+        return lambda value, memo: str(value)
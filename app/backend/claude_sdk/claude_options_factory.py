@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.backend.claude_sdk.sdk_types import ClaudeOptions
+
+
+class ClaudeOptionsFactory:
+    @classmethod
+    def build(
+        cls,
+        *,
+        model: str,
+        permission_mode: str,
+        max_turns: int,
+        system_prompt: str | None,
+        allowed_tools: list[str] | None,
+        debug_stderr: bool,
+        include_partial_messages: bool,
+        resume: str | None,
+    ) -> ClaudeOptions:
+        options_kwargs: dict[str, Any] = {
+            "model": model,
+            "permission_mode": permission_mode,
+            "max_turns": max_turns,
+        }
+        if allowed_tools:
+            options_kwargs["allowed_tools"] = allowed_tools
+        if system_prompt:
+            options_kwargs["system_prompt"] = system_prompt
+        if resume:
+            options_kwargs["resume"] = resume
+        if include_partial_messages:
+            options_kwargs["include_partial_messages"] = True
+        if debug_stderr:
+            options_kwargs["extra_args"] = {"debug-to-stderr": None}
+        result = ClaudeOptions(**options_kwargs)
+        return result
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import ClassVar
+
+from app.backend.core.constants import Constants
+from app.backend.claude_sdk.claude_capacity_error import ClaudeCapacityError
+
+# Frees capacity held by something idle; returns True if it closed (or began closing) a process.
+SlotReclaimer = Callable[[], Awaitable[bool]]
+
+
+class ClaudeProcessSlots:
+    # Counts live Claude CLI processes. Every ClaudeClientHost takes a slot before it spawns its process
+    # and gives it back once the process is gone, so running turns, kept idle clients, pooled spares and
+    # warm-ups all share one cap. Turns wait for a slot and reclaim idle processes; the speculative
+    # starters only take a slot that is free right now.
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = (
+        "process_slot_timeouts",
+        "process_slot_skipped",
+        "process_slots_reclaimed",
+    )
+
+    def __init__(self, *, max_processes: int, wait_timeout_seconds: float) -> None:
+        self._max_processes = max(1, max_processes)
+        self._wait_timeout_seconds = wait_timeout_seconds
+        self._reclaimers: list[SlotReclaimer] = []
+        self._released = asyncio.Event()
+
+        self._in_use = 0
+        self._waiting = 0
+        self._peak_in_use = 0
+        self._timeouts = 0
+        self._skipped = 0
+        self._reclaimed = 0
+
+    def add_reclaimer(self, reclaimer: SlotReclaimer) -> None:
+        # Reclaimers are tried in registration order, cheapest first.
+        self._reclaimers.append(reclaimer)
+
+    @property
+    def has_free_slot(self) -> bool:
+        result = self._in_use < self._max_processes and self._waiting == 0
+        return result
+
+    def try_acquire(self) -> bool:
+        # Never jumps ahead of a turn that is already waiting.
+        if not self.has_free_slot:
+            self._skipped += 1
+            return False
+        self._take()
+        return True
+
+    async def acquire(self) -> None:
+        deadline = time.monotonic() + self._wait_timeout_seconds
+        self._waiting += 1
+        try:
+            while self._in_use >= self._max_processes:
+                if await self._reclaim() and self._in_use < self._max_processes:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise ClaudeCapacityError("Agent capacity is saturated")
+                # Reclaimers are retried periodically: a process that is busy now may be idle shortly, and
+                # one that began closing may not have exited yet.
+                self._released.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._released.wait(),
+                        timeout=min(remaining, Constants.PROCESS_SLOT_RECLAIM_POLL_SECONDS),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waiting -= 1
+        self._take()
+
+    def release(self) -> None:
+        self._in_use = max(0, self._in_use - 1)
+        self._released.set()
+
+    def stats(self) -> dict[str, int]:
+        result = {
+            "process_slots_max": self._max_processes,
+            "process_slots_in_use": self._in_use,
+            "process_slots_peak": self._peak_in_use,
+            "process_slot_waiting": self._waiting,
+            "process_slot_timeouts": self._timeouts,
+            "process_slot_skipped": self._skipped,
+            "process_slots_reclaimed": self._reclaimed,
+        }
+        return result
+
+    def _take(self) -> None:
+        self._in_use += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+    async def _reclaim(self) -> bool:
+        for reclaimer in self._reclaimers:
+            if await reclaimer():
+                self._reclaimed += 1
+                return True
+        return False
@@ -1,16 +1,63 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, ClassVar
 
+from app.backend.core.constants import Constants
 from app.backend.core.settings import Settings
+from app.backend.claude_sdk.claude_client_pool import ClaudeClientPool, PoolKey
+from app.backend.claude_sdk.claude_process_slots import ClaudeProcessSlots
 from app.backend.claude_sdk.claude_session_runtime import ClaudeSessionRuntime
+from app.backend.claude_sdk.default_permission_mode import DefaultPermissionModeResolver
 
 
 class ClaudeRuntimeRegistry:
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = (
+        "evictions",
+        "warm_requests",
+        "warm_saturated",
+        *ClaudeProcessSlots.COUNTER_STATS,
+        *ClaudeClientPool.COUNTER_STATS,
+    )
+
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
-        self._runtimes: dict[str, ClaudeSessionRuntime] = {}
+        self._runtimes: OrderedDict[str, ClaudeSessionRuntime] = OrderedDict()
         self._lock = asyncio.Lock()
+        self._sweeper_task: asyncio.Task[None] | None = None
+        self._warm_tasks: set[asyncio.Task[None]] = set()
+        # The session each owner (user) last warmed; an owner keeps at most one unused warm-up.
+        self._warm_owners: dict[str, str] = {}
+        self._evictions = 0
+        self._warm_requests = 0
+        self._warm_saturated = 0
+        self._process_slots = ClaudeProcessSlots(
+            max_processes=settings.admission_max_concurrent,
+            wait_timeout_seconds=settings.admission_queue_timeout_seconds,
+        )
+        self._client_pool = ClaudeClientPool(
+            size=settings.claude_pool_size,
+            max_idle_seconds=settings.claude_pool_max_idle_seconds,
+            max_turns=settings.claude_max_turns,
+            debug_stderr=settings.claude_debug_stderr,
+            include_partial_messages=settings.claude_include_partial_messages,
+            route_tool_permissions=settings.ask_user_answer_timeout_seconds > 0,
+            prewarm_keys=self._build_prewarm_keys(settings),
+            process_slots=self._process_slots,
+        )
+        self._process_slots.add_reclaimer(self._client_pool.shed_idle)
+        self._process_slots.add_reclaimer(self._shed_idle_client)
+
+    @property
+    def process_slots(self) -> ClaudeProcessSlots:
+        return self._process_slots
+
+    def start(self) -> None:
+        self._client_pool.start()
+        if self._sweeper_task is None and self._settings.claude_runtime_sweep_interval_seconds > 0:
+            self._sweeper_task = asyncio.create_task(self._sweep_forever())
 
     async def get_or_create(
         self,
@@ -22,6 +69,7 @@ class ClaudeRuntimeRegistry:
         system_prompt: str | None,
         resume: str | None,
     ) -> ClaudeSessionRuntime:
+        evicted: list[ClaudeSessionRuntime] = []
         async with self._lock:
             runtime = self._runtimes.get(local_session_id)
             if runtime is None:
@@ -32,13 +80,81 @@ class ClaudeRuntimeRegistry:
                     system_prompt=system_prompt,
                     allowed_tools=self._settings.claude_allowed_tools,
                     debug_stderr=self._settings.claude_debug_stderr,
+                    include_partial_messages=self._settings.claude_include_partial_messages,
+                    route_tool_permissions=self._settings.ask_user_answer_timeout_seconds > 0,
                     resume=resume,
+                    persistent_client=self._settings.claude_persistent_client,
+                    idle_timeout_seconds=self._settings.claude_client_idle_timeout_seconds,
+                    process_slots=self._process_slots,
                 )
+                # Pooled clients were started without resume, so only brand-new conversations can use one.
+                if resume is None and max_turns == self._settings.claude_max_turns:
+                    host = self._client_pool.acquire(
+                        ClaudeClientPool.build_key(
+                            model=model,
+                            permission_mode=permission_mode,
+                            system_prompt=system_prompt,
+                            allowed_tools=self._settings.claude_allowed_tools,
+                        )
+                    )
+                    if host is not None:
+                        runtime.adopt_host(host)
                 self._runtimes[local_session_id] = runtime
+                evicted = self._pop_over_capacity(keep=local_session_id)
             else:
-                runtime.set_resume(resume)
+                self._runtimes.move_to_end(local_session_id)
+                runtime.configure(model=model, permission_mode=permission_mode, resume=resume)
+            runtime.touch()
+            # Leased before the lock is released, so eviction cannot close it before the caller's query
+            # starts; the caller hands it back with release_lease().
+            runtime.lease()
             result = runtime
-            return result
+
+        await self._close_evicted(evicted)
+        return result
+
+    async def warm(
+        self,
+        *,
+        local_session_id: str,
+        model: str,
+        permission_mode: str,
+        max_turns: int,
+        system_prompt: str | None,
+        resume: str | None,
+        ttl_seconds: float,
+        owner_id: str,
+    ) -> str:
+        existing = self._runtimes.get(local_session_id)
+        if existing is not None and existing.is_busy:
+            return Constants.WARM_STATUS_BUSY
+        runtime = await self.get_or_create(
+            local_session_id=local_session_id,
+            model=model,
+            permission_mode=permission_mode,
+            max_turns=max_turns,
+            system_prompt=system_prompt,
+            resume=resume,
+        )
+        if runtime.has_live_client:
+            runtime.release_lease()
+            return Constants.WARM_STATUS_READY
+
+        await self._shed_owner_warm(owner_id, keep=local_session_id)
+        # Warm-ups are speculative: they only take a process slot that is free right now, and never
+        # reclaim one from an idle client or a waiting turn.
+        if not self._process_slots.has_free_slot:
+            runtime.release_lease()
+            self._warm_saturated += 1
+            return Constants.WARM_STATUS_SATURATED
+        self._warm_owners[owner_id] = local_session_id
+
+        # Connecting takes seconds, so it runs in the background and the caller returns right away.
+        self._warm_requests += 1
+        task = asyncio.create_task(self._warm_leased(runtime, ttl_seconds))
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+        return Constants.WARM_STATUS_WARMING
 
     async def interrupt(self, local_session_id: str) -> None:
         runtime = self._runtimes.get(local_session_id)
@@ -52,10 +168,135 @@ class ClaudeRuntimeRegistry:
         if runtime is not None:
             await runtime.close()
 
+    async def sweep(self) -> int:
+        ttl_seconds = self._settings.claude_runtime_idle_ttl_seconds
+        async with self._lock:
+            expired_ids = [
+                local_session_id
+                for local_session_id, runtime in self._runtimes.items()
+                if ttl_seconds > 0 and not runtime.is_busy and runtime.idle_seconds >= ttl_seconds
+            ]
+            evicted = [self._runtimes.pop(local_session_id) for local_session_id in expired_ids]
+            evicted.extend(self._pop_over_capacity())
+
+        await self._close_evicted(evicted)
+        result = len(evicted)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        runtimes = list(self._runtimes.values())
+        result: dict[str, Any] = {
+            "runtimes": len(runtimes),
+            "runtimes_max": self._settings.claude_runtime_max_entries,
+            "busy_runtimes": sum(1 for runtime in runtimes if runtime.is_busy),
+            "active_clients": sum(1 for runtime in runtimes if runtime.has_live_client),
+            "evictions": self._evictions,
+            "warm_requests": self._warm_requests,
+            "warm_saturated": self._warm_saturated,
+            "warm_in_progress": len(self._warm_tasks),
+            **self._process_slots.stats(),
+            **self._client_pool.stats(),
+        }
+        return result
+
     async def close_all(self) -> None:
+        sweeper_task = self._sweeper_task
+        self._sweeper_task = None
+        if sweeper_task is not None:
+            sweeper_task.cancel()
+            try:
+                await sweeper_task
+            except asyncio.CancelledError:
+                pass
+
+        warm_tasks = list(self._warm_tasks)
+        for task in warm_tasks:
+            task.cancel()
+        await asyncio.gather(*warm_tasks, return_exceptions=True)
+
         async with self._lock:
             runtimes = list(self._runtimes.values())
             self._runtimes.clear()
 
         for runtime in runtimes:
             await runtime.close()
+        await self._client_pool.close()
+
+    def _pop_over_capacity(self, keep: str | None = None) -> list[ClaudeSessionRuntime]:
+        # Oldest entries come first in the OrderedDict; runtimes in the middle of a turn are skipped.
+        max_entries = self._settings.claude_runtime_max_entries
+        result: list[ClaudeSessionRuntime] = []
+        if max_entries <= 0:
+            return result
+
+        overflow = len(self._runtimes) - max_entries
+        for local_session_id, runtime in list(self._runtimes.items()):
+            if overflow <= 0:
+                break
+            if runtime.is_busy or local_session_id == keep:
+                continue
+            del self._runtimes[local_session_id]
+            result.append(runtime)
+            overflow -= 1
+        return result
+
+    async def _shed_idle_client(self) -> bool:
+        # Least recently used first; the runtime stays registered without its process.
+        for runtime in list(self._runtimes.values()):
+            if await runtime.shed_client():
+                return True
+        return False
+
+    async def _shed_owner_warm(self, owner_id: str, *, keep: str) -> None:
+        previous_id = self._warm_owners.pop(owner_id, None)
+        if previous_id is None or previous_id == keep:
+            return
+        previous = self._runtimes.get(previous_id)
+        if previous is not None:
+            await previous.shed_client(warm_only=True)
+
+    async def _close_evicted(self, runtimes: list[ClaudeSessionRuntime]) -> None:
+        for runtime in runtimes:
+            self._evictions += 1
+            try:
+                await runtime.close()
+            except Exception as exc:
+                logging.getLogger(__name__).warning("[runtime] eviction close warning: %s", exc)
+
+    @classmethod
+    async def _warm_leased(cls, runtime: ClaudeSessionRuntime, ttl_seconds: float) -> None:
+        try:
+            await runtime.warm(ttl_seconds)
+        finally:
+            runtime.release_lease()
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.claude_runtime_sweep_interval_seconds)
+            try:
+                await self.sweep()
+            except Exception as exc:
+                logging.getLogger(__name__).warning("[runtime] sweep warning: %s", exc)
+
+    @classmethod
+    def _build_prewarm_keys(cls, settings: Settings) -> list[PoolKey]:
+        default_permission_mode = DefaultPermissionModeResolver(settings).resolve()
+        specs: list[tuple[str, str]] = []
+        for item in settings.claude_pool_prewarm_csv.split(","):
+            if not item.strip():
+                continue
+            model, _, permission_mode = [part.strip() for part in item.partition(":")]
+            specs.append((model or settings.claude_model, permission_mode or default_permission_mode))
+        if not specs:
+            specs.append((settings.claude_model, default_permission_mode))
+
+        result = [
+            ClaudeClientPool.build_key(
+                model=model,
+                permission_mode=permission_mode,
+                system_prompt=settings.claude_system_prompt,
+                allowed_tools=settings.claude_allowed_tools,
+            )
+            for model, permission_mode in specs
+        ]
+        return result
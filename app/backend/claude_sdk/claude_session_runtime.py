@@ -2,13 +2,28 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from inspect import isawaitable
 from typing import Any
 
 from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
+from app.backend.core.turn_trace import TurnTrace
+from app.backend.claude_sdk.claude_capacity_error import ClaudeCapacityError
+from app.backend.claude_sdk.claude_client_host import ClaudeClientHost
 from app.backend.claude_sdk.claude_config_file_manager import ClaudeConfigFileManager
-from app.backend.claude_sdk.sdk_types import ClaudeOptions, ClaudeSDKClient
+from app.backend.claude_sdk.claude_options_factory import ClaudeOptionsFactory
+from app.backend.claude_sdk.claude_process_slots import ClaudeProcessSlots
+from app.backend.claude_sdk.sdk_types import (
+    ClaudeOptions,
+    ClaudeSDKClient,
+    PermissionResultAllow,
+    PermissionResultDeny,
+    ToolPermissionContext,
+)
+
+QuestionHandler = Callable[[], Awaitable[dict[str, Any] | None]]
 
 
 class ClaudeSessionRuntime:
@@ -21,7 +36,12 @@ class ClaudeSessionRuntime:
         system_prompt: str | None,
         allowed_tools: list[str] | None,
         debug_stderr: bool,
+        include_partial_messages: bool,
         resume: str | None,
+        route_tool_permissions: bool = False,
+        persistent_client: bool = False,
+        idle_timeout_seconds: float = 0.0,
+        process_slots: ClaudeProcessSlots | None = None,
     ) -> None:
         self._model = model
         self._permission_mode = permission_mode
@@ -29,31 +49,69 @@ class ClaudeSessionRuntime:
         self._system_prompt = system_prompt
         self._allowed_tools = allowed_tools
         self._debug_stderr = debug_stderr
+        self._include_partial_messages = include_partial_messages
         self._resume = resume
+        self._route_tool_permissions = route_tool_permissions
+        self._persistent_client = persistent_client
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._process_slots = process_slots
 
         self._query_lock = asyncio.Lock()
         self._active_client_lock = asyncio.Lock()
         self._active_client: ClaudeSDKClient | None = None
 
-    async def query_stream(self, prompt: str) -> AsyncGenerator[Any, None]:
+        self._options: ClaudeOptions | None = None
+        self._question_handler: QuestionHandler | None = None
+        self._warm_pending = False
+
+        self._host: ClaudeClientHost | None = None
+        self._host_signature: tuple[str, str, str | None] | None = None
+        self._idle_close_task: asyncio.Task[None] | None = None
+        self._last_used_at = time.monotonic()
+        self._leases = 0
+        self._closed = False
+
+    async def query_stream(self, prompt: str, *, trace: TurnTrace | None = None) -> AsyncGenerator[Any, None]:
         async with self._query_lock:
+            self.touch()
+            self._cancel_idle_close()
             max_attempts = Constants.RUNTIME_MAX_ATTEMPTS
             last_error: Exception | None = None
+            query_started = time.perf_counter()
+            warmed = self._warm_pending
+            self._warm_pending = False
 
             for attempt in range(1, max_attempts + 1):
                 ClaudeConfigFileManager.ensure_files()
-                client = ClaudeSDKClient(options=self._build_options())
-                await client.connect()
+                previous_host = self._host
+                acquire_started = time.perf_counter()
+                host = await self._acquire_host()
+                if trace is not None:
+                    trace.mark(
+                        Constants.TRACE_SPAN_CLIENT_CONNECTED,
+                        duration_seconds=time.perf_counter() - acquire_started,
+                        reused=host is previous_host,
+                        attempt=attempt,
+                    )
+                if warmed and attempt == 1:
+                    Metrics.runtime_warmups_total.inc(
+                        Constants.WARM_OUTCOME_HIT if host is previous_host else Constants.WARM_OUTCOME_MISS
+                    )
+                client = host.client
                 await self._set_active_client(client)
                 emitted_count = 0
+                completed = False
 
                 try:
                     query_result = client.query(prompt)
                     if hasattr(query_result, "__aiter__"):
                         async for message in query_result:
                             emitted_count += 1
+                            self._observe_first_message(emitted_count, query_started, trace)
+                            self._track_session_id(message)
                             yield message
                             if type(message).__name__ == Constants.MESSAGE_TYPE_RESULT:
+                                completed = True
                                 break
                         return
 
@@ -65,9 +123,12 @@ class ClaudeSessionRuntime:
                         saw_result = False
                         async for message in response_reader:
                             emitted_count += 1
+                            self._observe_first_message(emitted_count, query_started, trace)
+                            self._track_session_id(message)
                             yield message
                             if type(message).__name__ == Constants.MESSAGE_TYPE_RESULT:
                                 saw_result = True
+                                completed = True
                                 break
                         if not saw_result:
                             logging.getLogger(__name__).warning(
@@ -80,14 +141,18 @@ class ClaudeSessionRuntime:
                         if isawaitable(message):
                             message = await message
                         emitted_count += 1
+                        self._observe_first_message(emitted_count, query_started, trace)
+                        self._track_session_id(message)
                         yield message
                         if type(message).__name__ == Constants.MESSAGE_TYPE_RESULT:
+                            completed = True
                             break
                     return
                 except Exception as exc:
                     last_error = exc
                     retryable = self._is_retryable_startup_error(exc) and emitted_count == 0
                     if retryable and attempt < max_attempts:
+                        Metrics.query_retries_total.inc()
                         logging.getLogger(__name__).warning(
                             "[runtime] transient SDK startup failure (attempt %s/%s) type=%s message=%s",
                             attempt,
@@ -99,22 +164,51 @@ class ClaudeSessionRuntime:
                         continue
                     raise
                 finally:
+                    self.touch()
                     await self._clear_active_client(client)
-                    if hasattr(client, "disconnect"):
-                        try:
-                            disconnect_method = getattr(client, "disconnect")
-                            result = disconnect_method()
-                            if asyncio.iscoroutine(result):
-                                await result
-                        except Exception as exc:
-                            logging.getLogger(__name__).warning(
-                                "[runtime] disconnect warning: %s",
-                                exc,
-                            )
+                    await self._release_host(host, reusable=completed)
 
             if last_error is not None:
                 raise last_error
 
+    async def warm(self, ttl_seconds: float) -> None:
+        # Connects a client ahead of the first prompt; if no prompt arrives within ttl_seconds the
+        # client is closed again.
+        async with self._query_lock:
+            if self._closed or self.has_live_client:
+                return
+            self._cancel_idle_close()
+            ClaudeConfigFileManager.ensure_files()
+            try:
+                await self._acquire_host(wait_for_slot=False)
+            except ClaudeCapacityError:
+                # The last free slot went to someone else since the registry checked.
+                Metrics.runtime_warmups_total.inc(Constants.WARM_OUTCOME_SKIPPED)
+                return
+            except Exception as exc:
+                Metrics.runtime_warmups_total.inc(Constants.WARM_OUTCOME_FAILED)
+                logging.getLogger(__name__).warning("[runtime] warm-up failed: %s", exc)
+                return
+            Metrics.runtime_warmups_total.inc(Constants.WARM_OUTCOME_STARTED)
+            self._warm_pending = True
+            self.touch()
+            self._schedule_idle_close(ttl_seconds)
+
+    async def shed_client(self, *, warm_only: bool = False) -> bool:
+        # Closes the kept client of an idle runtime so another process can start; the runtime stays
+        # registered and reconnects on its next query. warm_only limits this to an unused warm-up.
+        if self.is_busy or self._host is None or (warm_only and not self._warm_pending):
+            return False
+        async with self._query_lock:
+            if self._leases > 0 or self._host is None or (warm_only and not self._warm_pending):
+                return False
+            self._cancel_idle_close()
+            if self._warm_pending:
+                self._warm_pending = False
+                Metrics.runtime_warmups_total.inc(Constants.WARM_OUTCOME_RECLAIMED)
+            await self._discard_host()
+        return True
+
     async def interrupt(self) -> None:
         async with self._active_client_lock:
             client = self._active_client
@@ -126,11 +220,172 @@ class ClaudeSessionRuntime:
                 logging.getLogger(__name__).warning("[runtime] interrupt warning: %s", exc)
 
     async def close(self) -> None:
+        self._closed = True
         await self.interrupt()
+        self._cancel_idle_close()
+        await self._discard_host()
 
     def set_resume(self, claude_session_id: str | None) -> None:
+        if claude_session_id != self._resume:
+            self._options = None
         self._resume = claude_session_id
 
+    def configure(self, *, model: str, permission_mode: str, resume: str | None) -> None:
+        # A changed signature is picked up by the next query, which reconnects the kept client.
+        if (model, permission_mode, resume) != (self._model, self._permission_mode, self._resume):
+            self._options = None
+        self._model = model
+        self._permission_mode = permission_mode
+        self._resume = resume
+
+    def adopt_host(self, host: ClaudeClientHost) -> None:
+        # Pre-connected hosts are only handed to fresh runtimes, so there is nothing to replace.
+        host.tool_permission_handler = self._handle_tool_permission
+        self._host = host
+        self._host_signature = self._build_signature()
+
+    def set_question_handler(self, handler: QuestionHandler | None) -> None:
+        # Called while the CLI waits on AskUserQuestion; returns the user's reply, or None to give up
+        # on the question.
+        self._question_handler = handler
+
+    @property
+    def has_live_client(self) -> bool:
+        result = self._host is not None and self._host.is_alive()
+        return result
+
+    @property
+    def is_busy(self) -> bool:
+        # A leased runtime has been handed to a turn that has not taken the query lock yet.
+        result = self._query_lock.locked() or self._leases > 0
+        return result
+
+    @property
+    def idle_seconds(self) -> float:
+        result = time.monotonic() - self._last_used_at
+        return result
+
+    def touch(self) -> None:
+        self._last_used_at = time.monotonic()
+
+    def lease(self) -> None:
+        self._leases += 1
+
+    def release_lease(self) -> None:
+        self._leases = max(0, self._leases - 1)
+        self.touch()
+
+    async def _acquire_host(self, *, wait_for_slot: bool = True) -> ClaudeClientHost:
+        signature = self._build_signature()
+        host = self._host
+        if host is not None and (self._host_signature != signature or not host.is_alive()):
+            await self._discard_host()
+            host = None
+
+        if host is None:
+            host = ClaudeClientHost(
+                self._build_options(),
+                route_tool_permissions=self._route_tool_permissions,
+                process_slots=self._process_slots,
+            )
+            host.tool_permission_handler = self._handle_tool_permission
+            await host.start(wait_for_slot=wait_for_slot)
+            self._host = host
+            self._host_signature = signature
+
+        host.mark_used()
+        return host
+
+    async def _release_host(self, host: ClaudeClientHost, *, reusable: bool) -> None:
+        host.mark_used()
+        keep = self._persistent_client and reusable and not self._closed
+        if keep and host is self._host and host.is_alive():
+            self._schedule_idle_close()
+            return
+        if host is self._host:
+            self._host = None
+            self._host_signature = None
+        await host.close()
+
+    async def _discard_host(self) -> None:
+        host = self._host
+        self._host = None
+        self._host_signature = None
+        if host is not None:
+            await host.close()
+
+    async def _handle_tool_permission(
+        self,
+        tool_name: str,
+        tool_input: dict[str, Any],
+        context: ToolPermissionContext,
+    ) -> PermissionResultAllow | PermissionResultDeny:
+        handler = self._question_handler
+        if tool_name != Constants.TOOL_ASK_USER_QUESTION or handler is None:
+            result = PermissionResultDeny(message=Constants.TOOL_PERMISSION_DENIED_MESSAGE)
+            return result
+
+        reply = await handler()
+        if reply is None:
+            result = PermissionResultDeny(message=Constants.ASK_USER_PARKED_MESSAGE)
+            return result
+        result = PermissionResultAllow(updated_input=self._build_answered_input(tool_input, reply))
+        return result
+
+    @classmethod
+    def _build_answered_input(cls, tool_input: dict[str, Any], reply: dict[str, Any]) -> dict[str, Any]:
+        # AskUserQuestion takes answers keyed by question text; questions the reply does not name
+        # get its free-text answer.
+        answers = dict(reply.get("answers") or {})
+        for question in tool_input.get("questions") or []:
+            if isinstance(question, dict) and question.get("question") and question["question"] not in answers:
+                answers[question["question"]] = reply.get("answer", "")
+        result = {**tool_input, "answers": answers}
+        return result
+
+    @classmethod
+    def _observe_first_message(cls, emitted_count: int, query_started: float, trace: TurnTrace | None) -> None:
+        if emitted_count != 1:
+            return
+        Metrics.first_message_seconds.observe(time.perf_counter() - query_started)
+        if trace is not None:
+            trace.mark(Constants.TRACE_SPAN_FIRST_SDK_MESSAGE)
+
+    def _track_session_id(self, message: Any) -> None:
+        # The kept client is already on the session the CLI reports, so a matching resume
+        # from the caller must not count as a signature change.
+        claude_session_id = getattr(message, "session_id", None)
+        if not claude_session_id or self._host_signature is None:
+            return
+        model, permission_mode, _ = self._host_signature
+        self._host_signature = (model, permission_mode, claude_session_id)
+
+    def _build_signature(self) -> tuple[str, str, str | None]:
+        result = (self._model, self._permission_mode, self._resume)
+        return result
+
+    def _schedule_idle_close(self, timeout_seconds: float | None = None) -> None:
+        self._cancel_idle_close()
+        timeout_seconds = self._idle_timeout_seconds if timeout_seconds is None else timeout_seconds
+        if timeout_seconds <= 0:
+            return
+        self._idle_close_task = asyncio.create_task(self._close_when_idle(timeout_seconds))
+
+    def _cancel_idle_close(self) -> None:
+        task = self._idle_close_task
+        self._idle_close_task = None
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+
+    async def _close_when_idle(self, timeout_seconds: float) -> None:
+        await asyncio.sleep(timeout_seconds)
+        async with self._query_lock:
+            self._idle_close_task = None
+            if self._warm_pending:
+                self._warm_pending = False
+                Metrics.runtime_warmups_total.inc(Constants.WARM_OUTCOME_EXPIRED)
+            await self._discard_host()
+
     async def _set_active_client(self, client: ClaudeSDKClient) -> None:
         async with self._active_client_lock:
             self._active_client = client
@@ -141,21 +396,20 @@ class ClaudeSessionRuntime:
                 self._active_client = None
 
     def _build_options(self) -> ClaudeOptions:
-        options_kwargs: dict[str, Any] = {
-            "model": self._model,
-            "permission_mode": self._permission_mode,
-            "max_turns": self._max_turns,
-        }
-        if self._allowed_tools:
-            options_kwargs["allowed_tools"] = self._allowed_tools
-        if self._system_prompt:
-            options_kwargs["system_prompt"] = self._system_prompt
-        if self._resume:
-            options_kwargs["resume"] = self._resume
-        if self._debug_stderr:
-            options_kwargs["extra_args"] = {"debug-to-stderr": None}
-        result = ClaudeOptions(**options_kwargs)
-        return result
+        # Memoized until set_resume() or configure() changes an input; the SDK never mutates options.
+        if self._options is not None:
+            return self._options
+        self._options = ClaudeOptionsFactory.build(
+            model=self._model,
+            permission_mode=self._permission_mode,
+            max_turns=self._max_turns,
+            system_prompt=self._system_prompt,
+            allowed_tools=self._allowed_tools,
+            debug_stderr=self._debug_stderr,
+            include_partial_messages=self._include_partial_messages,
+            resume=self._resume,
+        )
+        return self._options
 
     @classmethod
     def _is_retryable_startup_error(cls, exc: Exception) -> bool:
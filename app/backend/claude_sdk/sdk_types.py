@@ -5,6 +5,6 @@ try:
 except ImportError:  # pragma: no cover - compatibility branch
     from claude_code_sdk import ClaudeAgentOptions as ClaudeOptions
 
-from claude_code_sdk import ClaudeSDKClient
+from claude_code_sdk import ClaudeSDKClient, PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
-__all__ = ["ClaudeOptions", "ClaudeSDKClient"]
+__all__ = ["ClaudeOptions", "ClaudeSDKClient", "PermissionResultAllow", "PermissionResultDeny", "ToolPermissionContext"]
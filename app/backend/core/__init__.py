@@ -1,6 +1,40 @@
+from app.backend.core.calendar_month import CalendarMonth
 from app.backend.core.constants import Constants
+from app.backend.core.json_codec import EncodedJsonDict, JsonCodec
+from app.backend.core.json_codec_response import JsonCodecResponse
+from app.backend.core.instrumented_queue_pool import InstrumentedQueuePool
+from app.backend.core.keyset_cursor import KeysetCursor
+from app.backend.core.loop_lag_monitor import LoopLagMonitor
+from app.backend.core.metric_counter import MetricCounter
+from app.backend.core.metric_histogram import MetricHistogram
+from app.backend.core.metrics import Metrics
+from app.backend.core.metrics_registry import MetricsRegistry
 from app.backend.core.permission_mode import PermissionMode
+from app.backend.core.search_cursor import SearchCursor
 from app.backend.core.settings import Settings
+from app.backend.core.sse_frame_encoder import SseFrameEncoder
+from app.backend.core.stats_collector import StatsCollector
+from app.backend.core.turn_profiler import TurnProfiler
+from app.backend.core.turn_trace import TurnTrace
 
-__all__ = ["Constants", "PermissionMode", "Settings"]
-
+__all__ = [
+    "CalendarMonth",
+    "Constants",
+    "EncodedJsonDict",
+    "InstrumentedQueuePool",
+    "JsonCodec",
+    "JsonCodecResponse",
+    "KeysetCursor",
+    "LoopLagMonitor",
+    "MetricCounter",
+    "MetricHistogram",
+    "Metrics",
+    "MetricsRegistry",
+    "PermissionMode",
+    "SearchCursor",
+    "Settings",
+    "SseFrameEncoder",
+    "StatsCollector",
+    "TurnProfiler",
+    "TurnTrace",
+]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+class CalendarMonth:
+    # UTC month boundaries used as partition bounds for the log tables.
+    @classmethod
+    def start_of(cls, moment: datetime) -> datetime:
+        result = moment.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return result
+
+    @classmethod
+    def shift(cls, month_start: datetime, months: int) -> datetime:
+        index = month_start.year * 12 + month_start.month - 1 + months
+        result = month_start.replace(year=index // 12, month=index % 12 + 1)
+        return result
+
+    @classmethod
+    def between(cls, first: datetime, last: datetime) -> list[datetime]:
+        # Start of every month from the one containing first through the one containing last.
+        month_start = cls.start_of(first)
+        end = cls.start_of(last)
+        result = []
+        while month_start <= end:
+            result.append(month_start)
+            month_start = cls.shift(month_start, 1)
+        return result
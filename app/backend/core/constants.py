@@ -25,6 +25,11 @@ class _Constants:
     # Stream envelope events
     STREAM_EVENT_MESSAGE: str = "message"
     STREAM_EVENT_ERROR: str = "error"
+    STREAM_EVENT_DONE: str = "done"
+    STREAM_EVENT_RESYNC: str = "resync"
+    STREAM_EVENT_QUEUED: str = "queued"
+    STREAM_EVENT_DELTA: str = "delta"
+    STREAM_SDK_EVENT_CONTENT_BLOCK_DELTA: str = "content_block_delta"
 
     # Session events and status
     SESSION_EVENT_CREATED: str = "SESSION_CREATED"
@@ -34,6 +39,11 @@ class _Constants:
     SESSION_EVENT_SDK_ERROR: str = "SDK_ERROR"
     SESSION_EVENT_WAITING_USER_ANSWER: str = "WAITING_USER_ANSWER"
     SESSION_EVENT_RUNTIME_RESET: str = "RUNTIME_RESET"
+    SESSION_EVENT_ADMISSION_REJECTED: str = "ADMISSION_REJECTED"
+    SESSION_EVENT_TURN_TRACE: str = "TURN_TRACE"
+    SESSION_EVENT_USER_ANSWERED: str = "USER_ANSWERED"
+    SESSION_EVENT_TURN_PARKED: str = "TURN_PARKED"
+    SESSION_STATUS_ACTIVE: str = "active"
     SESSION_STATUS_ERROR: str = "error"
     SESSION_SOURCE_UI: str = "ui"
 
@@ -49,8 +59,121 @@ class _Constants:
     RUNTIME_RETRY_TOKEN_CONTROL_REQUEST_TIMEOUT: str = "control request timeout"
     RUNTIME_RETRY_TOKEN_EXIT_CODE_1: str = "command failed with exit code 1"
 
+    # Keyset pagination
+    PAGE_DEFAULT_LIMIT: int = 200
+    PAGE_MAX_LIMIT: int = 1000
+    MESSAGE_FIELDS_SUMMARY: str = "summary"
+
+    # Session summaries
+    SESSION_PREVIEW_MAX_CHARS: int = 200
+
+    # Full-text search
+    SEARCH_TEXT_CONFIG: str = "english"
+    SEARCH_INDEXED_MAX_CHARS: int = 100_000
+    SEARCH_DEFAULT_LIMIT: int = 20
+    SEARCH_MAX_LIMIT: int = 100
+    SEARCH_QUERY_MAX_CHARS: int = 200
+    SEARCH_HEADLINE_OPTIONS: str = "MaxFragments=2, MaxWords=24, MinWords=8, StartSel=<mark>, StopSel=</mark>"
+    SEARCH_HIT_KIND_MESSAGE: str = "message"
+    SEARCH_HIT_KIND_SESSION: str = "session"
+    SEARCH_BACKFILL_BATCH_SIZE: int = 2000
+    SEARCH_BACKFILL_PAUSE_SECONDS: float = 0.05
+    SEARCH_BACKFILL_RETRY_SECONDS: float = 60.0
+    # Column.info keys of a search column: the tsvector expression ({row} is "NEW." inside the trigger), the
+    # columns whose update refreshes it, and the indexed key order the backfill walks.
+    COLUMN_INFO_TSVECTOR_SOURCE: str = "tsvector_source"
+    COLUMN_INFO_TSVECTOR_INPUTS: str = "tsvector_inputs"
+    COLUMN_INFO_BACKFILL_ORDER: str = "backfill_order"
+
+    # Cross-process session coordination
+    COORDINATION_INTERRUPT_CHANNEL: str = "claude_ui_session_interrupt"
+    COORDINATION_ANSWER_CHANNEL: str = "claude_ui_session_answer"
+    COORDINATION_ANSWER_CLAIM_CHANNEL: str = "claude_ui_session_answer_claim"
+    COORDINATION_ANSWER_CLAIM_TIMEOUT_SECONDS: float = 1.0
+    COORDINATION_NOTIFY_MAX_BYTES: int = 7999
+    COORDINATION_LOCK_POLL_SECONDS: float = 0.2
+    COORDINATION_LISTENER_RETRY_SECONDS: float = 2.0
+
+    # Turn scheduling
+    TURN_STATUS_QUEUED: str = "queued"
+    TURN_STATUS_RUNNING: str = "running"
+    TURN_STATUS_SUSPENDED: str = "suspended"
+    TURN_STATUS_COMPLETED: str = "completed"
+    TURN_STATUS_FAILED: str = "failed"
+    TURN_READY_PRIORITY_RESUMED: int = 0
+    TURN_READY_PRIORITY_SESSION: int = 1
+    TURN_HISTORY_MAX_ENTRIES: int = 4096
+    TURN_QUEUE_RETRY_AFTER_SECONDS: int = 5
+
+    # Admission control
+    ADMISSION_RETRY_AFTER_SECONDS: int = 10
+    PROCESS_SLOT_RECLAIM_POLL_SECONDS: float = 0.5
+
+    # Metrics
+    METRICS_NAMESPACE: str = "claude_ui"
+    METRICS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+    METRICS_FAST_BUCKETS: tuple[float, ...] = (
+        0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0,
+    )
+    METRICS_POOL_BUCKETS: tuple[float, ...] = (
+        0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+    )
+    METRICS_SLOW_BUCKETS: tuple[float, ...] = (
+        0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+    )
+
+    # Turn tracing and slow-turn profiling
+    TRACE_SPAN_PROMPT_PERSISTED: str = "prompt_persisted"
+    TRACE_SPAN_RUNTIME_ACQUIRED: str = "runtime_acquired"
+    TRACE_SPAN_CLIENT_CONNECTED: str = "client_connected"
+    TRACE_SPAN_FIRST_SDK_MESSAGE: str = "first_sdk_message"
+    TRACE_SPAN_TOOL_CALL: str = "tool_call"
+    TRACE_SPAN_RESULT: str = "result"
+    TRACE_SPAN_LAST_DB_FLUSH: str = "last_db_flush"
+    TRACE_SPAN_PROFILER_STARTED: str = "profiler_started"
+    TRACE_MAX_SPANS: int = 500
+    PROFILER_SAMPLE_INTERVAL_SECONDS: float = 0.005
+    PROFILER_LAG_PROBE_INTERVAL_SECONDS: float = 0.1
+    PROFILER_TOP_FUNCTIONS: int = 15
+
+    # Log partitioning and archival
+    LOG_PARTITION_PREFIX: str = "p"
+    LOG_REHYDRATED_PARTITION_PREFIX: str = "r"
+    LOG_LEGACY_PARTITION_SUFFIX: str = "legacy"
+    LOG_ARCHIVE_FILE_SUFFIX: str = ".ndjson.gz"
+    LOG_REHYDRATED_HOLD_SECONDS: float = 7 * 24 * 3600.0
+    # Advisory lock keys; the session coordinator derives its keys from session UUIDs instead.
+    LOG_SCHEMA_LOCK_KEY: int = 7_308_604_897_068_083_201
+    LOG_MAINTENANCE_LOCK_KEY: int = 7_308_604_897_068_083_202
+    SEARCH_BACKFILL_LOCK_KEY: int = 7_308_604_897_068_083_203
+    INDEX_BUILD_LOCK_KEY: int = 7_308_604_897_068_083_204
+
+    # Claude config files
+    CONFIG_FILES_RECHECK_SECONDS: float = 30.0
+
+    # Pre-connected client pool
+    CLIENT_POOL_MAINTENANCE_INTERVAL_SECONDS: float = 30.0
+
+    # Speculative runtime warm-up
+    WARM_STATUS_WARMING: str = "warming"
+    WARM_STATUS_READY: str = "ready"
+    WARM_STATUS_BUSY: str = "busy"
+    WARM_STATUS_SATURATED: str = "saturated"
+    WARM_STATUS_DISABLED: str = "disabled"
+    WARM_OUTCOME_STARTED: str = "started"
+    WARM_OUTCOME_FAILED: str = "failed"
+    WARM_OUTCOME_HIT: str = "hit"
+    WARM_OUTCOME_MISS: str = "miss"
+    WARM_OUTCOME_EXPIRED: str = "expired"
+    WARM_OUTCOME_RECLAIMED: str = "reclaimed"
+    WARM_OUTCOME_SKIPPED: str = "skipped"
+
     # Tool names
     TOOL_ASK_USER_QUESTION: str = "AskUserQuestion"
 
+    # Tool permission prompts
+    TOOL_PERMISSION_DENIED_MESSAGE: str = "Permission prompts are not available in this session."
+    ASK_USER_PARKED_MESSAGE: str = "The user did not answer in time. Stop here; the answer will arrive as a new prompt."
+
 
 Constants = _Constants()
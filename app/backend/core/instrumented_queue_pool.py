@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.backend.core.metrics import Metrics
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    # Times every checkout, including the wait for a free slot and any new connection, and counts
+    # checkouts that give up after pool_timeout.
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            result = super()._do_get()
+        except exc.TimeoutError:
+            Metrics.db_pool_timeouts_total.inc()
+            raise
+        finally:
+            Metrics.db_pool_checkout_seconds.observe(time.perf_counter() - started)
+        return result
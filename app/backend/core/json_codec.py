@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class EncodedJsonDict(dict):
+    # A payload that remembers its own JSON encoding, so the SSE frame and the JSONB column reuse it.
+    __slots__ = ("encoded",)
+
+    encoded: bytes
+
+
+class JsonCodec:
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        if isinstance(value, EncodedJsonDict):
+            return value.encoded
+        if orjson is not None:
+            try:
+                return orjson.dumps(value, default=cls._default)
+            except TypeError:
+                # orjson rejects a few inputs the stdlib accepts (non-str keys, ints above 64 bits).
+                pass
+        result = json.dumps(value, default=cls._default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return result
+
+    @classmethod
+    def dumps_text(cls, value: Any) -> str:
+        result = cls.dumps(value).decode("utf-8")
+        return result
+
+    @classmethod
+    def loads(cls, value: str | bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(value)
+        result = json.loads(value)
+        return result
+
+    @classmethod
+    def pre_encode(cls, value: dict[str, Any]) -> EncodedJsonDict:
+        if isinstance(value, EncodedJsonDict):
+            return value
+        result = EncodedJsonDict(value)
+        result.encoded = cls.dumps(value)
+        return result
+
+    @classmethod
+    def _default(cls, value: Any) -> Any:
+        if isinstance(value, UUID):
+            return str(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return str(value)
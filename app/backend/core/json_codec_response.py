@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.backend.core.json_codec import JsonCodec
+
+
+class JsonCodecResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        result = JsonCodec.dumps(content)
+        return result
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+class KeysetCursor:
+    # Opaque (created_at, id) position used by the paginated list endpoints.
+    @classmethod
+    def encode(cls, created_at: datetime, row_id: UUID) -> str:
+        raw = f"{created_at.isoformat()}|{row_id}"
+        result = base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+        return result
+
+    @classmethod
+    def decode(cls, value: str) -> tuple[datetime, UUID]:
+        padded = value + "=" * (-len(value) % 4)
+        try:
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            created_at_text, row_id_text = raw.split("|", 1)
+            created_at = datetime.fromisoformat(created_at_text)
+            row_id = UUID(row_id_text)
+        except (ValueError, UnicodeError) as exc:
+            raise ValueError(f"Invalid cursor: {value}") from exc
+        if created_at.tzinfo is None:
+            raise ValueError(f"Invalid cursor: {value}")
+        result = (created_at, row_id)
+        return result
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import ClassVar
+
+from app.backend.core.metrics import Metrics
+
+
+class LoopLagMonitor:
+    # A probe task measures how late the event loop wakes it up. With the block detector enabled, a
+    # watchdog thread notices when the probe stops beating and logs the stack the loop thread is stuck in.
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = ("loop_blocks_detected",)
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float,
+        block_detector_enabled: bool,
+        block_threshold_ms: float,
+    ) -> None:
+        self._interval_seconds = interval_seconds
+        self._block_detector_enabled = block_detector_enabled
+        self._block_threshold_seconds = block_threshold_ms / 1000
+
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._heartbeat = time.monotonic()
+
+        self._last_lag_seconds = 0.0
+        self._max_lag_seconds = 0.0
+        self._blocks_detected = 0
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._probe())
+        if self._block_detector_enabled:
+            self._watchdog = threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(),),
+                name="loop-block-detector",
+                daemon=True,
+            )
+            self._watchdog.start()
+
+    async def close(self) -> None:
+        self._stop_event.set()
+        task = self._task
+        self._task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        watchdog = self._watchdog
+        self._watchdog = None
+        if watchdog is not None:
+            await asyncio.to_thread(watchdog.join)
+
+    def stats(self) -> dict[str, float | int]:
+        result = {
+            "loop_lag_last_seconds": self._last_lag_seconds,
+            "loop_lag_max_seconds": self._max_lag_seconds,
+            "loop_blocks_detected": self._blocks_detected,
+        }
+        return result
+
+    async def _probe(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval_seconds
+            await asyncio.sleep(self._interval_seconds)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag_seconds = max(0.0, now - expected)
+            self._last_lag_seconds = lag_seconds
+            self._max_lag_seconds = max(self._max_lag_seconds, lag_seconds)
+            Metrics.loop_lag_seconds.observe(lag_seconds)
+
+    def _watch(self, loop_thread_id: int) -> None:
+        poll_seconds = min(self._block_threshold_seconds / 2, self._interval_seconds)
+        reported_heartbeat: float | None = None
+        while not self._stop_event.wait(poll_seconds):
+            heartbeat = self._heartbeat
+            stalled_seconds = time.monotonic() - heartbeat - self._interval_seconds
+            # One report per stall: the heartbeat has to move before the same block is logged again.
+            if stalled_seconds < self._block_threshold_seconds or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            self._blocks_detected += 1
+            Metrics.loop_blocks_total.inc()
+            frame = sys._current_frames().get(loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>"
+            logging.getLogger(__name__).warning(
+                "[loop] event loop blocked for more than %.0f ms; loop thread stack:\n%s",
+                stalled_seconds * 1000,
+                stack,
+            )
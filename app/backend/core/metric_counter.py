@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+
+class MetricCounter:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list[str]:
+        result = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        if not self._values and not self.label_names:
+            result.append(f"{self.name} 0")
+        for label_values, value in sorted(self._values.items()):
+            result.append(f"{self.name}{self._format_labels(label_values)} {value:g}")
+        return result
+
+    def _format_labels(self, label_values: tuple[str, ...]) -> str:
+        if not label_values:
+            return ""
+        pairs = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, label_values))
+        result = "{" + pairs + "}"
+        return result
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+
+
+class MetricHistogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._buckets = tuple(sorted(buckets))
+        # One slot per bucket bound plus the +Inf overflow; cumulative counts are built when rendering.
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def render(self) -> list[str]:
+        result = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self._buckets, self._counts):
+            cumulative += count
+            result.append(f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}')
+        result.append(f'{self.name}_bucket{{le="+Inf"}} {self._count}')
+        result.append(f"{self.name}_sum {self._sum:.6f}")
+        result.append(f"{self.name}_count {self._count}")
+        return result
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from app.backend.core.constants import Constants
+from app.backend.core.metrics_registry import MetricsRegistry
+
+
+class _Metrics:
+    def __init__(self) -> None:
+        self.registry = MetricsRegistry(Constants.METRICS_NAMESPACE)
+
+        # Claude runtime
+        self.sdk_connect_seconds = self.registry.histogram(
+            "sdk_connect_seconds",
+            "Time to spawn and connect a Claude CLI client.",
+            Constants.METRICS_SLOW_BUCKETS,
+        )
+        self.first_message_seconds = self.registry.histogram(
+            "first_message_seconds",
+            "Time from the start of a query to the first SDK message.",
+            Constants.METRICS_SLOW_BUCKETS,
+        )
+        self.query_retries_total = self.registry.counter(
+            "query_retries_total",
+            "Transient SDK startup failures retried by the runtime.",
+        )
+        self.runtime_warmups_total = self.registry.counter(
+            "runtime_warmups_total",
+            "Speculative runtime warm-ups, by outcome: started, failed, skipped, hit, miss, expired or reclaimed.",
+            ("outcome",),
+        )
+
+        # Database pool
+        self.db_pool_checkout_seconds = self.registry.histogram(
+            "db_pool_checkout_seconds",
+            "Time to check a connection out of the pool, including waiting for a free slot.",
+            Constants.METRICS_POOL_BUCKETS,
+        )
+        self.db_pool_timeouts_total = self.registry.counter(
+            "db_pool_timeouts_total",
+            "Pool checkouts that failed after pool_timeout.",
+        )
+
+        # Event loop
+        self.loop_lag_seconds = self.registry.histogram(
+            "loop_lag_seconds",
+            "How late the event loop ran the lag probe.",
+            Constants.METRICS_FAST_BUCKETS,
+        )
+        self.loop_blocks_total = self.registry.counter(
+            "loop_blocks_total",
+            "Event-loop stalls longer than the block detector threshold.",
+        )
+
+        # Turn pipeline
+        self.serialize_seconds = self.registry.histogram(
+            "serialize_seconds",
+            "Time to serialize one SDK message.",
+            Constants.METRICS_FAST_BUCKETS,
+        )
+        self.message_insert_seconds = self.registry.histogram(
+            "message_insert_seconds",
+            "Time to insert and commit one batch of message rows.",
+            Constants.METRICS_FAST_BUCKETS,
+        )
+        self.search_seconds = self.registry.histogram(
+            "search_seconds",
+            "Time to run one full-text search page over a user's session history.",
+            Constants.METRICS_FAST_BUCKETS,
+        )
+        self.sse_write_seconds = self.registry.histogram(
+            "sse_write_seconds",
+            "Time to hand one SSE frame to a client connection.",
+            Constants.METRICS_FAST_BUCKETS,
+        )
+        self.turn_queue_wait_seconds = self.registry.histogram(
+            "turn_queue_wait_seconds",
+            "Time an agent turn waited in the scheduler queue.",
+            Constants.METRICS_SLOW_BUCKETS,
+        )
+        self.turn_seconds = self.registry.histogram(
+            "turn_seconds",
+            "Total duration of an agent turn.",
+            Constants.METRICS_SLOW_BUCKETS,
+        )
+        self.stream_deltas_total = self.registry.counter(
+            "stream_deltas_total",
+            "Partial-message deltas received from the SDK.",
+        )
+        self.stream_delta_frames_total = self.registry.counter(
+            "stream_delta_frames_total",
+            "Coalesced delta frames sent to stream followers.",
+        )
+        self.runtime_resets_total = self.registry.counter(
+            "runtime_resets_total",
+            "Runtimes dropped and rebuilt after a recoverable error.",
+        )
+        self.session_events_total = self.registry.counter(
+            "session_events_total",
+            "Session log events written, by event type.",
+            ("event_type",),
+        )
+
+        # Log retention
+        self.log_partitions_archived_total = self.registry.counter(
+            "log_partitions_archived_total",
+            "Expired log partitions exported to the archive directory and dropped, by table.",
+            ("table",),
+        )
+        self.log_rows_archived_total = self.registry.counter(
+            "log_rows_archived_total",
+            "Log rows written to archive files, by table.",
+            ("table",),
+        )
+        self.log_rows_rehydrated_total = self.registry.counter(
+            "log_rows_rehydrated_total",
+            "Archived log rows loaded back when an archived session was opened, by table.",
+            ("table",),
+        )
+
+
+Metrics = _Metrics()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+
+from app.backend.core.metric_counter import MetricCounter
+from app.backend.core.metric_histogram import MetricHistogram
+from app.backend.core.stats_collector import StatsCollector
+
+
+class MetricsRegistry:
+    # In-process metrics rendered in the Prometheus text exposition format. Counters and histograms
+    # are process-wide; the stats collectors belong to the application instance and are passed to
+    # render(), so a second instance never duplicates a series.
+    def __init__(self, namespace: str) -> None:
+        self._namespace = namespace
+        self._metrics: dict[str, MetricCounter | MetricHistogram] = {}
+
+    def counter(self, name: str, help_text: str, label_names: tuple[str, ...] = ()) -> MetricCounter:
+        result = MetricCounter(f"{self._namespace}_{name}", help_text, label_names)
+        self._metrics[result.name] = result
+        return result
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...]) -> MetricHistogram:
+        result = MetricHistogram(f"{self._namespace}_{name}", help_text, buckets)
+        self._metrics[result.name] = result
+        return result
+
+    def render(self, collectors: Iterable[StatsCollector] = ()) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                values = collector.collect()
+            except Exception as exc:
+                logging.getLogger(__name__).warning("[metrics] collector failed: %s", exc)
+                continue
+            for key, value in values.items():
+                if key in collector.counter_keys:
+                    name = f"{self._namespace}_{key}_total"
+                    lines.append(f"# TYPE {name} counter")
+                else:
+                    name = f"{self._namespace}_{key}"
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {float(value):g}")
+        result = "\n".join(lines) + "\n"
+        return result
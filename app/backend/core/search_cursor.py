@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+class SearchCursor:
+    # Opaque (rank, created_at, id) position for ranked search pages; the rank is carried as repr() so it
+    # compares equal to the value Postgres computed.
+    @classmethod
+    def encode(cls, rank: float, created_at: datetime, row_id: UUID) -> str:
+        raw = f"{rank!r}|{created_at.isoformat()}|{row_id}"
+        result = base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+        return result
+
+    @classmethod
+    def decode(cls, value: str) -> tuple[float, datetime, UUID]:
+        padded = value + "=" * (-len(value) % 4)
+        try:
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            rank_text, created_at_text, row_id_text = raw.split("|", 2)
+            rank = float(rank_text)
+            created_at = datetime.fromisoformat(created_at_text)
+            row_id = UUID(row_id_text)
+        except (ValueError, UnicodeError) as exc:
+            raise ValueError(f"Invalid cursor: {value}") from exc
+        if created_at.tzinfo is None:
+            raise ValueError(f"Invalid cursor: {value}")
+        result = (rank, created_at, row_id)
+        return result
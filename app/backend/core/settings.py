@@ -14,6 +14,13 @@ class Settings(BaseSettings):
     app_port: int = 8000
 
     database_url: str = "postgresql+asyncpg://claude_user:claude_pass@db:5432/claude_ui"
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 10.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_prepared_statement_cache_size: int = 100
 
     claude_model: str = "claude-sonnet-4-5"
     claude_max_turns: int = 16
@@ -21,6 +28,49 @@ class Settings(BaseSettings):
     claude_system_prompt: str | None = None
     claude_allowed_tools: list[str] | None = None
     claude_debug_stderr: bool = False
+    claude_include_partial_messages: bool = False
+    claude_persistent_client: bool = True
+    claude_client_idle_timeout_seconds: float = 300.0
+    claude_warm_ttl_seconds: float = 60.0
+    claude_pool_size: int = 1
+    claude_pool_max_idle_seconds: float = 600.0
+    claude_pool_prewarm_csv: str = ""
+    claude_runtime_max_entries: int = 512
+    claude_runtime_idle_ttl_seconds: float = 3600.0
+    claude_runtime_sweep_interval_seconds: float = 60.0
+
+    coordination_enabled: bool = True
+    coordination_lock_timeout_seconds: float = 30.0
+
+    turn_worker_count: int = 4
+    turn_queue_max_pending: int = 256
+
+    admission_max_concurrent: int = 4
+    admission_queue_timeout_seconds: float = 60.0
+    admission_per_user_max: int = 4
+
+    stream_replay_buffer_size: int = 1024
+    stream_replay_retention_seconds: float = 600.0
+    stream_delta_flush_hz: float = 30.0
+
+    ask_user_answer_timeout_seconds: float = 300.0
+    ask_user_reclaim_slots: bool = False
+
+    trace_profiler_enabled: bool = False
+    trace_slow_turn_seconds: float = 60.0
+
+    loop_monitor_interval_seconds: float = 0.5
+    loop_block_detector_enabled: bool = False
+    loop_block_threshold_ms: float = 100.0
+
+    message_flush_batch_size: int = 32
+    message_flush_interval_seconds: float = 0.25
+    message_compact_raw: bool = True
+
+    log_partition_months_ahead: int = 2
+    log_retention_months: int = 0
+    log_archive_dir: str = "/app/archive"
+    log_maintenance_interval_seconds: float = 3600.0
 
     default_users_csv: str = "demo:Demo User,analyst:Analyst User"
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.backend.core.json_codec import EncodedJsonDict, JsonCodec
+
+
+class SseFrameEncoder:
+    _ID_PREFIX = b"id: "
+    _FRAME_PREFIX = b"data: "
+    _FRAME_SUFFIX = b"\n\n"
+    _PAYLOAD_KEY = b',"payload":'
+
+    @classmethod
+    def encode(cls, envelope: dict[str, Any], *, event_id: int | None = None) -> bytes:
+        body = cls._encode_envelope(envelope)
+        result = cls._FRAME_PREFIX + body + cls._FRAME_SUFFIX
+        if event_id is not None:
+            result = cls._ID_PREFIX + str(event_id).encode("ascii") + b"\n" + result
+        return result
+
+    @classmethod
+    def _encode_envelope(cls, envelope: dict[str, Any]) -> bytes:
+        event_payload = envelope.get("payload")
+        message_payload = event_payload.get("payload") if isinstance(event_payload, dict) else None
+        if not isinstance(message_payload, EncodedJsonDict) or set(envelope) != {"event", "payload"}:
+            return JsonCodec.dumps(envelope)
+
+        # Splice the message payload's existing encoding in instead of encoding it a second time.
+        shell = JsonCodec.dumps({key: value for key, value in event_payload.items() if key != "payload"})
+        if shell == b"{}":
+            inner = b'{"payload":' + message_payload.encoded + b"}"
+        else:
+            inner = shell[:-1] + cls._PAYLOAD_KEY + message_payload.encoded + b"}"
+        result = b'{"event":' + JsonCodec.dumps(envelope["event"]) + b',"payload":' + inner + b"}"
+        return result
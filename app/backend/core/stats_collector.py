@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+
+class StatsCollector:
+    # Exposes an existing stats() dictionary on /api/metrics. Keys listed in counter_keys only ever grow
+    # and are rendered as counters; every other key is a gauge.
+    def __init__(self, collect: Callable[[], dict[str, int | float]], counter_keys: Iterable[str] = ()) -> None:
+        self.collect = collect
+        self.counter_keys = frozenset(counter_keys)
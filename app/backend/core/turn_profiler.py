@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+from app.backend.core.constants import Constants
+
+
+class TurnProfiler:
+    # Sampling profiler for a slow turn. A daemon thread samples the innermost frame of the event-loop
+    # thread while a task on the loop measures scheduling lag; nothing is instrumented in the hot path.
+    def __init__(self, sample_interval_seconds: float) -> None:
+        self._sample_interval_seconds = sample_interval_seconds
+        self._samples: Counter[str] = Counter()
+        self._lag_seconds: list[float] = []
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lag_task: asyncio.Task[None] | None = None
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._started = time.perf_counter()
+        loop_thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, args=(loop_thread_id,), daemon=True)
+        self._thread.start()
+        self._lag_task = asyncio.create_task(self._measure_lag())
+
+    async def stop(self) -> dict[str, Any]:
+        self._stop_event.set()
+        lag_task = self._lag_task
+        self._lag_task = None
+        if lag_task is not None:
+            lag_task.cancel()
+            try:
+                await lag_task
+            except asyncio.CancelledError:
+                pass
+        thread = self._thread
+        if thread is not None:
+            await asyncio.to_thread(thread.join)
+
+        total = sum(self._samples.values())
+        lag_count = len(self._lag_seconds)
+        result = {
+            "profiled_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "samples": total,
+            "top_functions": [
+                {"function": function, "samples": count, "share": round(count / total, 4)}
+                for function, count in self._samples.most_common(Constants.PROFILER_TOP_FUNCTIONS)
+            ],
+            "loop_lag_ms": {
+                "max": round(max(self._lag_seconds, default=0.0) * 1000, 3),
+                "avg": round(sum(self._lag_seconds) / lag_count * 1000, 3) if lag_count else 0.0,
+            },
+        }
+        return result
+
+    def _sample(self, loop_thread_id: int) -> None:
+        while not self._stop_event.wait(self._sample_interval_seconds):
+            frame = sys._current_frames().get(loop_thread_id)
+            if frame is None:
+                continue
+            code = frame.f_code
+            self._samples[f"{code.co_filename}:{code.co_firstlineno}:{code.co_name}"] += 1
+
+    async def _measure_lag(self) -> None:
+        interval = Constants.PROFILER_LAG_PROBE_INTERVAL_SECONDS
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            self._lag_seconds.append(max(0.0, time.perf_counter() - expected))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from app.backend.core.constants import Constants
+
+
+class TurnTrace:
+    # Timeline of one agent turn: named marks with their offset from the start of the turn, persisted
+    # as a session log so a slow turn can be attributed to the model, the CLI, the database or our code.
+    def __init__(self, turn_id: str | None) -> None:
+        self.turn_id = turn_id
+        self.profile: dict[str, Any] | None = None
+        self._started = time.perf_counter()
+        self._started_at = datetime.now(timezone.utc)
+        self._spans: list[dict[str, Any]] = []
+        self._dropped_spans = 0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        result = time.perf_counter() - self._started
+        return result
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._spans
+
+    def mark(self, name: str, *, duration_seconds: float | None = None, **attributes: Any) -> None:
+        if len(self._spans) >= Constants.TRACE_MAX_SPANS:
+            self._dropped_spans += 1
+            return
+        span: dict[str, Any] = {"name": name, "offset_ms": round(self.elapsed_seconds * 1000, 3)}
+        if duration_seconds is not None:
+            span["duration_ms"] = round(duration_seconds * 1000, 3)
+        if attributes:
+            span["attributes"] = attributes
+        self._spans.append(span)
+
+    def to_details(self) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "turn_id": self.turn_id,
+            "started_at": self._started_at.isoformat(),
+            "total_ms": round(self.elapsed_seconds * 1000, 3),
+            "spans": self._spans,
+        }
+        if self._dropped_spans:
+            result["dropped_spans"] = self._dropped_spans
+        if self.profile is not None:
+            result["profile"] = self.profile
+        return result
@@ -2,18 +2,72 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import re
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Column, Connection, Index, Table, inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateColumn, CreateIndex
 
+from app.backend.core.calendar_month import CalendarMonth
+from app.backend.core.constants import Constants
+from app.backend.core.instrumented_queue_pool import InstrumentedQueuePool
+from app.backend.core.json_codec import JsonCodec
 from app.backend.models import Base
 
+# (partition name, lower bound, upper bound); a None bound is MINVALUE or MAXVALUE.
+LogPartition = tuple[str, datetime | None, datetime | None]
+
 
 class DatabaseManager:
-    def __init__(self, database_url: str) -> None:
-        self._engine: AsyncEngine = create_async_engine(database_url, future=True)
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout_seconds: float = 30.0,
+        pool_recycle_seconds: int = -1,
+        pool_pre_ping: bool = False,
+        statement_cache_size: int = 100,
+        prepared_statement_cache_size: int = 100,
+        partition_months_ahead: int = 2,
+    ) -> None:
+        self._partition_months_ahead = partition_months_ahead
+        self._engine: AsyncEngine = create_async_engine(
+            database_url,
+            future=True,
+            json_serializer=JsonCodec.dumps_text,
+            json_deserializer=JsonCodec.loads,
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout_seconds,
+            pool_recycle=pool_recycle_seconds,
+            pool_pre_ping=pool_pre_ping,
+            # asyncpg's own per-connection statement cache and SQLAlchemy's prepared statement cache;
+            # both must be 0 behind a transaction-pooling PgBouncer.
+            connect_args={
+                "statement_cache_size": statement_cache_size,
+                "prepared_statement_cache_size": prepared_statement_cache_size,
+            },
+        )
+        # Connections held for as long as a turn or the worker itself (advisory leases, LISTEN) are opened
+        # outside the pool: they never occupy a pool slot, and closing one ends its backend, so a
+        # session-level lock can never ride along into a reused connection.
+        self._dedicated_engine: AsyncEngine = create_async_engine(
+            database_url,
+            future=True,
+            poolclass=NullPool,
+            connect_args={
+                "statement_cache_size": statement_cache_size,
+                "prepared_statement_cache_size": prepared_statement_cache_size,
+            },
+        )
         self._session_maker = async_sessionmaker(
             self._engine,
             expire_on_commit=False,
@@ -24,9 +78,380 @@ class DatabaseManager:
     def engine(self) -> AsyncEngine:
         return self._engine
 
+    @property
+    def dedicated_engine(self) -> AsyncEngine:
+        return self._dedicated_engine
+
+    def stats(self) -> dict[str, int]:
+        pool = self._engine.sync_engine.pool
+        if not isinstance(pool, InstrumentedQueuePool):
+            return {}
+        result = {
+            "db_pool_size": pool.size(),
+            "db_pool_checked_out": pool.checkedout(),
+            "db_pool_checked_in": pool.checkedin(),
+            "db_pool_overflow": max(0, pool.overflow()),
+        }
+        return result
+
     async def create_tables(self) -> None:
         async with self._engine.begin() as connection:
+            # Workers starting together would race on the DDL below: one runs it, the others wait here.
+            await connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": Constants.LOG_SCHEMA_LOCK_KEY})
+            legacy_tables = await self._rename_unpartitioned_tables(connection)
             await connection.run_sync(Base.metadata.create_all)
+            # Existing rows of a table that just got its search column (or whose old table is re-attached
+            # below) start with a NULL search_vector; SearchBackfiller fills them after startup.
+            unfilled_tables = await connection.run_sync(self._tables_missing_search_vectors)
+            unfilled_tables.extend(table.name for table, _ in legacy_tables if self.search_column(table) is not None)
+            await connection.run_sync(self._create_missing_columns)
+            await self._install_search_triggers(connection, legacy_tables)
+            await self._mark_archived_sessions(connection)
+            await self._create_upcoming_partitions(connection)
+            for table, legacy_name in legacy_tables:
+                await self._attach_legacy_table(connection, table, legacy_name)
+            await self._queue_search_backfill(connection, unfilled_tables)
+
+    async def build_missing_indexes(self) -> None:
+        # create_all() skips tables that already exist, so indexes added to a model later are built here, after
+        # startup, with CREATE INDEX CONCURRENTLY: writes continue while a large table is indexed. That cannot run
+        # in a transaction, so it uses an autocommit connection outside the pool, and one worker builds at a time.
+        async with self._dedicated_engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": Constants.INDEX_BUILD_LOCK_KEY},
+            )
+            if not acquired:
+                return
+            try:
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        try:
+                            await self._build_index(connection, table, index)
+                        except Exception as exc:
+                            # Left invalid or partial; the next start picks it up again.
+                            logging.getLogger(__name__).warning(
+                                "[startup] building index %s failed: %s",
+                                index.name,
+                                exc,
+                            )
+            finally:
+                await connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": Constants.INDEX_BUILD_LOCK_KEY},
+                )
+
+    async def ensure_partitions(self) -> None:
+        # Runs periodically so next month's partitions exist long before the first insert needs them.
+        async with self._engine.begin() as connection:
+            await connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": Constants.LOG_SCHEMA_LOCK_KEY})
+            await self._create_upcoming_partitions(connection)
+
+    @classmethod
+    def partitioned_tables(cls) -> list[Table]:
+        result = [
+            table for table in Base.metadata.sorted_tables if table.dialect_options["postgresql"]["partition_by"]
+        ]
+        return result
+
+    @classmethod
+    def search_column(cls, table: Table) -> Column[Any] | None:
+        # The trigger-maintained tsvector column of a table, if it has one.
+        result = next(
+            (column for column in table.columns if Constants.COLUMN_INFO_TSVECTOR_SOURCE in column.info),
+            None,
+        )
+        return result
+
+    @classmethod
+    async def list_partitions(cls, executor: AsyncConnection | AsyncSession, table_name: str) -> list[LogPartition]:
+        query_result = await executor.execute(
+            text(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table_name AND pg_table_is_visible(parent.oid) "
+                "ORDER BY child.relname"
+            ),
+            {"table_name": table_name},
+        )
+        result = [(name, *cls._parse_bounds(bounds)) for name, bounds in query_result.all()]
+        return result
+
+    @classmethod
+    async def create_partition(
+        cls,
+        executor: AsyncConnection | AsyncSession,
+        table_name: str,
+        month_start: datetime,
+        *,
+        prefix: str,
+    ) -> str:
+        result = f"{table_name}_{prefix}{month_start:%Y%m}"
+        month_end = CalendarMonth.shift(month_start, 1)
+        await executor.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {result} PARTITION OF {table_name} "
+                f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"
+            )
+        )
+        return result
+
+    @classmethod
+    async def drop_partition(
+        cls,
+        executor: AsyncConnection | AsyncSession,
+        table_name: str,
+        partition_name: str,
+    ) -> None:
+        await executor.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {partition_name}"))
+        await executor.execute(text(f"DROP TABLE {partition_name}"))
+
+    async def _create_upcoming_partitions(self, connection: AsyncConnection) -> None:
+        current_month = CalendarMonth.start_of(datetime.now(timezone.utc))
+        for table in self.partitioned_tables():
+            existing = {partition[0] for partition in await self.list_partitions(connection, table.name)}
+            for offset in range(self._partition_months_ahead + 1):
+                month_start = CalendarMonth.shift(current_month, offset)
+                if f"{table.name}_{Constants.LOG_PARTITION_PREFIX}{month_start:%Y%m}" in existing:
+                    continue
+                await self.create_partition(connection, table.name, month_start, prefix=Constants.LOG_PARTITION_PREFIX)
+
+    @classmethod
+    async def _rename_unpartitioned_tables(cls, connection: AsyncConnection) -> list[tuple[Table, str]]:
+        # Log tables created before partitioning are plain heaps. They are moved aside here, the partitioned
+        # table is created in their place, and they are attached back as one partition.
+        result: list[tuple[Table, str]] = []
+        for table in cls.partitioned_tables():
+            query_result = await connection.execute(
+                text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                {"table_name": table.name},
+            )
+            if query_result.scalar_one_or_none() != "r":
+                continue
+
+            suffix = Constants.LOG_LEGACY_PARTITION_SUFFIX
+            legacy_name = f"{table.name}_{suffix}"
+            query_result = await connection.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes "
+                    "WHERE tablename = :table_name AND schemaname = current_schema()"
+                ),
+                {"table_name": table.name},
+            )
+            index_names = list(query_result.scalars().all())
+            await connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {legacy_name}"))
+            # Index names are unique per schema and the partitioned table reuses them.
+            for index_name in index_names:
+                legacy_index_name = f"{index_name[: 62 - len(suffix)]}_{suffix}"
+                await connection.execute(text(f'ALTER INDEX "{index_name}" RENAME TO "{legacy_index_name}"'))
+            result.append((table, legacy_name))
+        return result
+
+    @classmethod
+    async def _attach_legacy_table(cls, connection: AsyncConnection, table: Table, legacy_name: str) -> None:
+        # The current month's rows move to their monthly partition first, so the legacy partition ends where
+        # the monthly ones begin. Attaching validates the bound with one scan of the old table.
+        await connection.run_sync(cls._add_missing_columns, table, legacy_name)
+        boundary = CalendarMonth.start_of(datetime.now(timezone.utc))
+        columns = ", ".join(column.name for column in table.columns if column is not cls.search_column(table))
+        await connection.execute(
+            text(
+                f"INSERT INTO {table.name} ({columns}) "
+                f"SELECT {columns} FROM {legacy_name} WHERE created_at >= :boundary"
+            ),
+            {"boundary": boundary},
+        )
+        await connection.execute(
+            text(f"DELETE FROM {legacy_name} WHERE created_at >= :boundary"),
+            {"boundary": boundary},
+        )
+        # A partition cannot keep a primary key of its own; attaching builds the (id, created_at) one.
+        query_result = await connection.execute(
+            text("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table_name) AND contype = 'p'"),
+            {"table_name": legacy_name},
+        )
+        for constraint_name in query_result.scalars().all():
+            await connection.execute(text(f'ALTER TABLE {legacy_name} DROP CONSTRAINT "{constraint_name}"'))
+        await connection.execute(
+            text(
+                f"ALTER TABLE {table.name} ATTACH PARTITION {legacy_name} "
+                f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+            )
+        )
+
+    @classmethod
+    def _tables_missing_search_vectors(cls, connection: Connection) -> list[str]:
+        inspector = inspect(connection)
+        result: list[str] = []
+        for table in Base.metadata.sorted_tables:
+            column = cls.search_column(table)
+            if column is None or not inspector.has_table(table.name):
+                continue
+            if column.name not in {existing["name"] for existing in inspector.get_columns(table.name)}:
+                result.append(table.name)
+        return result
+
+    @classmethod
+    async def _install_search_triggers(
+        cls,
+        connection: AsyncConnection,
+        legacy_tables: list[tuple[Table, str]],
+    ) -> None:
+        # A plain column filled by a BEFORE trigger, rather than a stored generated column: adding it to an
+        # existing table is a catalog change instead of a rewrite under ACCESS EXCLUSIVE.
+        for table, legacy_name in legacy_tables:
+            column = cls.search_column(table)
+            if column is not None:
+                await cls._drop_generated_expression(connection, legacy_name, column.name)
+        for table in Base.metadata.sorted_tables:
+            column = cls.search_column(table)
+            if column is None:
+                continue
+            await cls._drop_generated_expression(connection, table.name, column.name)
+            function_name = f"{table.name}_{column.name}_refresh"
+            source = column.info[Constants.COLUMN_INFO_TSVECTOR_SOURCE].format(row="NEW.")
+            await connection.execute(
+                text(
+                    f"CREATE OR REPLACE FUNCTION {function_name}() RETURNS trigger LANGUAGE plpgsql AS $$ "
+                    f"BEGIN NEW.{column.name} := {source}; RETURN NEW; END $$"
+                )
+            )
+            inputs = ", ".join(column.info[Constants.COLUMN_INFO_TSVECTOR_INPUTS])
+            await connection.execute(text(f"DROP TRIGGER IF EXISTS {function_name} ON {table.name}"))
+            await connection.execute(
+                text(
+                    f"CREATE TRIGGER {function_name} BEFORE INSERT OR UPDATE OF {inputs} ON {table.name} "
+                    f"FOR EACH ROW EXECUTE FUNCTION {function_name}()"
+                )
+            )
+
+    @classmethod
+    async def _drop_generated_expression(cls, connection: AsyncConnection, table_name: str, column_name: str) -> None:
+        # Databases that already carry the earlier stored generated column keep its values; dropping the
+        # expression is a catalog change too.
+        query_result = await connection.execute(
+            text(
+                "SELECT attgenerated FROM pg_attribute "
+                "WHERE attrelid = to_regclass(:table_name) AND attname = :column_name"
+            ),
+            {"table_name": table_name, "column_name": column_name},
+        )
+        if query_result.scalar_one_or_none() == "s":
+            await connection.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} DROP EXPRESSION"))
+
+    @classmethod
+    async def _queue_search_backfill(cls, connection: AsyncConnection, table_names: list[str]) -> None:
+        for table_name in table_names:
+            await connection.execute(
+                text(
+                    "INSERT INTO search_backfill_states (table_name, rows_filled) VALUES (:table_name, 0) "
+                    "ON CONFLICT (table_name) DO UPDATE SET last_key = NULL, completed_at = NULL"
+                ),
+                {"table_name": table_name},
+            )
+
+    @classmethod
+    async def _mark_archived_sessions(cls, connection: AsyncConnection) -> None:
+        # Sessions archived before agent_sessions.has_archived_logs existed; later archives set it themselves.
+        await connection.execute(
+            text(
+                "UPDATE agent_sessions SET has_archived_logs = true "
+                "WHERE NOT has_archived_logs AND id IN (SELECT session_id FROM log_archive_chunks)"
+            )
+        )
+
+    @classmethod
+    async def _build_index(cls, connection: AsyncConnection, table: Table, index: Index) -> None:
+        is_valid = await cls._index_validity(connection, index.name)
+        if is_valid:
+            return
+        ddl = str(CreateIndex(index).compile(dialect=connection.dialect))
+        if not table.dialect_options["postgresql"]["partition_by"]:
+            # A build that was interrupted leaves an invalid index behind; it is rebuilt from scratch.
+            if is_valid is not None:
+                await connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+            await connection.execute(text(cls._concurrent_index_ddl(ddl, index.name, table.name)))
+            return
+
+        # A partitioned index cannot be built concurrently. It is created on the parent only, which is instant
+        # and leaves it invalid; each partition's index is built concurrently and attached, and the parent
+        # index turns valid once every partition has one. Partitions created meanwhile get theirs at once.
+        if is_valid is None:
+            await connection.execute(text(ddl.replace(f" ON {table.name} ", f" ON ONLY {table.name} ", 1)))
+        for partition_name, _, _ in await cls.list_partitions(connection, table.name):
+            query_result = await connection.execute(
+                text(
+                    "SELECT 1 FROM pg_inherits "
+                    "JOIN pg_index ON pg_index.indexrelid = pg_inherits.inhrelid "
+                    "WHERE pg_inherits.inhparent = to_regclass(:index_name) "
+                    "AND pg_index.indrelid = to_regclass(:partition_name)"
+                ),
+                {"index_name": index.name, "partition_name": partition_name},
+            )
+            if query_result.first() is not None:
+                continue
+            partition_index_name = f"{partition_name}_{index.name.removeprefix(f'ix_{table.name}_')}"[:63]
+            await connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{partition_index_name}"'))
+            await connection.execute(
+                text(
+                    cls._concurrent_index_ddl(ddl, index.name, table.name).replace(
+                        f"{index.name} ON {table.name} ",
+                        f"{partition_index_name} ON {partition_name} ",
+                        1,
+                    )
+                )
+            )
+            await connection.execute(text(f'ALTER INDEX "{index.name}" ATTACH PARTITION "{partition_index_name}"'))
+
+    @classmethod
+    async def _index_validity(cls, connection: AsyncConnection, index_name: str) -> bool | None:
+        # None when the index does not exist.
+        query_result = await connection.execute(
+            text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index_name)"),
+            {"index_name": index_name},
+        )
+        result = query_result.scalar_one_or_none()
+        return result
+
+    @classmethod
+    def _concurrent_index_ddl(cls, ddl: str, index_name: str, table_name: str) -> str:
+        result = ddl.replace(
+            f"INDEX {index_name} ON {table_name} ",
+            f"INDEX CONCURRENTLY {index_name} ON {table_name} ",
+            1,
+        )
+        return result
+
+    @classmethod
+    def _create_missing_columns(cls, connection: Connection) -> None:
+        # Same gap for columns. Every column added here is nullable without a volatile default, so adding it
+        # only touches the catalog.
+        for table in Base.metadata.sorted_tables:
+            cls._add_missing_columns(connection, table, table.name)
+
+    @classmethod
+    def _add_missing_columns(cls, connection: Connection, table: Table, table_name: str) -> None:
+        existing = {column["name"] for column in inspect(connection).get_columns(table_name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {column_ddl}"))
+
+    @classmethod
+    def _parse_bounds(cls, bounds: str) -> tuple[datetime | None, datetime | None]:
+        # pg_get_expr renders e.g. FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00').
+        match = re.search(r"FROM \((.+?)\) TO \((.+?)\)", bounds)
+        if match is None:
+            return None, None
+        result = tuple(
+            None if value in ("MINVALUE", "MAXVALUE") else datetime.fromisoformat(value.strip("'"))
+            for value in match.groups()
+        )
+        return result
 
     async def wait_until_available(
         self,
@@ -1,63 +1,175 @@
 from __future__ import annotations
 
-import json
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.backend.core.constants import Constants
+from app.backend.core.json_codec_response import JsonCodecResponse
+from app.backend.core.loop_lag_monitor import LoopLagMonitor
+from app.backend.core.metrics import Metrics
 from app.backend.core.settings import Settings
+from app.backend.core.stats_collector import StatsCollector
 from app.backend.database import DatabaseManager
-from app.backend.claude_sdk import ClaudeConfigFileManager, ClaudeRuntimeRegistry, DefaultPermissionModeResolver
+from app.backend.models import MessageLog
+from app.backend.claude_sdk import (
+    ClaudeConfigFileManager,
+    ClaudeMessageSerializer,
+    ClaudeRuntimeRegistry,
+    DefaultPermissionModeResolver,
+)
 from app.backend.schemas import (
+    AnswerRead,
+    AnswerRequest,
     MessageRead,
+    MessageSummaryRead,
     PromptRequest,
+    SearchHitRead,
     SessionCreate,
     SessionLogRead,
     SessionRead,
+    SessionSummaryRead,
+    TurnRead,
     UserCreate,
     UserRead,
 )
-from app.backend.services import ClaudeAgentService
+from app.backend.services import (
+    AdmissionController,
+    AnswerBroker,
+    ClaudeAgentService,
+    LogArchiver,
+    ScheduledTurn,
+    SearchBackfiller,
+    SessionCoordinator,
+    SessionEventHub,
+    TurnScheduler,
+)
 
 
 class ApiApplication:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
-        self._db_manager = DatabaseManager(settings.database_url)
+        self._db_manager = DatabaseManager(
+            settings.database_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout_seconds=settings.db_pool_timeout_seconds,
+            pool_recycle_seconds=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            statement_cache_size=settings.db_statement_cache_size,
+            prepared_statement_cache_size=settings.db_prepared_statement_cache_size,
+            partition_months_ahead=settings.log_partition_months_ahead,
+        )
+        self._log_archiver = LogArchiver(
+            db_manager=self._db_manager,
+            archive_dir=settings.log_archive_dir,
+            retention_months=settings.log_retention_months,
+            interval_seconds=settings.log_maintenance_interval_seconds,
+        )
+        self._search_backfiller = SearchBackfiller(db_manager=self._db_manager)
         self._runtime_registry = ClaudeRuntimeRegistry(settings)
         self._permission_mode_resolver = DefaultPermissionModeResolver(settings)
+        self._answer_broker = AnswerBroker(timeout_seconds=settings.ask_user_answer_timeout_seconds)
+        if settings.ask_user_reclaim_slots:
+            # Off by default: a waiting question may belong to another user, who would see it denied.
+            self._runtime_registry.process_slots.add_reclaimer(self._answer_broker.abandon_oldest)
+        self._session_coordinator = SessionCoordinator(
+            db_manager=self._db_manager,
+            settings=settings,
+            interrupt_handler=self._interrupt_local_session,
+            answer_handler=self._deliver_local_answer,
+        )
+        self._event_hub = SessionEventHub(
+            buffer_size=settings.stream_replay_buffer_size,
+            retention_seconds=settings.stream_replay_retention_seconds,
+        )
+        self._admission_controller = AdmissionController(per_user_max=settings.admission_per_user_max)
         self._service = ClaudeAgentService(
             runtime_registry=self._runtime_registry,
             settings=settings,
             permission_mode_resolver=self._permission_mode_resolver,
+            db_manager=self._db_manager,
+            session_coordinator=self._session_coordinator,
+            answer_broker=self._answer_broker,
+            log_archiver=self._log_archiver,
+        )
+        self._turn_scheduler = TurnScheduler(
+            event_hub=self._event_hub,
+            turn_runner=self._turn_events,
+            worker_count=settings.turn_worker_count,
+            max_pending=settings.turn_queue_max_pending,
+        )
+
+        self._loop_lag_monitor = LoopLagMonitor(
+            interval_seconds=settings.loop_monitor_interval_seconds,
+            block_detector_enabled=settings.loop_block_detector_enabled,
+            block_threshold_ms=settings.loop_block_threshold_ms,
         )
 
+        # Owned by this instance rather than the process-wide registry, so another ApiApplication (tests,
+        # tools) renders its own stats instead of adding a second copy of every series.
+        self._stats_collectors = [
+            StatsCollector(self._loop_lag_monitor.stats, LoopLagMonitor.COUNTER_STATS),
+            StatsCollector(self._db_manager.stats),
+            StatsCollector(self._runtime_registry.stats, ClaudeRuntimeRegistry.COUNTER_STATS),
+            StatsCollector(self._event_hub.stats),
+            StatsCollector(self._turn_scheduler.stats, TurnScheduler.COUNTER_STATS),
+            StatsCollector(self._admission_controller.stats, AdmissionController.COUNTER_STATS),
+            StatsCollector(self._answer_broker.stats, AnswerBroker.COUNTER_STATS),
+            StatsCollector(self._log_archiver.stats, LogArchiver.COUNTER_STATS),
+            StatsCollector(self._search_backfiller.stats, SearchBackfiller.COUNTER_STATS),
+        ]
+
         self._static_dir = Path(__file__).resolve().parent.parent / "frontend" / "static"
 
-        self.app = FastAPI(title=self._settings.app_name, lifespan=self._lifespan)
+        self.app = FastAPI(
+            title=self._settings.app_name,
+            lifespan=self._lifespan,
+            default_response_class=JsonCodecResponse,
+        )
         self._configure_middleware()
         self._configure_static()
         self._configure_routes()
 
     @asynccontextmanager
     async def _lifespan(self, _: FastAPI) -> AsyncGenerator[None, None]:
+        self._loop_lag_monitor.start()
         ClaudeConfigFileManager.ensure_files()
 
         await self._db_manager.wait_until_available()
         await self._db_manager.create_tables()
+        index_build_task = asyncio.create_task(self._db_manager.build_missing_indexes())
 
         async with self._db_manager.session() as db:
             await self._service.ensure_default_users(db)
+            await self._service.ensure_session_stats(db)
+
+        self._runtime_registry.start()
+        self._session_coordinator.start()
+        self._turn_scheduler.start()
+        self._log_archiver.start()
+        self._search_backfiller.start()
 
         yield
 
+        index_build_task.cancel()
+        await asyncio.gather(index_build_task, return_exceptions=True)
+        await self._search_backfiller.close()
+        await self._log_archiver.close()
+        await self._turn_scheduler.close()
+        await self._session_coordinator.close()
         await self._runtime_registry.close_all()
+        await self._loop_lag_monitor.close()
 
     def _configure_middleware(self) -> None:
         self.app.add_middleware(
@@ -78,6 +190,8 @@ class ApiApplication:
     def _configure_routes(self) -> None:
         self.app.add_api_route("/", self.index, methods=["GET"], include_in_schema=False)
         self.app.add_api_route("/api/health", self.health, methods=["GET"])
+        self.app.add_api_route("/api/runtime/stats", self.runtime_stats, methods=["GET"])
+        self.app.add_api_route("/api/metrics", self.metrics, methods=["GET"], include_in_schema=False)
         self.app.add_api_route(
             "/api/users",
             self.list_users,
@@ -97,6 +211,18 @@ class ApiApplication:
             methods=["GET"],
             response_model=list[SessionRead],
         )
+        self.app.add_api_route(
+            "/api/users/{user_id}/session-summaries",
+            self.list_session_summaries,
+            methods=["GET"],
+            response_model=list[SessionSummaryRead],
+        )
+        self.app.add_api_route(
+            "/api/users/{user_id}/search",
+            self.search_history,
+            methods=["GET"],
+            response_model=list[SearchHitRead],
+        )
         self.app.add_api_route(
             "/api/sessions",
             self.create_session,
@@ -114,7 +240,7 @@ class ApiApplication:
             "/api/sessions/{session_id}/messages",
             self.list_messages,
             methods=["GET"],
-            response_model=list[MessageRead],
+            response_model=list[MessageRead] | list[MessageSummaryRead],
         )
         self.app.add_api_route(
             "/api/sessions/{session_id}/logs",
@@ -128,11 +254,53 @@ class ApiApplication:
             methods=["POST"],
             status_code=204,
         )
+        self.app.add_api_route(
+            "/api/sessions/{session_id}/messages",
+            self.submit_message,
+            methods=["POST"],
+            response_model=TurnRead,
+            status_code=202,
+        )
+        self.app.add_api_route(
+            "/api/sessions/{session_id}/warm",
+            self.warm_session,
+            methods=["POST"],
+            status_code=202,
+        )
+        self.app.add_api_route(
+            "/api/sessions/{session_id}/answers",
+            self.submit_answer,
+            methods=["POST"],
+            response_model=AnswerRead,
+            status_code=202,
+        )
+        self.app.add_api_route(
+            "/api/sessions/{session_id}/turns/{turn_id}",
+            self.get_turn,
+            methods=["GET"],
+            response_model=TurnRead,
+        )
+        self.app.add_api_route(
+            "/api/sessions/{session_id}/turns/{turn_id}/trace",
+            self.get_turn_trace,
+            methods=["GET"],
+            response_model=SessionLogRead,
+        )
+        self.app.add_api_route(
+            "/api/sessions/{session_id}/turns/{turn_id}/events",
+            self.stream_turn_events,
+            methods=["GET"],
+        )
         self.app.add_api_route(
             "/api/sessions/{session_id}/messages/stream",
             self.stream_messages,
             methods=["POST"],
         )
+        self.app.add_api_route(
+            "/api/sessions/{session_id}/events",
+            self.stream_events,
+            methods=["GET"],
+        )
 
     async def index(self) -> FileResponse:
         result = FileResponse(self._static_dir / "index.html")
@@ -142,6 +310,25 @@ class ApiApplication:
         result = {"status": "ok"}
         return result
 
+    async def runtime_stats(self) -> dict[str, Any]:
+        result = {
+            **self._runtime_registry.stats(),
+            **self._event_hub.stats(),
+            **self._turn_scheduler.stats(),
+            **self._admission_controller.stats(),
+            **self._answer_broker.stats(),
+            **self._loop_lag_monitor.stats(),
+            **self._db_manager.stats(),
+        }
+        return result
+
+    async def metrics(self) -> PlainTextResponse:
+        result = PlainTextResponse(
+            Metrics.registry.render(self._stats_collectors),
+            media_type=Constants.METRICS_CONTENT_TYPE,
+        )
+        return result
+
     async def list_users(self) -> list[UserRead]:
         async with self._db_manager.session() as db:
             users = await self._service.list_users(db)
@@ -160,6 +347,29 @@ class ApiApplication:
         result = [SessionRead.model_validate(session) for session in sessions]
         return result
 
+    async def list_session_summaries(
+        self,
+        user_id: UUID,
+        limit: int = Query(default=Constants.PAGE_DEFAULT_LIMIT, ge=1, le=Constants.PAGE_MAX_LIMIT),
+        before: str | None = None,
+    ) -> list[SessionSummaryRead]:
+        async with self._db_manager.session() as db:
+            summaries = await self._service.list_session_summaries(db, user_id, limit=limit, before=before)
+        result = [SessionSummaryRead.model_validate(summary) for summary in summaries]
+        return result
+
+    async def search_history(
+        self,
+        user_id: UUID,
+        q: str = Query(min_length=1, max_length=Constants.SEARCH_QUERY_MAX_CHARS),
+        limit: int = Query(default=Constants.SEARCH_DEFAULT_LIMIT, ge=1, le=Constants.SEARCH_MAX_LIMIT),
+        before: str | None = None,
+    ) -> list[SearchHitRead]:
+        async with self._db_manager.session() as db:
+            hits = await self._service.search_history(db, user_id, q, limit=limit, before=before)
+        result = [SearchHitRead.model_validate(hit) for hit in hits]
+        return result
+
     async def create_session(self, payload: SessionCreate) -> SessionRead:
         async with self._db_manager.session() as db:
             session = await self._service.create_session(db, payload)
@@ -172,15 +382,51 @@ class ApiApplication:
         result = SessionRead.model_validate(session)
         return result
 
-    async def list_messages(self, session_id: UUID) -> list[MessageRead]:
+    async def list_messages(
+        self,
+        session_id: UUID,
+        limit: int = Query(default=Constants.PAGE_DEFAULT_LIMIT, ge=1, le=Constants.PAGE_MAX_LIMIT),
+        after: str | None = None,
+        before: str | None = None,
+        fields: Literal["full", "summary"] = "full",
+    ) -> list[MessageRead] | list[MessageSummaryRead]:
         async with self._db_manager.session() as db:
-            messages = await self._service.list_messages(db, session_id)
-        result = [MessageRead.model_validate(message) for message in messages]
+            if fields == Constants.MESSAGE_FIELDS_SUMMARY:
+                summaries = await self._service.list_message_summaries(
+                    db,
+                    session_id,
+                    limit=limit,
+                    after=after,
+                    before=before,
+                )
+                result = [MessageSummaryRead.model_validate(summary) for summary in summaries]
+                return result
+
+            messages = await self._service.list_messages(
+                db,
+                session_id,
+                limit=limit,
+                after=after,
+                before=before,
+            )
+        result = [self._build_message_read(message) for message in messages]
         return result
 
-    async def list_logs(self, session_id: UUID) -> list[SessionLogRead]:
+    async def list_logs(
+        self,
+        session_id: UUID,
+        limit: int = Query(default=Constants.PAGE_DEFAULT_LIMIT, ge=1, le=Constants.PAGE_MAX_LIMIT),
+        after: str | None = None,
+        before: str | None = None,
+    ) -> list[SessionLogRead]:
         async with self._db_manager.session() as db:
-            logs = await self._service.list_logs(db, session_id)
+            logs = await self._service.list_logs(
+                db,
+                session_id,
+                limit=limit,
+                after=after,
+                before=before,
+            )
         result = [SessionLogRead.model_validate(log) for log in logs]
         return result
 
@@ -188,28 +434,175 @@ class ApiApplication:
         async with self._db_manager.session() as db:
             await self._service.interrupt_session(db, session_id)
 
+    async def submit_message(self, session_id: UUID, payload: PromptRequest) -> TurnRead:
+        turn = await self._submit_turn(session_id, payload)
+        result = self._build_turn_read(turn)
+        return result
+
+    async def warm_session(self, session_id: UUID) -> dict[str, str]:
+        async with self._db_manager.session() as db:
+            status = await self._service.warm_session(db, session_id)
+        result = {"status": status}
+        return result
+
+    async def submit_answer(self, session_id: UUID, payload: AnswerRequest) -> AnswerRead:
+        async with self._db_manager.session() as db:
+            delivered = await self._service.deliver_answer(db, session_id, payload)
+        if delivered:
+            result = AnswerRead(delivered=True)
+            return result
+
+        # No worker has a turn running for the session, so the answer continues the conversation as a prompt.
+        turn = await self._submit_turn(session_id, PromptRequest(prompt=payload.answer))
+        result = AnswerRead(delivered=False, turn=self._build_turn_read(turn))
+        return result
+
+    async def get_turn(self, session_id: UUID, turn_id: UUID) -> TurnRead:
+        turn = self._turn_scheduler.get_turn(session_id, turn_id)
+        result = self._build_turn_read(turn)
+        return result
+
+    async def get_turn_trace(self, session_id: UUID, turn_id: UUID) -> SessionLogRead:
+        async with self._db_manager.session() as db:
+            trace_log = await self._service.get_turn_trace(db, session_id, turn_id)
+        result = SessionLogRead.model_validate(trace_log)
+        return result
+
+    async def stream_turn_events(
+        self,
+        session_id: UUID,
+        turn_id: UUID,
+        last_event_id_header: str | None = Header(default=None, alias="Last-Event-ID"),
+    ) -> StreamingResponse:
+        turn = self._turn_scheduler.get_turn(session_id, turn_id)
+        last_event_id = self._parse_last_event_id(last_event_id_header)
+        result = self._build_event_response(self._turn_scheduler.follow(turn, last_event_id))
+        return result
+
     async def stream_messages(self, session_id: UUID, payload: PromptRequest) -> StreamingResponse:
+        turn = await self._submit_turn(session_id, payload)
+        result = self._build_event_response(self._turn_scheduler.follow(turn, None))
+        result.headers["X-Turn-Id"] = str(turn.turn_id)
+        return result
+
+    async def stream_events(
+        self,
+        session_id: UUID,
+        last_event_id_header: str | None = Header(default=None, alias="Last-Event-ID"),
+        last_event_id: int | None = Query(default=None, ge=0),
+    ) -> StreamingResponse:
+        # EventSource sends the header on reconnect; the query parameter covers the first connection.
+        if last_event_id_header is not None:
+            last_event_id = self._parse_last_event_id(last_event_id_header)
+
+        async with self._db_manager.session() as db:
+            await self._service.get_session(db, session_id)
+
+        result = self._build_event_response(self._event_hub.follow(str(session_id), last_event_id))
+        return result
+
+    async def _submit_turn(self, session_id: UUID, payload: PromptRequest) -> ScheduledTurn:
         prompt = payload.prompt.strip()
         if not prompt:
             raise HTTPException(status_code=400, detail="Prompt must not be empty")
 
+        async with self._db_manager.session() as db:
+            session = await self._service.get_session(db, session_id)
+
+        self._admission_controller.admit(session.user_id)
+        try:
+            result = self._turn_scheduler.submit(session_id, session.user_id, prompt)
+        except BaseException:
+            self._admission_controller.complete(session.user_id)
+            raise
+        return result
+
+    def _build_turn_read(self, turn: ScheduledTurn) -> TurnRead:
+        result = TurnRead.model_validate(turn).model_copy(
+            update={"queue_position": self._turn_scheduler.queue_position(turn)},
+        )
+        return result
+
+    @classmethod
+    def _build_message_read(cls, message: MessageLog) -> MessageRead:
+        # Payloads are stored with a compacted "raw"; readers of the full form get it expanded again.
+        result = MessageRead.model_validate(message).model_copy(
+            update={"payload": ClaudeMessageSerializer.expand_raw(message.payload)},
+        )
+        return result
+
+    @classmethod
+    def _parse_last_event_id(cls, value: str | None) -> int | None:
+        if value is None:
+            return None
+        try:
+            result = int(value)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from exc
+        return result
+
+    def _build_event_response(self, frames: AsyncGenerator[bytes, None]) -> StreamingResponse:
         headers = {
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
         }
         result = StreamingResponse(
-            self._event_stream(session_id=session_id, prompt=prompt),
+            frames,
             media_type="text/event-stream",
             headers=headers,
         )
         return result
 
-    async def _event_stream(self, session_id: UUID, prompt: str) -> AsyncGenerator[str, None]:
-        async with self._db_manager.session() as db:
-            async for item in self._service.stream_prompt(db, session_id=session_id, prompt=prompt):
-                result = f"data: {json.dumps(item, default=str)}\\n\\n"
-                yield result
+    async def _interrupt_local_session(self, session_id: str) -> None:
+        self._answer_broker.cancel(UUID(session_id))
+        await self._runtime_registry.interrupt(session_id)
+
+    async def _suspend_turn(self, turn: ScheduledTurn, awaitable: Awaitable[Any]) -> Any:
+        # A turn waiting on its user counts against neither a scheduler worker nor the user's prompt cap.
+        self._admission_controller.complete(turn.user_id)
+        try:
+            result = await self._turn_scheduler.suspend(turn, awaitable)
+        finally:
+            self._admission_controller.restore(turn.user_id)
+        return result
+
+    def _deliver_local_answer(self, session_id: str, reply: dict[str, Any]) -> bool:
+        result = self._answer_broker.deliver(UUID(session_id), reply)
+        return result
+
+    async def _turn_events(self, turn: ScheduledTurn) -> AsyncGenerator[dict[str, Any], None]:
+        # While the turn is registered, an answer posted ahead of its question is held for it.
+        self._answer_broker.begin_turn(turn.session_id)
+        try:
+            # Another worker process may be running this session; the lease waits for it or fails with 409.
+            lease = await self._session_coordinator.acquire_session_lease(turn.session_id)
+            try:
+                async for item in self._service.stream_prompt(
+                    session_id=turn.session_id,
+                    prompt=turn.prompt,
+                    turn_id=turn.turn_id,
+                    suspend=partial(self._suspend_turn, turn),
+                ):
+                    yield item
+            finally:
+                await lease.release()
+        finally:
+            unclaimed = self._answer_broker.end_turn(turn.session_id)
+            self._admission_controller.complete(turn.user_id)
+            if unclaimed is not None:
+                await self._submit_unclaimed_answer(turn, unclaimed)
+
+    async def _submit_unclaimed_answer(self, turn: ScheduledTurn, reply: dict[str, Any]) -> None:
+        # The turn ended without asking, so the held answer continues the conversation as a prompt.
+        try:
+            await self._submit_turn(turn.session_id, PromptRequest(prompt=reply["answer"]))
+        except HTTPException as exc:
+            logging.getLogger(__name__).warning(
+                "[answer] dropped unclaimed answer for session %s: %s",
+                turn.session_id,
+                exc.detail,
+            )
 
 
 # Module-level ASGI app is required so uvicorn can import `app` directly.
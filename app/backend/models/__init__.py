@@ -1,7 +1,19 @@
 from app.backend.models.agent_session import AgentSession
 from app.backend.models.base import Base
+from app.backend.models.log_archive_chunk import LogArchiveChunk
 from app.backend.models.message_log import MessageLog
+from app.backend.models.search_backfill_state import SearchBackfillState
 from app.backend.models.session_log import SessionLog
+from app.backend.models.session_stats import SessionStats
 from app.backend.models.user import User
 
-__all__ = ["Base", "User", "AgentSession", "MessageLog", "SessionLog"]
+__all__ = [
+    "Base",
+    "User",
+    "AgentSession",
+    "MessageLog",
+    "SessionLog",
+    "SessionStats",
+    "LogArchiveChunk",
+    "SearchBackfillState",
+]
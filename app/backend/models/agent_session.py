@@ -3,15 +3,17 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, false, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.backend.core.constants import Constants
 from app.backend.models.base import Base
 
 
 class AgentSession(Base):
     __tablename__ = "agent_sessions"
+    __table_args__ = (Index("ix_agent_sessions_search_vector", "search_vector", postgresql_using="gin"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True)
@@ -27,6 +29,20 @@ class AgentSession(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+    # Set once any of the session's rows is moved to a log archive, so opening a session that never had
+    # archived rows skips the archive manifest.
+    has_archived_logs: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
+    # Filled by a trigger, like MessageLog.search_vector.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        nullable=True,
+        deferred=True,
+        info={
+            Constants.COLUMN_INFO_TSVECTOR_SOURCE: f"to_tsvector('{Constants.SEARCH_TEXT_CONFIG}', {{row}}title)",
+            Constants.COLUMN_INFO_TSVECTOR_INPUTS: ("title",),
+            Constants.COLUMN_INFO_BACKFILL_ORDER: ("id",),
+        },
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="sessions")
     messages: Mapped[list["MessageLog"]] = relationship(
@@ -39,3 +55,9 @@ class AgentSession(Base):
         back_populates="session",
         cascade="all, delete-orphan",
     )
+    stats: Mapped["SessionStats"] = relationship(
+        "SessionStats",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        uselist=False,
+    )
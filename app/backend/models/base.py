@@ -4,4 +4,6 @@ from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
-    pass
+    # Server defaults such as created_at are fetched by the INSERT ... RETURNING of the flush,
+    # so repositories do not need a refresh() SELECT after commit.
+    __mapper_args__ = {"eager_defaults": True}
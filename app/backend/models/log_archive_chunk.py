@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.backend.models.base import Base
+
+
+class LogArchiveChunk(Base):
+    # Where one session's rows of an archived partition live: a gzip member at [offset, offset + length)
+    # of the partition's NDJSON archive file. rehydrated_at is set while the rows are back in the table.
+    __tablename__ = "log_archive_chunks"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("agent_sessions.id", ondelete="CASCADE"),
+        index=True,
+    )
+    table_name: Mapped[str] = mapped_column(String(63))
+    partition_name: Mapped[str] = mapped_column(String(63))
+    path: Mapped[str] = mapped_column(Text)
+    offset: Mapped[int] = mapped_column(BigInteger)
+    length: Mapped[int] = mapped_column(BigInteger)
+    row_count: Mapped[int] = mapped_column(Integer)
+    first_created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    last_created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    rehydrated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -3,26 +3,52 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.backend.core.constants import Constants
 from app.backend.models.base import Base
 
 
 class MessageLog(Base):
+    # Range-partitioned by month on created_at, so inserts only touch the current partition's indexes;
+    # the partition key has to be part of the primary key.
     __tablename__ = "message_logs"
+    __table_args__ = (
+        Index("ix_message_logs_session_created_id", "session_id", "created_at", "id"),
+        Index("ix_message_logs_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("agent_sessions.id", ondelete="CASCADE"),
-        index=True,
     )
-    role: Mapped[str] = mapped_column(String(40), index=True)
-    message_type: Mapped[str] = mapped_column(String(60), index=True)
+    role: Mapped[str] = mapped_column(String(40))
+    message_type: Mapped[str] = mapped_column(String(60))
     payload: Mapped[dict] = mapped_column(JSONB)
     raw_text: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        primary_key=True,
+    )
+    # Filled by a BEFORE INSERT/UPDATE trigger (rows older than the column by SearchBackfiller); capped so a
+    # huge tool output stays under the tsvector size limit.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        nullable=True,
+        deferred=True,
+        info={
+            Constants.COLUMN_INFO_TSVECTOR_SOURCE: (
+                f"to_tsvector('{Constants.SEARCH_TEXT_CONFIG}', "
+                f"left(coalesce({{row}}raw_text, ''), {Constants.SEARCH_INDEXED_MAX_CHARS}))"
+            ),
+            Constants.COLUMN_INFO_TSVECTOR_INPUTS: ("raw_text",),
+            Constants.COLUMN_INFO_BACKFILL_ORDER: ("session_id", "created_at", "id"),
+        },
+    )
 
     session: Mapped["AgentSession"] = relationship("AgentSession", back_populates="messages")
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.backend.models.base import Base
+
+
+class SearchBackfillState(Base):
+    # One row per table whose search_vector column was added to existing rows; last_key is where the
+    # backfill stopped, so a restart resumes instead of rescanning the table.
+    __tablename__ = "search_backfill_states"
+
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    last_key: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)
+    rows_filled: Mapped[int] = mapped_column(BigInteger, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,6 +1,19 @@
+from app.backend.repositories.log_archive_repository import LogArchiveRepository
 from app.backend.repositories.message_repository import MessageRepository
+from app.backend.repositories.search_backfill_repository import SearchBackfillRepository
+from app.backend.repositories.search_repository import SearchRepository
 from app.backend.repositories.session_log_repository import SessionLogRepository
 from app.backend.repositories.session_repository import SessionRepository
+from app.backend.repositories.session_stats_repository import SessionStatsRepository
 from app.backend.repositories.user_repository import UserRepository
 
-__all__ = ["UserRepository", "SessionRepository", "MessageRepository", "SessionLogRepository"]
+__all__ = [
+    "UserRepository",
+    "SessionRepository",
+    "MessageRepository",
+    "SessionLogRepository",
+    "SessionStatsRepository",
+    "SearchRepository",
+    "LogArchiveRepository",
+    "SearchBackfillRepository",
+]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Table, exists, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.constants import Constants
+from app.backend.models import AgentSession, LogArchiveChunk
+
+
+class LogArchiveRepository:
+    # None of these writes commit: archiving records chunks in the transaction that drops the partition,
+    # and rehydration claims chunks in the transaction that restores their rows.
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def record_chunks(self, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            await self._db.execute(insert(LogArchiveChunk), rows)
+            await self._db.execute(
+                update(AgentSession)
+                .where(AgentSession.id.in_({row["session_id"] for row in rows}))
+                .values(has_archived_logs=True)
+            )
+
+    async def list_pending(self, session_id: UUID) -> list[LogArchiveChunk]:
+        query_result = await self._db.execute(
+            select(LogArchiveChunk).where(
+                LogArchiveChunk.session_id == session_id,
+                LogArchiveChunk.rehydrated_at.is_(None),
+            )
+        )
+        result = list(query_result.scalars().all())
+        return result
+
+    async def claim_pending(self, session_id: UUID) -> list[LogArchiveChunk]:
+        # Row locks make a concurrent open of the same session wait, then find nothing left to claim.
+        query_result = await self._db.execute(
+            select(LogArchiveChunk)
+            .where(LogArchiveChunk.session_id == session_id, LogArchiveChunk.rehydrated_at.is_(None))
+            .order_by(LogArchiveChunk.first_created_at)
+            .with_for_update()
+        )
+        result = list(query_result.scalars().all())
+        if result:
+            await self._db.execute(
+                update(LogArchiveChunk)
+                .where(LogArchiveChunk.id.in_([chunk.id for chunk in result]))
+                .values(rehydrated_at=func.now())
+            )
+        return result
+
+    async def is_held(self, table_name: str, start: datetime, end: datetime, *, since: datetime) -> bool:
+        query_result = await self._db.execute(
+            select(
+                exists().where(
+                    LogArchiveChunk.table_name == table_name,
+                    LogArchiveChunk.rehydrated_at > since,
+                    LogArchiveChunk.first_created_at < end,
+                    LogArchiveChunk.last_created_at >= start,
+                )
+            )
+        )
+        result = bool(query_result.scalar())
+        return result
+
+    async def release(self, table_name: str, start: datetime, end: datetime) -> None:
+        # Chunks overlapping a dropped rehydrated partition become pending again; restoring them a second
+        # time skips the rows still present in other partitions.
+        await self._db.execute(
+            update(LogArchiveChunk)
+            .where(
+                LogArchiveChunk.table_name == table_name,
+                LogArchiveChunk.rehydrated_at.is_not(None),
+                LogArchiveChunk.first_created_at < end,
+                LogArchiveChunk.last_created_at >= start,
+            )
+            .values(rehydrated_at=None)
+        )
+
+    async def restore_rows(self, table: Table, lines: list[str]) -> int:
+        # The archived lines are to_jsonb() of the original rows; jsonb_populate_recordset turns them back
+        # into rows of the table type, so every column keeps its type without a per-table decoder. The search
+        # column is left to the table's trigger.
+        columns = ", ".join(
+            column.name for column in table.columns if Constants.COLUMN_INFO_TSVECTOR_SOURCE not in column.info
+        )
+        query_result = await self._db.execute(
+            text(
+                f"INSERT INTO {table.name} ({columns}) "
+                f"SELECT {columns} FROM jsonb_populate_recordset(NULL::{table.name}, CAST(:rows AS jsonb)) "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"rows": f"[{','.join(lines)}]"},
+        )
+        result = query_result.rowcount
+        return result
@@ -1,44 +1,117 @@
 from __future__ import annotations
 
+import time
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
 from app.backend.models import MessageLog
+from app.backend.repositories.session_stats_repository import SessionStatsRepository
 
 
 class MessageRepository:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
-    async def create_message(
+    async def create_messages(self, rows: list[dict[str, Any]]) -> list[tuple[UUID, datetime]]:
+        # One multi-row INSERT for the whole batch instead of a transaction per message.
+        if not rows:
+            return []
+        started = time.perf_counter()
+        query_result = await self._db.execute(
+            insert(MessageLog).returning(MessageLog.id, MessageLog.created_at),
+            rows,
+        )
+        result = [(row.id, row.created_at) for row in query_result.all()]
+        await self._record_stats(rows, result)
+        await self._db.commit()
+        Metrics.message_insert_seconds.observe(time.perf_counter() - started)
+        return result
+
+    async def list_messages(
         self,
+        session_id: UUID,
         *,
+        limit: int = 500,
+        after: tuple[datetime, UUID] | None = None,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> list[MessageLog]:
+        query, descending = self._page_query(select(MessageLog), session_id, limit, after, before)
+        query_result = await self._db.execute(query)
+        rows = list(query_result.scalars().all())
+        result = list(reversed(rows)) if descending else rows
+        return result
+
+    async def list_message_summaries(
+        self,
         session_id: UUID,
-        role: str,
-        message_type: str,
-        payload: dict,
-        raw_text: str | None,
-    ) -> MessageLog:
-        message = MessageLog(
-            session_id=session_id,
-            role=role,
-            message_type=message_type,
-            payload=payload,
-            raw_text=raw_text,
+        *,
+        limit: int = 500,
+        after: tuple[datetime, UUID] | None = None,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> list[Row[Any]]:
+        # Column projection: the JSONB payload is never read for summary listings.
+        columns = select(
+            MessageLog.id,
+            MessageLog.session_id,
+            MessageLog.role,
+            MessageLog.message_type,
+            MessageLog.raw_text,
+            MessageLog.created_at,
         )
-        self._db.add(message)
-        await self._db.commit()
-        await self._db.refresh(message)
-        return message
+        query, descending = self._page_query(columns, session_id, limit, after, before)
+        query_result = await self._db.execute(query)
+        rows = list(query_result.all())
+        result = list(reversed(rows)) if descending else rows
+        return result
 
-    async def list_messages(self, session_id: UUID, limit: int = 500) -> list[MessageLog]:
-        query_result = await self._db.execute(
-            select(MessageLog)
-            .where(MessageLog.session_id == session_id)
-            .order_by(MessageLog.created_at.asc())
-            .limit(limit)
-        )
-        result = list(query_result.scalars().all())
+    async def _record_stats(self, rows: list[dict[str, Any]], inserted: list[tuple[UUID, datetime]]) -> None:
+        # Rows arrive in stream order, so the last text seen per session is its preview.
+        created_at_by_id = dict(inserted)
+        per_session: dict[UUID, dict[str, Any]] = {}
+        for row in rows:
+            summary = per_session.setdefault(row["session_id"], {"count": 0, "preview": None})
+            summary["count"] += 1
+            created_at = created_at_by_id[row["id"]]
+            summary["last_message_at"] = max(summary.get("last_message_at", created_at), created_at)
+            if row["message_type"] != Constants.MESSAGE_TYPE_STREAM_EVENT and row.get("raw_text"):
+                summary["preview"] = row["raw_text"]
+
+        stats_repo = SessionStatsRepository(self._db)
+        for session_id, summary in per_session.items():
+            await stats_repo.record_messages(
+                session_id,
+                count=summary["count"],
+                last_message_at=summary["last_message_at"],
+                preview=summary["preview"],
+            )
+
+    @classmethod
+    def _page_query(
+        cls,
+        query: Select[Any],
+        session_id: UUID,
+        limit: int,
+        after: tuple[datetime, UUID] | None,
+        before: tuple[datetime, UUID] | None,
+    ) -> tuple[Select[Any], bool]:
+        # Keyset pagination over (created_at, id), backed by the composite session index.
+        position = tuple_(MessageLog.created_at, MessageLog.id)
+        query = query.where(MessageLog.session_id == session_id)
+        if after is not None:
+            query = query.where(position > tuple_(*after))
+        if before is not None:
+            query = query.where(position < tuple_(*before))
+
+        if after is not None:
+            result = (query.order_by(MessageLog.created_at.asc(), MessageLog.id.asc()).limit(limit), False)
+            return result
+
+        # Without a lower bound the newest page is wanted; it is read backwards and reversed by the caller.
+        result = (query.order_by(MessageLog.created_at.desc(), MessageLog.id.desc()).limit(limit), True)
         return result
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Column, Table, func, select, text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.constants import Constants
+from app.backend.models import SearchBackfillState
+
+
+class SearchBackfillRepository:
+    # Writes do not commit: each batch commits together with the progress it records.
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def list_pending(self) -> list[SearchBackfillState]:
+        query_result = await self._db.execute(
+            select(SearchBackfillState).where(SearchBackfillState.completed_at.is_(None))
+        )
+        result = list(query_result.scalars().all())
+        return result
+
+    async def fill_batch(
+        self,
+        table: Table,
+        column: Column[Any],
+        after: list[str] | None,
+        *,
+        limit: int,
+    ) -> tuple[int, list[str] | None]:
+        # Walks the table in index order from `after` and fills the rows of the next batch that are still
+        # NULL. Returns how many were filled and the batch's last key, or None once the table is done.
+        keys = column.info[Constants.COLUMN_INFO_BACKFILL_ORDER]
+        key_list = ", ".join(keys)
+        params: dict[str, Any] = {"limit": limit}
+        after_clause = ""
+        if after is not None:
+            bounds = []
+            for index, key in enumerate(keys):
+                key_type = table.c[key].type.compile(dialect=postgresql.dialect())
+                bounds.append(f"CAST(:after_{index} AS {key_type})")
+                params[f"after_{index}"] = after[index]
+            after_clause = f" WHERE ({key_list}) > ({', '.join(bounds)})"
+        source = column.info[Constants.COLUMN_INFO_TSVECTOR_SOURCE].format(row="t.")
+        query_result = await self._db.execute(
+            text(
+                f"WITH batch AS (SELECT {key_list} FROM {table.name}{after_clause} ORDER BY {key_list} LIMIT :limit), "
+                f"filled AS (UPDATE {table.name} t SET {column.name} = {source} FROM batch "
+                f"WHERE {' AND '.join(f't.{key} = batch.{key}' for key in keys)} AND t.{column.name} IS NULL "
+                "RETURNING 1) "
+                f"SELECT (SELECT count(*) FROM filled) AS filled, "
+                f"{', '.join(f'CAST({key} AS text) AS {key}' for key in keys)} "
+                f"FROM batch ORDER BY {', '.join(f'{key} DESC' for key in keys)} LIMIT 1"
+            ),
+            params,
+        )
+        row = query_result.one_or_none()
+        if row is None:
+            return 0, None
+        result = (int(row.filled), [getattr(row, key) for key in keys])
+        return result
+
+    async def save_progress(self, table_name: str, *, last_key: list[str] | None, filled: int, completed: bool) -> None:
+        await self._db.execute(
+            update(SearchBackfillState)
+            .where(SearchBackfillState.table_name == table_name)
+            .values(
+                last_key=last_key,
+                rows_filled=SearchBackfillState.rows_filled + filled,
+                completed_at=func.now() if completed else None,
+            )
+        )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Float, Row, String, and_, cast, func, literal, literal_column, null, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import UUID as PgUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
+from app.backend.models import AgentSession, MessageLog
+
+
+class SearchRepository:
+    # Both branches match through the GIN indexes on the generated search_vector columns, so the cost
+    # grows with the number of hits, never with the size of message_logs.
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def search_for_user(
+        self,
+        user_id: UUID,
+        query_text: str,
+        *,
+        limit: int,
+        before: tuple[float, datetime, UUID] | None = None,
+    ) -> list[Row[Any]]:
+        started = time.perf_counter()
+        ts_query = self._ts_query(query_text)
+
+        # Messages are narrowed to the user's own sessions before the text match, not after the title join.
+        user_session_ids = select(AgentSession.id).where(AgentSession.user_id == user_id)
+        message_rank = func.ts_rank(MessageLog.search_vector, ts_query, type_=Float)
+        message_hits = (
+            select(
+                literal(Constants.SEARCH_HIT_KIND_MESSAGE, String).label("kind"),
+                MessageLog.session_id.label("session_id"),
+                AgentSession.title.label("session_title"),
+                MessageLog.id.label("message_id"),
+                MessageLog.role.label("role"),
+                MessageLog.message_type.label("message_type"),
+                MessageLog.created_at.label("created_at"),
+                message_rank.label("rank"),
+                MessageLog.id.label("row_id"),
+            )
+            .join(AgentSession, AgentSession.id == MessageLog.session_id)
+            .where(MessageLog.session_id.in_(user_session_ids), MessageLog.search_vector.op("@@")(ts_query))
+        )
+        title_rank = func.ts_rank(AgentSession.search_vector, ts_query, type_=Float)
+        title_hits = select(
+            literal(Constants.SEARCH_HIT_KIND_SESSION, String).label("kind"),
+            AgentSession.id.label("session_id"),
+            AgentSession.title.label("session_title"),
+            cast(null(), PgUUID(as_uuid=True)).label("message_id"),
+            cast(null(), String).label("role"),
+            cast(null(), String).label("message_type"),
+            AgentSession.created_at.label("created_at"),
+            title_rank.label("rank"),
+            AgentSession.id.label("row_id"),
+        ).where(AgentSession.user_id == user_id, AgentSession.search_vector.op("@@")(ts_query))
+        hits = union_all(message_hits, title_hits).subquery("hits")
+
+        # Keyset pagination over (rank, created_at, id), best match first.
+        page_query = select(hits)
+        if before is not None:
+            page_query = page_query.where(tuple_(hits.c.rank, hits.c.created_at, hits.c.row_id) < tuple_(*before))
+        page = (
+            page_query.order_by(hits.c.rank.desc(), hits.c.created_at.desc(), hits.c.row_id.desc())
+            .limit(limit)
+            .subquery("page")
+        )
+
+        # Snippets are built for the page rows only: ts_headline re-parses the text, unlike the match. The
+        # join also matches the partition key, so each row's lookup is pruned to a single month.
+        snippet_source = func.coalesce(
+            func.left(MessageLog.raw_text, Constants.SEARCH_INDEXED_MAX_CHARS),
+            page.c.session_title,
+        )
+        query = (
+            select(
+                page.c.kind,
+                page.c.session_id,
+                page.c.session_title,
+                page.c.message_id,
+                page.c.role,
+                page.c.message_type,
+                page.c.created_at,
+                page.c.rank,
+                func.ts_headline(
+                    self._text_config(),
+                    snippet_source,
+                    ts_query,
+                    Constants.SEARCH_HEADLINE_OPTIONS,
+                ).label("snippet"),
+            )
+            .outerjoin(
+                MessageLog,
+                and_(MessageLog.id == page.c.message_id, MessageLog.created_at == page.c.created_at),
+            )
+            .order_by(page.c.rank.desc(), page.c.created_at.desc(), page.c.row_id.desc())
+        )
+        query_result = await self._db.execute(query)
+        result = list(query_result.all())
+        Metrics.search_seconds.observe(time.perf_counter() - started)
+        return result
+
+    @classmethod
+    def _ts_query(cls, query_text: str) -> Any:
+        # websearch_to_tsquery accepts free-form input (quotes, "or", leading "-") without syntax errors.
+        result = func.websearch_to_tsquery(cls._text_config(), query_text)
+        return result
+
+    @classmethod
+    def _text_config(cls) -> Any:
+        # Inlined rather than bound, so the query names the same configuration as the generated columns.
+        result = literal_column(f"'{Constants.SEARCH_TEXT_CONFIG}'::regconfig")
+        return result
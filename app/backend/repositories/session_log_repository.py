@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
 from app.backend.models import SessionLog
 
 
@@ -16,15 +19,49 @@ class SessionLogRepository:
         log = SessionLog(session_id=session_id, event_type=event_type, details=details)
         self._db.add(log)
         await self._db.commit()
-        await self._db.refresh(log)
+        Metrics.session_events_total.inc(event_type)
         return log
 
-    async def list_logs(self, session_id: UUID, limit: int = 500) -> list[SessionLog]:
+    async def get_turn_trace(self, session_id: UUID, turn_id: str) -> SessionLog | None:
         query_result = await self._db.execute(
             select(SessionLog)
-            .where(SessionLog.session_id == session_id)
-            .order_by(SessionLog.created_at.asc())
-            .limit(limit)
+            .where(
+                SessionLog.session_id == session_id,
+                SessionLog.event_type == Constants.SESSION_EVENT_TURN_TRACE,
+                SessionLog.details["turn_id"].astext == turn_id,
+            )
+            .order_by(SessionLog.created_at.desc())
+            .limit(1)
         )
-        result = list(query_result.scalars().all())
+        result = query_result.scalar_one_or_none()
+        return result
+
+    async def list_logs(
+        self,
+        session_id: UUID,
+        *,
+        limit: int = 500,
+        after: tuple[datetime, UUID] | None = None,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> list[SessionLog]:
+        # Keyset pagination over (created_at, id), backed by the composite session index.
+        position = tuple_(SessionLog.created_at, SessionLog.id)
+        query = select(SessionLog).where(SessionLog.session_id == session_id)
+        if after is not None:
+            query = query.where(position > tuple_(*after))
+        if before is not None:
+            query = query.where(position < tuple_(*before))
+
+        if after is not None:
+            query_result = await self._db.execute(
+                query.order_by(SessionLog.created_at.asc(), SessionLog.id.asc()).limit(limit)
+            )
+            result = list(query_result.scalars().all())
+            return result
+
+        # Without a lower bound the newest page is wanted; read it backwards and restore ascending order.
+        query_result = await self._db.execute(
+            query.order_by(SessionLog.created_at.desc(), SessionLog.id.desc()).limit(limit)
+        )
+        result = list(reversed(query_result.scalars().all()))
         return result
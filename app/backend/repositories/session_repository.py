@@ -5,7 +5,9 @@ from uuid import UUID
 from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.backend.models import AgentSession
+from app.backend.core.constants import Constants
+from app.backend.models import AgentSession, SessionStats
+from app.backend.repositories.session_stats_repository import SessionStatsRepository
 
 
 class SessionRepository:
@@ -28,9 +30,16 @@ class SessionRepository:
             permission_mode=permission_mode,
             system_prompt=system_prompt,
         )
+        # The summary row is inserted in the same transaction, so every session has one from the start.
+        session.stats = SessionStats(
+            user_id=user_id,
+            title=title,
+            status=Constants.SESSION_STATUS_ACTIVE,
+            model=model,
+            permission_mode=permission_mode,
+        )
         self._db.add(session)
         await self._db.commit()
-        await self._db.refresh(session)
         return session
 
     async def list_for_user(self, user_id: UUID) -> list[AgentSession]:
@@ -48,14 +57,19 @@ class SessionRepository:
         return result
 
     async def update_claude_session_id(self, session: AgentSession, claude_session_id: str | None) -> None:
-        # SQLAlchemy tracks in-place mutation on mapped entities; update then commit is required.
-        session.claude_session_id = claude_session_id
+        # Updated by id so a session loaded in an earlier, already closed db session can be passed in.
+        await self._db.execute(
+            update(AgentSession).where(AgentSession.id == session.id).values(claude_session_id=claude_session_id)
+        )
         await self._db.commit()
+        session.claude_session_id = claude_session_id
 
     async def update_status(self, session: AgentSession, status: str) -> None:
-        # SQLAlchemy tracks in-place mutation on mapped entities; update then commit is required.
-        session.status = status
+        # Updated by id so a session loaded in an earlier, already closed db session can be passed in.
+        await self._db.execute(update(AgentSession).where(AgentSession.id == session.id).values(status=status))
+        await SessionStatsRepository(self._db).record_status(session.id, status)
         await self._db.commit()
+        session.status = status
 
     async def touch_session(self, session: AgentSession) -> None:
         await self._db.execute(
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Float, exists, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.constants import Constants
+from app.backend.models import AgentSession, MessageLog, SessionLog, SessionStats
+
+
+class SessionStatsRepository:
+    # The record_* writes do not commit: they join the caller's transaction so a summary row only ever
+    # counts rows that were committed with it.
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def list_for_user(
+        self,
+        user_id: UUID,
+        *,
+        limit: int,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> list[SessionStats]:
+        # Keyset pagination over (last_activity_at, session_id), newest first, backed by the user index.
+        query = select(SessionStats).where(SessionStats.user_id == user_id)
+        if before is not None:
+            query = query.where(tuple_(SessionStats.last_activity_at, SessionStats.session_id) < tuple_(*before))
+        query_result = await self._db.execute(
+            query.order_by(SessionStats.last_activity_at.desc(), SessionStats.session_id.desc()).limit(limit)
+        )
+        result = list(query_result.scalars().all())
+        return result
+
+    async def record_messages(
+        self,
+        session_id: UUID,
+        *,
+        count: int,
+        last_message_at: datetime,
+        preview: str | None,
+    ) -> None:
+        values: dict = {
+            "message_count": SessionStats.message_count + count,
+            "last_activity_at": func.greatest(SessionStats.last_activity_at, last_message_at),
+        }
+        if preview is not None:
+            values["last_message_preview"] = preview[: Constants.SESSION_PREVIEW_MAX_CHARS]
+        await self._db.execute(update(SessionStats).where(SessionStats.session_id == session_id).values(**values))
+
+    async def record_turn_result(self, session_id: UUID, *, cost_usd: float | None, duration_ms: int | None) -> None:
+        await self._db.execute(
+            update(SessionStats)
+            .where(SessionStats.session_id == session_id)
+            .values(
+                turn_count=SessionStats.turn_count + 1,
+                total_cost_usd=SessionStats.total_cost_usd + (cost_usd or 0.0),
+                total_duration_ms=SessionStats.total_duration_ms + (duration_ms or 0),
+            )
+        )
+
+    async def record_status(self, session_id: UUID, status: str) -> None:
+        await self._db.execute(update(SessionStats).where(SessionStats.session_id == session_id).values(status=status))
+
+    async def backfill_missing(self) -> int:
+        # Sessions created before the summary table existed get their row computed once from the logs;
+        # afterwards this is a single anti-join that finds nothing. Every worker runs this at startup:
+        # the schema lock lets one compute the rows while the others wait and then find nothing missing,
+        # and ON CONFLICT covers a row another path inserted in the meantime.
+        await self._db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": Constants.LOG_SCHEMA_LOCK_KEY})
+        message_count = (
+            select(func.count(MessageLog.id)).where(MessageLog.session_id == AgentSession.id).scalar_subquery()
+        )
+        last_message_at = (
+            select(func.max(MessageLog.created_at)).where(MessageLog.session_id == AgentSession.id).scalar_subquery()
+        )
+        last_message_preview = (
+            select(func.left(MessageLog.raw_text, Constants.SESSION_PREVIEW_MAX_CHARS))
+            .where(
+                MessageLog.session_id == AgentSession.id,
+                MessageLog.message_type != Constants.MESSAGE_TYPE_STREAM_EVENT,
+                MessageLog.raw_text.is_not(None),
+                MessageLog.raw_text != "",
+            )
+            .order_by(MessageLog.created_at.desc(), MessageLog.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        turn_count = (
+            select(func.count(SessionLog.id))
+            .where(
+                SessionLog.session_id == AgentSession.id,
+                SessionLog.event_type == Constants.SESSION_EVENT_TURN_RESULT,
+            )
+            .scalar_subquery()
+        )
+        total_cost_usd = (
+            select(func.coalesce(func.sum(SessionLog.details["cost_usd"].astext.cast(Float)), 0.0))
+            .where(
+                SessionLog.session_id == AgentSession.id,
+                SessionLog.event_type == Constants.SESSION_EVENT_TURN_RESULT,
+            )
+            .scalar_subquery()
+        )
+        total_duration_ms = (
+            select(func.coalesce(func.sum(SessionLog.details["duration_ms"].astext.cast(BigInteger)), 0))
+            .where(
+                SessionLog.session_id == AgentSession.id,
+                SessionLog.event_type == Constants.SESSION_EVENT_TURN_RESULT,
+            )
+            .scalar_subquery()
+        )
+
+        missing_sessions = select(
+            AgentSession.id,
+            AgentSession.user_id,
+            AgentSession.title,
+            AgentSession.status,
+            AgentSession.model,
+            AgentSession.permission_mode,
+            message_count,
+            turn_count,
+            total_cost_usd,
+            total_duration_ms,
+            last_message_preview,
+            AgentSession.created_at,
+            func.coalesce(last_message_at, AgentSession.updated_at),
+        ).where(~exists().where(SessionStats.session_id == AgentSession.id))
+
+        query_result = await self._db.execute(
+            pg_insert(SessionStats)
+            .from_select(
+                [
+                    "session_id",
+                    "user_id",
+                    "title",
+                    "status",
+                    "model",
+                    "permission_mode",
+                    "message_count",
+                    "turn_count",
+                    "total_cost_usd",
+                    "total_duration_ms",
+                    "last_message_preview",
+                    "created_at",
+                    "last_activity_at",
+                ],
+                missing_sessions,
+            )
+            .on_conflict_do_nothing(index_elements=[SessionStats.session_id])
+        )
+        await self._db.commit()
+        result = query_result.rowcount
+        return result
@@ -31,5 +31,4 @@ class UserRepository:
         user = User(username=username, display_name=display_name)
         self._db.add(user)
         await self._db.commit()
-        await self._db.refresh(user)
         return user
@@ -1,9 +1,15 @@
+from app.backend.schemas.answer_read import AnswerRead
+from app.backend.schemas.answer_request import AnswerRequest
 from app.backend.schemas.message_read import MessageRead
+from app.backend.schemas.message_summary_read import MessageSummaryRead
 from app.backend.schemas.prompt_request import PromptRequest
+from app.backend.schemas.search_hit_read import SearchHitRead
 from app.backend.schemas.session_create import SessionCreate
 from app.backend.schemas.session_log_read import SessionLogRead
 from app.backend.schemas.session_read import SessionRead
+from app.backend.schemas.session_summary_read import SessionSummaryRead
 from app.backend.schemas.stream_envelope import StreamEnvelope
+from app.backend.schemas.turn_read import TurnRead
 from app.backend.schemas.user_create import UserCreate
 from app.backend.schemas.user_read import UserRead
 
@@ -12,8 +18,14 @@ __all__ = [
     "UserRead",
     "SessionCreate",
     "SessionRead",
+    "SessionSummaryRead",
     "PromptRequest",
     "MessageRead",
+    "MessageSummaryRead",
     "SessionLogRead",
+    "SearchHitRead",
     "StreamEnvelope",
+    "TurnRead",
+    "AnswerRequest",
+    "AnswerRead",
 ]
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.backend.schemas.turn_read import TurnRead
+
+
+class AnswerRead(BaseModel):
+    delivered: bool
+    turn: TurnRead | None = None
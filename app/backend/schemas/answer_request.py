@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class AnswerRequest(BaseModel):
+    answer: str = Field(min_length=1)
+    answers: dict[str, str] = Field(default_factory=dict)
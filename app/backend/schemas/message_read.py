@@ -4,7 +4,9 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from app.backend.core.keyset_cursor import KeysetCursor
 
 
 class MessageRead(BaseModel):
@@ -17,3 +19,9 @@ class MessageRead(BaseModel):
     payload: dict[str, Any]
     raw_text: str | None
     created_at: datetime
+
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        result = KeysetCursor.encode(self.created_at, self.id)
+        return result
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from app.backend.core.keyset_cursor import KeysetCursor
+
+
+class MessageSummaryRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    session_id: UUID
+    role: str
+    message_type: str
+    raw_text: str | None
+    created_at: datetime
+
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        result = KeysetCursor.encode(self.created_at, self.id)
+        return result
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from app.backend.core.search_cursor import SearchCursor
+
+
+class SearchHitRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    # "message" hits point at one message log row; "session" hits matched the session title.
+    kind: str
+    session_id: UUID
+    session_title: str
+    message_id: UUID | None
+    role: str | None
+    message_type: str | None
+    created_at: datetime
+    rank: float
+    snippet: str
+
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        result = SearchCursor.encode(self.rank, self.created_at, self.message_id or self.session_id)
+        return result
@@ -4,7 +4,9 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from app.backend.core.keyset_cursor import KeysetCursor
 
 
 class SessionLogRead(BaseModel):
@@ -15,3 +17,9 @@ class SessionLogRead(BaseModel):
     event_type: str
     details: dict[str, Any]
     created_at: datetime
+
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        result = KeysetCursor.encode(self.created_at, self.id)
+        return result
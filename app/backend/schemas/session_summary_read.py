@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from app.backend.core.keyset_cursor import KeysetCursor
+
+
+class SessionSummaryRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    session_id: UUID
+    user_id: UUID
+    title: str
+    status: str
+    model: str
+    permission_mode: str
+    message_count: int
+    turn_count: int
+    total_cost_usd: float
+    total_duration_ms: int
+    last_message_preview: str | None
+    created_at: datetime
+    last_activity_at: datetime
+
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        result = KeysetCursor.encode(self.last_activity_at, self.session_id)
+        return result
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TurnRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    turn_id: UUID
+    session_id: UUID
+    status: str
+    queue_position: int | None = None
+    enqueued_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
@@ -1,3 +1,29 @@
+from app.backend.services.admission_controller import AdmissionController
+from app.backend.services.answer_broker import AnswerBroker
 from app.backend.services.claude_agent_service import ClaudeAgentService
+from app.backend.services.log_archiver import LogArchiver
+from app.backend.services.message_write_behind import MessageWriteBehind
+from app.backend.services.scheduled_turn import ScheduledTurn
+from app.backend.services.search_backfiller import SearchBackfiller
+from app.backend.services.session_coordinator import SessionCoordinator
+from app.backend.services.session_event_buffer import SessionEventBuffer
+from app.backend.services.session_event_hub import SessionEventHub
+from app.backend.services.session_lease import SessionLease
+from app.backend.services.stream_delta_coalescer import StreamDeltaCoalescer
+from app.backend.services.turn_scheduler import TurnScheduler
 
-__all__ = ["ClaudeAgentService"]
+__all__ = [
+    "AdmissionController",
+    "AnswerBroker",
+    "ClaudeAgentService",
+    "LogArchiver",
+    "MessageWriteBehind",
+    "ScheduledTurn",
+    "SearchBackfiller",
+    "SessionCoordinator",
+    "SessionEventBuffer",
+    "SessionEventHub",
+    "SessionLease",
+    "StreamDeltaCoalescer",
+    "TurnScheduler",
+]
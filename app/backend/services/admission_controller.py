@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import uuid
+from typing import ClassVar
+
+from fastapi import HTTPException
+
+from app.backend.core.constants import Constants
+
+
+class AdmissionController:
+    # A per-user cap on outstanding prompts, checked when a prompt is submitted. The process-wide cap
+    # on live CLI processes is ClaudeProcessSlots, owned by the runtime registry, so idle, pooled and
+    # warm clients count against it as well as running turns.
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = ("admission_rejected_per_user",)
+
+    def __init__(self, *, per_user_max: int) -> None:
+        self._per_user_max = per_user_max
+        self._outstanding: dict[uuid.UUID, int] = {}
+        self._rejected_per_user = 0
+
+    def admit(self, user_id: uuid.UUID) -> None:
+        outstanding = self._outstanding.get(user_id, 0)
+        if self._per_user_max > 0 and outstanding >= self._per_user_max:
+            self._rejected_per_user += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many prompts in flight for this user",
+                headers={"Retry-After": str(Constants.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+        self._outstanding[user_id] = outstanding + 1
+
+    def complete(self, user_id: uuid.UUID) -> None:
+        outstanding = self._outstanding.get(user_id, 0) - 1
+        if outstanding > 0:
+            self._outstanding[user_id] = outstanding
+        else:
+            self._outstanding.pop(user_id, None)
+
+    def restore(self, user_id: uuid.UUID) -> None:
+        # Counts a prompt again after it was released while suspended; it is already running, so the cap
+        # does not apply.
+        self._outstanding[user_id] = self._outstanding.get(user_id, 0) + 1
+
+    def stats(self) -> dict[str, int]:
+        result = {
+            "admission_users_outstanding": len(self._outstanding),
+            "admission_rejected_per_user": self._rejected_per_user,
+        }
+        return result
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from typing import Any, ClassVar
+
+
+class AnswerBroker:
+    # A turn that reaches AskUserQuestion waits here with its CLI process still connected. A posted
+    # answer resumes the same turn; after the timeout wait_for_answer raises TimeoutError and the turn
+    # parks itself. An answer that arrives while the session's turn is running but not (yet) waiting is
+    # held until the turn asks or ends.
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = (
+        "questions_answered",
+        "questions_held",
+        "questions_parked",
+        "questions_cancelled",
+        "questions_abandoned",
+    )
+
+    def __init__(self, *, timeout_seconds: float) -> None:
+        self._timeout_seconds = timeout_seconds
+        self._waiters: dict[uuid.UUID, asyncio.Future[dict[str, Any] | None]] = {}
+        self._active_turns: dict[uuid.UUID, int] = {}
+        self._held: dict[uuid.UUID, dict[str, Any]] = {}
+
+        self._answered = 0
+        self._held_total = 0
+        self._parked_total = 0
+        self._cancelled = 0
+        self._abandoned = 0
+
+    @property
+    def enabled(self) -> bool:
+        result = self._timeout_seconds > 0
+        return result
+
+    @property
+    def timeout_seconds(self) -> float:
+        return self._timeout_seconds
+
+    def begin_turn(self, session_id: uuid.UUID) -> None:
+        self._active_turns[session_id] = self._active_turns.get(session_id, 0) + 1
+
+    def end_turn(self, session_id: uuid.UUID) -> dict[str, Any] | None:
+        # Returns an answer the turn never asked for; the caller submits it as a prompt instead.
+        remaining = self._active_turns.get(session_id, 0) - 1
+        if remaining > 0:
+            self._active_turns[session_id] = remaining
+            return None
+        self._active_turns.pop(session_id, None)
+        result = self._held.pop(session_id, None)
+        return result
+
+    async def wait_for_answer(self, session_id: uuid.UUID) -> dict[str, Any] | None:
+        held = self._held.pop(session_id, None)
+        if held is not None:
+            # The user answered from the streamed question before the permission callback got here.
+            self._answered += 1
+            return held
+        self._cancel_waiter(session_id)
+        waiter: asyncio.Future[dict[str, Any] | None] = asyncio.get_running_loop().create_future()
+        self._waiters[session_id] = waiter
+        try:
+            result = await asyncio.wait_for(waiter, timeout=self._timeout_seconds)
+        except asyncio.TimeoutError:
+            self._parked_total += 1
+            raise
+        finally:
+            if self._waiters.get(session_id) is waiter:
+                del self._waiters[session_id]
+        return result
+
+    def deliver(self, session_id: uuid.UUID, reply: dict[str, Any]) -> bool:
+        # False only when no turn for the session is running here.
+        waiter = self._waiters.pop(session_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(reply)
+            self._answered += 1
+            return True
+        if session_id not in self._active_turns:
+            return False
+        self._held[session_id] = reply
+        self._held_total += 1
+        return True
+
+    def cancel(self, session_id: uuid.UUID) -> None:
+        self._held.pop(session_id, None)
+        self._cancel_waiter(session_id)
+
+    def _cancel_waiter(self, session_id: uuid.UUID) -> None:
+        waiter = self._waiters.pop(session_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+            self._cancelled += 1
+
+    async def abandon_oldest(self) -> bool:
+        # An opt-in process-slot reclaimer (ASK_USER_RECLAIM_SLOTS): a waiting turn still owns its CLI
+        # process, so under pressure the oldest question is given up as if it had timed out. Its turn parks
+        # and the idle process can be shed.
+        for waiter in self._waiters.values():
+            if not waiter.done():
+                waiter.set_exception(asyncio.TimeoutError())
+                self._abandoned += 1
+                return True
+        return False
+
+    def is_waiting(self, session_id: uuid.UUID) -> bool:
+        result = session_id in self._waiters
+        return result
+
+    def stats(self) -> dict[str, int]:
+        result = {
+            "questions_waiting": len(self._waiters),
+            "questions_answered": self._answered,
+            "questions_held": self._held_total,
+            "answers_pending": len(self._held),
+            "questions_parked": self._parked_total,
+            "questions_cancelled": self._cancelled,
+            "questions_abandoned": self._abandoned,
+        }
+        return result
@@ -1,18 +1,47 @@
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from datetime import datetime
+from functools import partial
 from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.backend.core.constants import Constants
+from app.backend.core.keyset_cursor import KeysetCursor
+from app.backend.core.metrics import Metrics
+from app.backend.core.search_cursor import SearchCursor
 from app.backend.core.settings import Settings
-from app.backend.models import AgentSession, MessageLog, SessionLog, User
-from app.backend.repositories import MessageRepository, SessionLogRepository, SessionRepository, UserRepository
-from app.backend.claude_sdk import ClaudeMessageSerializer, ClaudeRuntimeRegistry, DefaultPermissionModeResolver
-from app.backend.schemas import SessionCreate, UserCreate
+from app.backend.core.turn_profiler import TurnProfiler
+from app.backend.core.turn_trace import TurnTrace
+from app.backend.database import DatabaseManager
+from app.backend.models import AgentSession, MessageLog, SessionLog, SessionStats, User
+from app.backend.repositories import (
+    MessageRepository,
+    SearchRepository,
+    SessionLogRepository,
+    SessionRepository,
+    SessionStatsRepository,
+    UserRepository,
+)
+from app.backend.claude_sdk import (
+    ClaudeCapacityError,
+    ClaudeMessageSerializer,
+    ClaudeRuntimeRegistry,
+    DefaultPermissionModeResolver,
+)
+from app.backend.schemas import AnswerRequest, SessionCreate, UserCreate
+from app.backend.services.answer_broker import AnswerBroker
+from app.backend.services.log_archiver import LogArchiver
+from app.backend.services.message_write_behind import MessageWriteBehind
+from app.backend.services.session_coordinator import SessionCoordinator
+from app.backend.services.stream_delta_coalescer import StreamDeltaCoalescer
 
 
 class ClaudeAgentService:
@@ -21,10 +50,18 @@ class ClaudeAgentService:
         runtime_registry: ClaudeRuntimeRegistry,
         settings: Settings,
         permission_mode_resolver: DefaultPermissionModeResolver,
+        db_manager: DatabaseManager,
+        session_coordinator: SessionCoordinator,
+        answer_broker: AnswerBroker,
+        log_archiver: LogArchiver,
     ) -> None:
         self._runtime_registry = runtime_registry
         self._settings = settings
         self._permission_mode_resolver = permission_mode_resolver
+        self._db_manager = db_manager
+        self._session_coordinator = session_coordinator
+        self._answer_broker = answer_broker
+        self._log_archiver = log_archiver
 
     async def ensure_default_users(self, db: AsyncSession) -> None:
         user_repo = UserRepository(db)
@@ -40,6 +77,11 @@ class ClaudeAgentService:
                 continue
             await user_repo.create_user(username=username, display_name=display_name)
 
+    async def ensure_session_stats(self, db: AsyncSession) -> None:
+        created = await SessionStatsRepository(db).backfill_missing()
+        if created:
+            logging.getLogger(__name__).warning("[startup] backfilled session stats for %s sessions", created)
+
     async def list_users(self, db: AsyncSession) -> list[User]:
         user_repo = UserRepository(db)
         result = list(await user_repo.list_users())
@@ -99,6 +141,43 @@ class ClaudeAgentService:
         result = list(await session_repo.list_for_user(user_id))
         return result
 
+    async def list_session_summaries(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        *,
+        limit: int,
+        before: str | None = None,
+    ) -> list[SessionStats]:
+        stats_repo = SessionStatsRepository(db)
+        result = await stats_repo.list_for_user(user_id, limit=limit, before=self._decode_cursor(before))
+        # The user lookup is only needed to tell an unknown user from an empty page.
+        if not result and before is None:
+            user = await UserRepository(db).get_user(user_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="User not found")
+        return result
+
+    async def search_history(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        query_text: str,
+        *,
+        limit: int,
+        before: str | None = None,
+    ) -> list[Row[Any]]:
+        query_text = query_text.strip()
+        if not query_text:
+            raise HTTPException(status_code=400, detail="Search query is empty")
+        search_before = self._decode_search_cursor(before)
+        result = await SearchRepository(db).search_for_user(user_id, query_text, limit=limit, before=search_before)
+        if not result and before is None:
+            user = await UserRepository(db).get_user(user_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="User not found")
+        return result
+
     async def get_session(self, db: AsyncSession, session_id: UUID) -> AgentSession:
         session_repo = SessionRepository(db)
         session = await session_repo.get_session(session_id)
@@ -106,58 +185,302 @@ class ClaudeAgentService:
             raise HTTPException(status_code=404, detail="Session not found")
         return session
 
-    async def list_messages(self, db: AsyncSession, session_id: UUID) -> list[MessageLog]:
-        await self.get_session(db, session_id)
+    async def list_messages(
+        self,
+        db: AsyncSession,
+        session_id: UUID,
+        *,
+        limit: int,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> list[MessageLog]:
+        session = await self.get_session(db, session_id)
+        await self._rehydrate_on_open(session, after=after, before=before)
         message_repo = MessageRepository(db)
-        result = list(await message_repo.list_messages(session_id))
+        result = list(
+            await message_repo.list_messages(
+                session_id,
+                limit=limit,
+                after=self._decode_cursor(after),
+                before=self._decode_cursor(before),
+            )
+        )
         return result
 
-    async def list_logs(self, db: AsyncSession, session_id: UUID) -> list[SessionLog]:
-        await self.get_session(db, session_id)
+    async def list_message_summaries(
+        self,
+        db: AsyncSession,
+        session_id: UUID,
+        *,
+        limit: int,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> list[Row[Any]]:
+        session = await self.get_session(db, session_id)
+        await self._rehydrate_on_open(session, after=after, before=before)
+        message_repo = MessageRepository(db)
+        result = await message_repo.list_message_summaries(
+            session_id,
+            limit=limit,
+            after=self._decode_cursor(after),
+            before=self._decode_cursor(before),
+        )
+        return result
+
+    async def list_logs(
+        self,
+        db: AsyncSession,
+        session_id: UUID,
+        *,
+        limit: int,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> list[SessionLog]:
+        session = await self.get_session(db, session_id)
+        await self._rehydrate_on_open(session, after=after, before=before)
         log_repo = SessionLogRepository(db)
-        result = list(await log_repo.list_logs(session_id))
+        result = list(
+            await log_repo.list_logs(
+                session_id,
+                limit=limit,
+                after=self._decode_cursor(after),
+                before=self._decode_cursor(before),
+            )
+        )
         return result
 
     async def interrupt_session(self, db: AsyncSession, session_id: UUID) -> None:
         session = await self.get_session(db, session_id)
         log_repo = SessionLogRepository(db)
+        self._answer_broker.cancel(session.id)
         await self._runtime_registry.interrupt(str(session.id))
+        # The turn may be running in another worker; the owner picks this up via LISTEN.
+        await self._session_coordinator.publish_interrupt(session.id)
         await log_repo.create_log(
             session_id=session.id,
             event_type=Constants.SESSION_EVENT_INTERRUPTED,
             details={"source": Constants.SESSION_SOURCE_UI},
         )
 
+    async def warm_session(self, db: AsyncSession, session_id: UUID) -> str:
+        session = await self.get_session(db, session_id)
+        if self._settings.claude_warm_ttl_seconds <= 0:
+            return Constants.WARM_STATUS_DISABLED
+        result = await self._runtime_registry.warm(
+            local_session_id=str(session.id),
+            model=session.model,
+            permission_mode=session.permission_mode,
+            max_turns=self._settings.claude_max_turns,
+            system_prompt=session.system_prompt,
+            resume=session.claude_session_id,
+            ttl_seconds=self._settings.claude_warm_ttl_seconds,
+            owner_id=str(session.user_id),
+        )
+        return result
+
+    async def deliver_answer(self, db: AsyncSession, session_id: UUID, payload: AnswerRequest) -> bool:
+        # False means no worker has a turn running for the session, so the caller submits a new prompt. A
+        # running turn that is not waiting yet holds the answer until it asks or ends.
+        session = await self.get_session(db, session_id)
+        reply = {"answer": payload.answer, "answers": payload.answers}
+        delivered = self._answer_broker.deliver(session.id, reply)
+        if not delivered:
+            # The turn may be running on another worker, which claims the answer over NOTIFY.
+            delivered = await self._session_coordinator.publish_answer(session.id, reply)
+        if delivered:
+            await SessionLogRepository(db).create_log(
+                session_id=session.id,
+                event_type=Constants.SESSION_EVENT_USER_ANSWERED,
+                details={"answer_length": len(payload.answer), "answered_questions": len(payload.answers)},
+            )
+        return delivered
+
     async def stream_prompt(
         self,
-        db: AsyncSession,
         *,
         session_id: UUID,
         prompt: str,
+        turn_id: UUID | None = None,
+        suspend: Callable[[Awaitable[Any]], Awaitable[Any]] | None = None,
     ) -> AsyncGenerator[dict[str, Any], None]:
-        session_repo = SessionRepository(db)
-        message_repo = MessageRepository(db)
+        # A turn can wait on the model for minutes, so it never holds a database session: every write
+        # below checks a connection out for just that statement batch. `suspend` wraps the wait for an
+        # AskUserQuestion answer, letting the caller free whatever the turn holds while the user thinks.
+        message_writer = MessageWriteBehind(
+            self._db_manager,
+            batch_size=self._settings.message_flush_batch_size,
+            flush_interval_seconds=self._settings.message_flush_interval_seconds,
+        )
+        trace = TurnTrace(str(turn_id) if turn_id is not None else None)
+        profiler: TurnProfiler | None = None
+        profiler_handle: asyncio.TimerHandle | None = None
+        if self._settings.trace_profiler_enabled:
+            profiler = TurnProfiler(Constants.PROFILER_SAMPLE_INTERVAL_SECONDS)
+            profiler_handle = asyncio.get_running_loop().call_later(
+                self._settings.trace_slow_turn_seconds,
+                self._start_profiler,
+                profiler,
+                trace,
+            )
+
+        try:
+            session = await self._load_turn_session(session_id)
+
+            user_message = message_writer.add(
+                session_id=session.id,
+                role=Constants.ROLE_USER,
+                message_type=Constants.MESSAGE_TYPE_PROMPT,
+                payload={"prompt": prompt},
+                raw_text=prompt,
+            )
+
+            await self._create_log(
+                session_id=session.id,
+                event_type=Constants.SESSION_EVENT_PROMPT_SUBMITTED,
+                details={"length": len(prompt)},
+            )
+            trace.mark(Constants.TRACE_SPAN_PROMPT_PERSISTED)
+
+            yield self._build_message_event(user_message)
+
+            try:
+                async for item in self._stream_runtime_turn(
+                    session=session,
+                    prompt=prompt,
+                    message_writer=message_writer,
+                    trace=trace,
+                    suspend=suspend,
+                ):
+                    yield item
+            except HTTPException as exc:
+                # Only a full process cap raises HTTPException here; runtime errors are reported inside the turn.
+                await message_writer.flush()
+                rejection_log = await self._create_log(
+                    session_id=session.id,
+                    event_type=Constants.SESSION_EVENT_ADMISSION_REJECTED,
+                    details={"status_code": exc.status_code, "reason": exc.detail},
+                )
+                yield {
+                    "event": Constants.STREAM_EVENT_ERROR,
+                    "payload": {
+                        "message": exc.detail,
+                        "status_code": exc.status_code,
+                        "retry_after": (exc.headers or {}).get("Retry-After"),
+                        "log_id": str(rejection_log.id),
+                        "created_at": rejection_log.created_at.isoformat(),
+                    },
+                }
+        finally:
+            if profiler_handle is not None:
+                profiler_handle.cancel()
+            flush_started = time.perf_counter()
+            await message_writer.close()
+            trace.mark(Constants.TRACE_SPAN_LAST_DB_FLUSH, duration_seconds=time.perf_counter() - flush_started)
+            if profiler is not None and profiler.running:
+                trace.profile = await profiler.stop()
+            await self._save_trace(session_id, trace)
+
+    async def get_turn_trace(self, db: AsyncSession, session_id: UUID, turn_id: UUID) -> SessionLog:
+        await self.get_session(db, session_id)
         log_repo = SessionLogRepository(db)
+        trace_log = await log_repo.get_turn_trace(session_id, str(turn_id))
+        if trace_log is None:
+            raise HTTPException(status_code=404, detail="Turn trace not found")
+        return trace_log
+
+    async def _rehydrate_on_open(self, session: AgentSession, *, after: str | None, before: str | None) -> None:
+        # Only the first page of a session's history can reach back into archived months; incremental and
+        # older-page reads come after it. Sessions that were never archived skip the manifest lookup.
+        if after is None and before is None and session.has_archived_logs:
+            await self._log_archiver.rehydrate_session(session.id)
+
+    async def _load_turn_session(self, session_id: UUID) -> AgentSession:
+        async with self._db_manager.session() as db:
+            result = await self.get_session(db, session_id)
+            await SessionRepository(db).touch_session(result)
+        return result
 
-        session = await self.get_session(db, session_id)
-        await session_repo.touch_session(session)
+    async def _create_log(self, *, session_id: UUID, event_type: str, details: dict) -> SessionLog:
+        async with self._db_manager.session() as db:
+            result = await SessionLogRepository(db).create_log(
+                session_id=session_id,
+                event_type=event_type,
+                details=details,
+            )
+        return result
 
-        user_message = await message_repo.create_message(
-            session_id=session.id,
-            role=Constants.ROLE_USER,
-            message_type=Constants.MESSAGE_TYPE_PROMPT,
-            payload={"prompt": prompt},
-            raw_text=prompt,
-        )
+    async def _record_turn_result(self, session_id: UUID, serialized: dict[str, Any]) -> SessionLog:
+        # The summary counters and the TURN_RESULT log commit together.
+        async with self._db_manager.session() as db:
+            await SessionStatsRepository(db).record_turn_result(
+                session_id,
+                cost_usd=serialized.get("total_cost_usd"),
+                duration_ms=serialized.get("duration_ms"),
+            )
+            result = await SessionLogRepository(db).create_log(
+                session_id=session_id,
+                event_type=Constants.SESSION_EVENT_TURN_RESULT,
+                details={
+                    "session_id": serialized.get("session_id"),
+                    "is_error": serialized.get("is_error", False),
+                    "duration_ms": serialized.get("duration_ms"),
+                    "cost_usd": serialized.get("total_cost_usd"),
+                    "num_turns": serialized.get("num_turns"),
+                },
+            )
+        return result
 
-        await log_repo.create_log(
-            session_id=session.id,
-            event_type=Constants.SESSION_EVENT_PROMPT_SUBMITTED,
-            details={"length": len(prompt)},
-        )
+    async def _wait_for_answer(
+        self,
+        session_id: UUID,
+        parked: asyncio.Event,
+        suspend: Callable[[Awaitable[Any]], Awaitable[Any]] | None,
+    ) -> dict[str, Any] | None:
+        waiter = self._answer_broker.wait_for_answer(session_id)
+        try:
+            result = await (suspend(waiter) if suspend is not None else waiter)
+        except asyncio.TimeoutError:
+            # The flag belongs to this turn alone, so a turn that ends before its next message leaves
+            # nothing behind for the session's next one.
+            parked.set()
+            result = None
+        return result
+
+    async def _update_claude_session_id(self, session: AgentSession, claude_session_id: str | None) -> None:
+        async with self._db_manager.session() as db:
+            await SessionRepository(db).update_claude_session_id(session, claude_session_id)
+
+    async def _update_status(self, session: AgentSession, status: str) -> None:
+        async with self._db_manager.session() as db:
+            await SessionRepository(db).update_status(session, status)
+
+    async def _save_trace(self, session_id: UUID, trace: TurnTrace) -> None:
+        # Nothing is marked before the session is loaded, so an empty trace belongs to a rejected prompt.
+        if trace.is_empty:
+            return
+        try:
+            await self._create_log(
+                session_id=session_id,
+                event_type=Constants.SESSION_EVENT_TURN_TRACE,
+                details=trace.to_details(),
+            )
+        except Exception as exc:
+            logging.getLogger(__name__).warning("[trace] unable to store turn trace: %s", exc)
 
-        yield self._build_message_event(user_message)
+    @classmethod
+    def _start_profiler(cls, profiler: TurnProfiler, trace: TurnTrace) -> None:
+        trace.mark(Constants.TRACE_SPAN_PROFILER_STARTED)
+        profiler.start()
 
+    async def _stream_runtime_turn(
+        self,
+        *,
+        session: AgentSession,
+        prompt: str,
+        message_writer: MessageWriteBehind,
+        trace: TurnTrace,
+        suspend: Callable[[Awaitable[Any]], Awaitable[Any]] | None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
         recovery_attempted = False
         while True:
             runtime = await self._runtime_registry.get_or_create(
@@ -168,13 +491,58 @@ class ClaudeAgentService:
                 system_prompt=session.system_prompt,
                 resume=session.claude_session_id,
             )
-
             try:
-                async for sdk_message in runtime.query_stream(prompt):
-                    serialized = ClaudeMessageSerializer.serialize(sdk_message)
+                trace.mark(Constants.TRACE_SPAN_RUNTIME_ACQUIRED)
+                question_parked = asyncio.Event()
+                runtime.set_question_handler(
+                    partial(self._wait_for_answer, session.id, question_parked, suspend)
+                    if self._answer_broker.enabled
+                    else None
+                )
+                delta_coalescer = StreamDeltaCoalescer(
+                    session_id=str(session.id),
+                    flush_hz=self._settings.stream_delta_flush_hz,
+                )
+                async for sdk_message in delta_coalescer.paced(runtime.query_stream(prompt, trace=trace)):
+                    if sdk_message is None:
+                        # The model paused with deltas pending; release them instead of waiting for the next one.
+                        delta_frame = delta_coalescer.flush()
+                        if delta_frame is not None:
+                            yield delta_frame
+                        continue
+                    if question_parked.is_set():
+                        question_parked.clear()
+                        # The question timed out and was denied; end the turn and keep the client for later.
+                        await runtime.interrupt()
+                        await self._create_log(
+                            session_id=session.id,
+                            event_type=Constants.SESSION_EVENT_TURN_PARKED,
+                            details={"timeout_seconds": self._answer_broker.timeout_seconds},
+                        )
+                    # Partial-message events are coalesced and fanned out only; they are never serialized or stored.
+                    if type(sdk_message).__name__ == Constants.MESSAGE_TYPE_STREAM_EVENT:
+                        delta_frame = delta_coalescer.add(
+                            getattr(sdk_message, "event", None),
+                            parent_tool_use_id=getattr(sdk_message, "parent_tool_use_id", None),
+                        )
+                        if delta_frame is not None:
+                            yield delta_frame
+                        continue
+                    delta_frame = delta_coalescer.flush()
+                    if delta_frame is not None:
+                        yield delta_frame
+
+                    serialize_started = time.perf_counter()
+                    serialized = ClaudeMessageSerializer.serialize(
+                        sdk_message,
+                        compact_raw=self._settings.message_compact_raw,
+                    )
+                    Metrics.serialize_seconds.observe(time.perf_counter() - serialize_started)
+                    for tool_name, tool_use_id in self._tool_calls(serialized):
+                        trace.mark(Constants.TRACE_SPAN_TOOL_CALL, tool=tool_name, tool_use_id=tool_use_id)
                     raw_text = ClaudeMessageSerializer.extract_text(serialized)
 
-                    saved = await message_repo.create_message(
+                    saved = message_writer.add(
                         session_id=session.id,
                         role=serialized.get("role", Constants.ROLE_UNKNOWN),
                         message_type=serialized.get("type", Constants.MESSAGE_TYPE_UNKNOWN),
@@ -184,40 +552,48 @@ class ClaudeAgentService:
 
                     result_session_id = serialized.get("session_id")
                     if result_session_id and result_session_id != session.claude_session_id:
-                        await session_repo.update_claude_session_id(session, result_session_id)
+                        await self._update_claude_session_id(session, result_session_id)
                         runtime.set_resume(result_session_id)
 
                     if serialized.get("type") == Constants.MESSAGE_TYPE_RESULT:
-                        await log_repo.create_log(
-                            session_id=session.id,
-                            event_type=Constants.SESSION_EVENT_TURN_RESULT,
-                            details={
-                                "session_id": serialized.get("session_id"),
-                                "is_error": serialized.get("is_error", False),
-                                "duration_ms": serialized.get("duration_ms"),
-                                "cost_usd": serialized.get("total_cost_usd"),
-                                "num_turns": serialized.get("num_turns"),
-                            },
+                        trace.mark(
+                            Constants.TRACE_SPAN_RESULT,
+                            is_error=serialized.get("is_error", False),
+                            sdk_duration_ms=serialized.get("duration_ms"),
+                            sdk_api_duration_ms=serialized.get("duration_api_ms"),
                         )
+                        # The turn is over; make every row durable before reporting the result.
+                        await message_writer.flush()
+                        await self._record_turn_result(session.id, serialized)
 
                     yield self._build_message_event(saved)
 
                     if self._contains_ask_user_question(serialized):
-                        await log_repo.create_log(
+                        await message_writer.flush()
+                        await self._create_log(
                             session_id=session.id,
                             event_type=Constants.SESSION_EVENT_WAITING_USER_ANSWER,
-                            details={"message_id": str(saved.id)},
+                            details={"message_id": str(saved.id), "suspended": self._answer_broker.enabled},
                         )
-                        break
+                        # A suspended turn keeps reading: the CLI resumes once the answer is posted.
+                        if not self._answer_broker.enabled:
+                            break
                 return
             except Exception as exc:
+                if isinstance(exc, ClaudeCapacityError):
+                    raise HTTPException(
+                        status_code=503,
+                        detail=str(exc),
+                        headers={"Retry-After": str(Constants.ADMISSION_RETRY_AFTER_SECONDS)},
+                    ) from exc
                 if not recovery_attempted and self._is_recoverable_runtime_error(exc):
                     recovery_attempted = True
+                    Metrics.runtime_resets_total.inc()
                     previous_claude_session_id = session.claude_session_id
                     await self._runtime_registry.drop(str(session.id))
                     if previous_claude_session_id is not None:
-                        await session_repo.update_claude_session_id(session, None)
-                    await log_repo.create_log(
+                        await self._update_claude_session_id(session, None)
+                    await self._create_log(
                         session_id=session.id,
                         event_type=Constants.SESSION_EVENT_RUNTIME_RESET,
                         details={
@@ -228,9 +604,10 @@ class ClaudeAgentService:
                     )
                     continue
 
-                await session_repo.update_status(session, Constants.SESSION_STATUS_ERROR)
+                await message_writer.flush()
+                await self._update_status(session, Constants.SESSION_STATUS_ERROR)
                 error_details = self._build_error_details(exc)
-                error_log = await log_repo.create_log(
+                error_log = await self._create_log(
                     session_id=session.id,
                     event_type=Constants.SESSION_EVENT_SDK_ERROR,
                     details=error_details,
@@ -244,6 +621,8 @@ class ClaudeAgentService:
                     },
                 }
                 return
+            finally:
+                runtime.release_lease()
 
     @classmethod
     def _build_message_event(cls, message: MessageLog) -> dict[str, Any]:
@@ -254,13 +633,33 @@ class ClaudeAgentService:
                 "session_id": str(message.session_id),
                 "role": message.role,
                 "message_type": message.message_type,
-                "payload": message.payload,
+                "payload": ClaudeMessageSerializer.expand_raw(message.payload),
                 "raw_text": message.raw_text,
                 "created_at": message.created_at.isoformat(),
             },
         }
         return result
 
+    @classmethod
+    def _decode_cursor(cls, cursor: str | None) -> tuple[datetime, UUID] | None:
+        if cursor is None:
+            return None
+        try:
+            result = KeysetCursor.decode(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor") from exc
+        return result
+
+    @classmethod
+    def _decode_search_cursor(cls, cursor: str | None) -> tuple[float, datetime, UUID] | None:
+        if cursor is None:
+            return None
+        try:
+            result = SearchCursor.decode(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor") from exc
+        return result
+
     @classmethod
     def _build_error_details(cls, exc: Exception) -> dict[str, Any]:
         result: dict[str, Any] = {
@@ -283,6 +682,20 @@ class ClaudeAgentService:
 
         return result
 
+    @classmethod
+    def _tool_calls(cls, serialized_message: dict[str, Any]) -> list[tuple[str, str | None]]:
+        if serialized_message.get("type") != Constants.MESSAGE_TYPE_ASSISTANT:
+            return []
+        content = serialized_message.get("content")
+        if not isinstance(content, list):
+            return []
+        result = [
+            (item["name"], item.get("id"))
+            for item in content
+            if isinstance(item, dict) and "name" in item and "input" in item
+        ]
+        return result
+
     @classmethod
     def _contains_ask_user_question(cls, serialized_message: dict[str, Any]) -> bool:
         if serialized_message.get("type") != Constants.MESSAGE_TYPE_ASSISTANT:
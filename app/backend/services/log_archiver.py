@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, ClassVar
+from uuid import UUID
+
+from sqlalchemy import Table, text
+
+from app.backend.core.calendar_month import CalendarMonth
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
+from app.backend.database import DatabaseManager
+from app.backend.models import LogArchiveChunk
+from app.backend.repositories import LogArchiveRepository
+
+
+class LogArchiver:
+    # Keeps the monthly log partitions created ahead of time and, with a retention window set, moves
+    # partitions that fell out of it to gzip NDJSON files on local disk. Each session's rows are written as
+    # their own gzip member, so opening an archived session decompresses only that session's rows.
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = (
+        "log_partitions_rehydrated_dropped",
+        "log_sessions_rehydrated",
+        "log_maintenance_failures",
+    )
+
+    def __init__(
+        self,
+        *,
+        db_manager: DatabaseManager,
+        archive_dir: str,
+        retention_months: int,
+        interval_seconds: float,
+    ) -> None:
+        self._db_manager = db_manager
+        self._archive_dir = Path(archive_dir)
+        self._retention_months = retention_months
+        self._interval_seconds = interval_seconds
+
+        self._task: asyncio.Task[None] | None = None
+        self._partitions_dropped = 0
+        self._sessions_rehydrated = 0
+        self._maintenance_failures = 0
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        task = self._task
+        self._task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_maintenance(self) -> None:
+        await self._db_manager.ensure_partitions()
+        if self._retention_months <= 0:
+            return
+
+        cutoff = CalendarMonth.shift(CalendarMonth.start_of(datetime.now(timezone.utc)), -self._retention_months)
+        # One worker archives at a time. The lock is session-level on an autocommit connection outside the
+        # pool, so the long export holds neither a pool slot nor an open transaction.
+        async with self._db_manager.dedicated_engine.connect() as lock_connection:
+            lock_connection = await lock_connection.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await lock_connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": Constants.LOG_MAINTENANCE_LOCK_KEY},
+            )
+            if not acquired:
+                return
+            try:
+                for table in DatabaseManager.partitioned_tables():
+                    rehydrated_prefix = f"{table.name}_{Constants.LOG_REHYDRATED_PARTITION_PREFIX}"
+                    for name, lower, upper in await DatabaseManager.list_partitions(lock_connection, table.name):
+                        if upper is None or upper > cutoff:
+                            continue
+                        if name.startswith(rehydrated_prefix) and lower is not None:
+                            await self._drop_rehydrated_partition(table, name, lower, upper)
+                        else:
+                            await self._archive_partition(table, name)
+            finally:
+                await lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": Constants.LOG_MAINTENANCE_LOCK_KEY},
+                )
+
+    async def rehydrate_session(self, session_id: UUID) -> int:
+        # Failures are logged rather than raised: the session still opens, showing its non-archived rows.
+        try:
+            result = await self._rehydrate(session_id)
+        except Exception as exc:
+            logging.getLogger(__name__).warning("[archive] rehydrating session %s failed: %s", session_id, exc)
+            return 0
+        return result
+
+    def stats(self) -> dict[str, int]:
+        result = {
+            "log_retention_months": self._retention_months,
+            "log_partitions_rehydrated_dropped": self._partitions_dropped,
+            "log_sessions_rehydrated": self._sessions_rehydrated,
+            "log_maintenance_failures": self._maintenance_failures,
+        }
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_maintenance()
+            except Exception as exc:
+                self._maintenance_failures += 1
+                logging.getLogger(__name__).warning("[archive] log maintenance failed: %s", exc)
+            await asyncio.sleep(self._interval_seconds)
+
+    async def _archive_partition(self, table: Table, partition_name: str) -> None:
+        # The partition is exported while still attached (an expired month gets no new rows), then the chunk
+        # manifest is written in the same short transaction that detaches and drops it.
+        path = self._archive_dir / table.name / f"{partition_name}{Constants.LOG_ARCHIVE_FILE_SUFFIX}"
+        chunks = await self._export_partition(table, partition_name, path)
+        async with self._db_manager.session() as db:
+            await LogArchiveRepository(db).record_chunks(chunks)
+            await DatabaseManager.drop_partition(db, table.name, partition_name)
+            await db.commit()
+
+        row_count = sum(chunk["row_count"] for chunk in chunks)
+        Metrics.log_partitions_archived_total.inc(table.name)
+        Metrics.log_rows_archived_total.inc(table.name, amount=row_count)
+        logging.getLogger(__name__).warning(
+            "[archive] archived %s rows of %s to %s",
+            row_count,
+            partition_name,
+            path,
+        )
+
+    async def _drop_rehydrated_partition(
+        self,
+        table: Table,
+        partition_name: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        # Everything in a rehydrated partition is already in the archive, so it is dropped without an export
+        # once nobody has opened one of its sessions for a while.
+        since = datetime.now(timezone.utc) - timedelta(seconds=Constants.LOG_REHYDRATED_HOLD_SECONDS)
+        async with self._db_manager.session() as db:
+            archive_repo = LogArchiveRepository(db)
+            if await archive_repo.is_held(table.name, start, end, since=since):
+                return
+            await archive_repo.release(table.name, start, end)
+            await DatabaseManager.drop_partition(db, table.name, partition_name)
+            await db.commit()
+        self._partitions_dropped += 1
+
+    async def _export_partition(self, table: Table, partition_name: str, path: Path) -> list[dict[str, Any]]:
+        # The search column is rebuilt by the table's trigger on restore, so it is not archived.
+        derived_columns = [column.name for column in table.columns if column is DatabaseManager.search_column(table)]
+        temp_path = path.with_name(f"{path.name}.tmp")
+        handle = await asyncio.to_thread(self._open_archive_file, temp_path)
+        result: list[dict[str, Any]] = []
+        try:
+            async with self._db_manager.engine.connect() as connection:
+                rows = await connection.stream(
+                    text(
+                        "SELECT session_id, created_at, (to_jsonb(p) - CAST(:derived AS text[]))::text AS line "
+                        f"FROM {partition_name} p ORDER BY session_id, created_at, id"
+                    ),
+                    {"derived": derived_columns},
+                )
+                group: list[Any] = []
+                async for row in rows:
+                    if group and row.session_id != group[0].session_id:
+                        result.append(await self._write_chunk(handle, group))
+                        group = []
+                    group.append(row)
+                if group:
+                    result.append(await self._write_chunk(handle, group))
+            await asyncio.to_thread(self._finish_archive_file, handle, temp_path, path)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            raise
+
+        for chunk in result:
+            chunk.update(table_name=table.name, partition_name=partition_name, path=str(path))
+        return result
+
+    async def _write_chunk(self, handle: BinaryIO, rows: list[Any]) -> dict[str, Any]:
+        offset, length = await asyncio.to_thread(self._append_member, handle, [row.line for row in rows])
+        result = {
+            "session_id": rows[0].session_id,
+            "offset": offset,
+            "length": length,
+            "row_count": len(rows),
+            "first_created_at": rows[0].created_at,
+            "last_created_at": rows[-1].created_at,
+        }
+        return result
+
+    async def _rehydrate(self, session_id: UUID) -> int:
+        async with self._db_manager.session() as db:
+            pending = await LogArchiveRepository(db).list_pending(session_id)
+        if not pending:
+            return 0
+
+        # Creating a partition locks the whole table, so it happens in its own short transaction rather
+        # than in the one restoring rows.
+        await self._create_rehydration_partitions(pending)
+        tables = {table.name: table for table in DatabaseManager.partitioned_tables()}
+        result = 0
+        async with self._db_manager.session() as db:
+            archive_repo = LogArchiveRepository(db)
+            for chunk in await archive_repo.claim_pending(session_id):
+                lines = await asyncio.to_thread(self._read_member, Path(chunk.path), chunk.offset, chunk.length)
+                restored = await archive_repo.restore_rows(tables[chunk.table_name], lines)
+                Metrics.log_rows_rehydrated_total.inc(chunk.table_name, amount=restored)
+                result += restored
+            await db.commit()
+        self._sessions_rehydrated += 1
+        return result
+
+    async def _create_rehydration_partitions(self, chunks: list[LogArchiveChunk]) -> None:
+        months_by_table: dict[str, set[datetime]] = {}
+        for chunk in chunks:
+            months = CalendarMonth.between(chunk.first_created_at, chunk.last_created_at)
+            months_by_table.setdefault(chunk.table_name, set()).update(months)
+
+        async with self._db_manager.engine.begin() as connection:
+            await connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": Constants.LOG_SCHEMA_LOCK_KEY})
+            for table_name, months in months_by_table.items():
+                partitions = await DatabaseManager.list_partitions(connection, table_name)
+                for month_start in sorted(months):
+                    covered = any(
+                        (lower is None or lower <= month_start) and (upper is None or month_start < upper)
+                        for _, lower, upper in partitions
+                    )
+                    if not covered:
+                        await DatabaseManager.create_partition(
+                            connection,
+                            table_name,
+                            month_start,
+                            prefix=Constants.LOG_REHYDRATED_PARTITION_PREFIX,
+                        )
+
+    @classmethod
+    def _open_archive_file(cls, path: Path) -> BinaryIO:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        result = path.open("wb")
+        return result
+
+    @classmethod
+    def _append_member(cls, handle: BinaryIO, lines: list[str]) -> tuple[int, int]:
+        # Concatenated gzip members are still one valid gzip file: `gunzip -c` yields the whole NDJSON.
+        data = gzip.compress("".join(f"{line}\n" for line in lines).encode("utf-8"))
+        offset = handle.tell()
+        handle.write(data)
+        result = (offset, len(data))
+        return result
+
+    @classmethod
+    def _finish_archive_file(cls, handle: BinaryIO, temp_path: Path, path: Path) -> None:
+        handle.flush()
+        os.fsync(handle.fileno())
+        handle.close()
+        os.replace(temp_path, path)
+
+    @classmethod
+    def _read_member(cls, path: Path, offset: int, length: int) -> list[str]:
+        with path.open("rb") as handle:
+            handle.seek(offset)
+            data = handle.read(length)
+        result = gzip.decompress(data).decode("utf-8").splitlines()
+        return result
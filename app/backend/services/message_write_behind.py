@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.backend.core.json_codec import JsonCodec
+from app.backend.database import DatabaseManager
+from app.backend.models import MessageLog
+from app.backend.repositories import MessageRepository
+
+
+class MessageWriteBehind:
+    # Streamed messages get their id, timestamp and JSON encoding here so the SSE event can be emitted
+    # right away; the rows are written in ordered batches by a background task on a connection of its own.
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        *,
+        batch_size: int,
+        flush_interval_seconds: float,
+    ) -> None:
+        self._db_manager = db_manager
+        self._batch_size = max(1, batch_size)
+        self._flush_interval_seconds = flush_interval_seconds
+
+        self._pending: list[MessageLog] = []
+        self._flush_lock = asyncio.Lock()
+        self._wake_event = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._last_created_at: datetime | None = None
+        self._closed = False
+
+    def add(
+        self,
+        *,
+        session_id: uuid.UUID,
+        role: str,
+        message_type: str,
+        payload: dict,
+        raw_text: str | None,
+    ) -> MessageLog:
+        message = MessageLog(
+            id=uuid.uuid4(),
+            session_id=session_id,
+            role=role,
+            message_type=message_type,
+            payload=JsonCodec.pre_encode(payload),
+            raw_text=raw_text,
+            created_at=self._next_created_at(),
+        )
+        self._pending.append(message)
+
+        if self._task is None and not self._closed:
+            self._task = asyncio.create_task(self._flush_periodically())
+        if len(self._pending) >= self._batch_size:
+            self._wake_event.set()
+        return message
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch = self._pending
+            self._pending = []
+            try:
+                async with self._db_manager.session() as db:
+                    await MessageRepository(db).create_messages([self._to_row(item) for item in batch])
+            except BaseException:
+                # Keep the rows so a later flush can retry them in their original order.
+                self._pending = batch + self._pending
+                raise
+
+    async def close(self) -> None:
+        self._closed = True
+        self._wake_event.set()
+        task = self._task
+        self._task = None
+        if task is not None:
+            await task
+        await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=self._flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+            try:
+                await self.flush()
+            except Exception as exc:
+                logging.getLogger(__name__).warning("[persistence] message batch flush failed: %s", exc)
+
+    def _next_created_at(self) -> datetime:
+        # Strictly increasing timestamps keep created_at ordering identical to stream ordering.
+        created_at = datetime.now(timezone.utc)
+        if self._last_created_at is not None and created_at <= self._last_created_at:
+            created_at = self._last_created_at + timedelta(microseconds=1)
+        self._last_created_at = created_at
+        return created_at
+
+    @classmethod
+    def _to_row(cls, message: MessageLog) -> dict[str, Any]:
+        result = {
+            "id": message.id,
+            "session_id": message.session_id,
+            "role": message.role,
+            "message_type": message.message_type,
+            "payload": message.payload,
+            "raw_text": message.raw_text,
+            "created_at": message.created_at,
+        }
+        return result
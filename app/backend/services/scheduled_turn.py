@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.backend.core.constants import Constants
+
+
+class ScheduledTurn:
+    def __init__(self, *, session_id: uuid.UUID, user_id: uuid.UUID, prompt: str) -> None:
+        self.turn_id = uuid.uuid4()
+        self.session_id = session_id
+        self.user_id = user_id
+        self.prompt = prompt
+        self.status = Constants.TURN_STATUS_QUEUED
+        self.enqueued_at = datetime.now(timezone.utc)
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.first_event_id: int | None = None
+        self.started = asyncio.Event()
+        self.suspended = asyncio.Event()
+        self._enqueued_monotonic = time.monotonic()
+
+    def mark_started(self, first_event_id: int) -> float:
+        self.status = Constants.TURN_STATUS_RUNNING
+        self.started_at = datetime.now(timezone.utc)
+        self.first_event_id = first_event_id
+        self.started.set()
+        result = time.monotonic() - self._enqueued_monotonic
+        return result
+
+    def mark_suspended(self) -> None:
+        self.status = Constants.TURN_STATUS_SUSPENDED
+        self.suspended.set()
+
+    def mark_resumed(self) -> None:
+        self.status = Constants.TURN_STATUS_RUNNING
+        self.suspended.clear()
+
+    def mark_finished(self, status: str) -> None:
+        self.status = status
+        self.finished_at = datetime.now(timezone.utc)
+        # Release followers even if the turn never got to start.
+        self.started.set()
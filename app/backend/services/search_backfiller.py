@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import ClassVar
+
+from sqlalchemy import text
+
+from app.backend.core.constants import Constants
+from app.backend.database import DatabaseManager
+from app.backend.models import Base, SearchBackfillState
+from app.backend.repositories import SearchBackfillRepository
+
+
+class SearchBackfiller:
+    # Fills search_vector for rows that existed before the column did. It runs after startup in small keyset
+    # batches, each its own short transaction, so adding search to a large table never holds a lock for long.
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = ("search_rows_backfilled",)
+
+    def __init__(self, *, db_manager: DatabaseManager) -> None:
+        self._db_manager = db_manager
+        self._task: asyncio.Task[None] | None = None
+        self._active = False
+        self._rows_filled = 0
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        task = self._task
+        self._task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_pending(self) -> bool:
+        # False when another worker holds the backfill; it is retried later.
+        async with self._db_manager.dedicated_engine.connect() as lock_connection:
+            lock_connection = await lock_connection.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await lock_connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": Constants.SEARCH_BACKFILL_LOCK_KEY},
+            )
+            if not acquired:
+                return False
+            self._active = True
+            try:
+                async with self._db_manager.session() as db:
+                    states = await SearchBackfillRepository(db).list_pending()
+                for state in states:
+                    await self._fill_table(state)
+            finally:
+                self._active = False
+                await lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": Constants.SEARCH_BACKFILL_LOCK_KEY},
+                )
+        return True
+
+    def stats(self) -> dict[str, int]:
+        result = {
+            "search_backfill_active": int(self._active),
+            "search_rows_backfilled": self._rows_filled,
+        }
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.run_pending():
+                    return
+            except Exception as exc:
+                logging.getLogger(__name__).warning("[search] backfill failed: %s", exc)
+            await asyncio.sleep(Constants.SEARCH_BACKFILL_RETRY_SECONDS)
+
+    async def _fill_table(self, state: SearchBackfillState) -> None:
+        table = Base.metadata.tables.get(state.table_name)
+        column = DatabaseManager.search_column(table) if table is not None else None
+        last_key = state.last_key
+        while True:
+            async with self._db_manager.session() as db:
+                repo = SearchBackfillRepository(db)
+                filled, batch_last_key = (0, None)
+                if table is not None and column is not None:
+                    filled, batch_last_key = await repo.fill_batch(
+                        table,
+                        column,
+                        last_key,
+                        limit=Constants.SEARCH_BACKFILL_BATCH_SIZE,
+                    )
+                await repo.save_progress(
+                    state.table_name,
+                    last_key=batch_last_key or last_key,
+                    filled=filled,
+                    completed=batch_last_key is None,
+                )
+                await db.commit()
+            self._rows_filled += filled
+            if batch_last_key is None:
+                logging.getLogger(__name__).warning("[search] backfilled search_vector of %s", state.table_name)
+                return
+            last_key = batch_last_key
+            await asyncio.sleep(Constants.SEARCH_BACKFILL_PAUSE_SECONDS)
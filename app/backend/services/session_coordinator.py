@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.backend.core.constants import Constants
+from app.backend.core.settings import Settings
+from app.backend.database import DatabaseManager
+from app.backend.services.session_lease import SessionLease
+
+
+class SessionCoordinator:
+    # Cross-process coordination for agent sessions built only on Postgres: advisory locks serialize
+    # prompts per session across workers, and LISTEN/NOTIFY delivers interrupts and AskUserQuestion
+    # answers to whichever worker is running the turn.
+    def __init__(
+        self,
+        *,
+        db_manager: DatabaseManager,
+        settings: Settings,
+        interrupt_handler: Callable[[str], Awaitable[None]],
+        answer_handler: Callable[[str, dict[str, Any]], bool],
+    ) -> None:
+        self._db_manager = db_manager
+        self._settings = settings
+        self._interrupt_handler = interrupt_handler
+        self._answer_handler = answer_handler
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._listener_task: asyncio.Task[None] | None = None
+        self._handler_tasks: set[asyncio.Task[None]] = set()
+        self._answer_claims: dict[str, asyncio.Future[None]] = {}
+
+    @property
+    def worker_id(self) -> str:
+        return self._worker_id
+
+    def start(self) -> None:
+        if not self._settings.coordination_enabled or self._listener_task is not None:
+            return
+        self._listener_task = asyncio.create_task(self._listen_forever())
+
+    async def close(self) -> None:
+        task = self._listener_task
+        self._listener_task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def acquire_session_lease(self, session_id: uuid.UUID) -> SessionLease:
+        lock_key = self._lock_key(session_id)
+        if not self._settings.coordination_enabled:
+            result = SessionLease(None, lock_key)
+            return result
+
+        connection = await self._db_manager.dedicated_engine.connect()
+        try:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            deadline = time.monotonic() + self._settings.coordination_lock_timeout_seconds
+            while True:
+                acquired = await connection.scalar(
+                    text("SELECT pg_try_advisory_lock(:key)"),
+                    {"key": lock_key},
+                )
+                if acquired:
+                    result = SessionLease(connection, lock_key)
+                    return result
+                if time.monotonic() >= deadline:
+                    raise HTTPException(
+                        status_code=409,
+                        detail="Session is already running a prompt",
+                    )
+                await asyncio.sleep(Constants.COORDINATION_LOCK_POLL_SECONDS)
+        except BaseException:
+            await connection.close()
+            raise
+
+    async def publish_interrupt(self, session_id: uuid.UUID) -> None:
+        if not self._settings.coordination_enabled:
+            return
+        await self._notify(
+            Constants.COORDINATION_INTERRUPT_CHANNEL,
+            json.dumps({"session_id": str(session_id), "origin": self._worker_id}),
+        )
+
+    async def publish_answer(self, session_id: uuid.UUID, reply: dict[str, Any]) -> bool:
+        # True once the worker whose turn is waiting on the question claims the answer; False if no
+        # worker does within the claim timeout.
+        if not self._settings.coordination_enabled or self._listener_task is None:
+            return False
+        request_id = uuid.uuid4().hex
+        payload = json.dumps(
+            {"session_id": str(session_id), "origin": self._worker_id, "request_id": request_id, "reply": reply}
+        )
+        if len(payload.encode()) > Constants.COORDINATION_NOTIFY_MAX_BYTES:
+            logging.getLogger(__name__).warning(
+                "[coordination] answer for session %s is too large to route",
+                session_id,
+            )
+            return False
+
+        claim: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._answer_claims[request_id] = claim
+        try:
+            await self._notify(Constants.COORDINATION_ANSWER_CHANNEL, payload)
+            await asyncio.wait_for(claim, timeout=Constants.COORDINATION_ANSWER_CLAIM_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._answer_claims.pop(request_id, None)
+        return True
+
+    async def _notify(self, channel: str, payload: str) -> None:
+        async with self._db_manager.engine.connect() as connection:
+            await connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": channel, "payload": payload},
+            )
+            await connection.commit()
+
+    async def _listen_forever(self) -> None:
+        while True:
+            try:
+                await self._listen_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logging.getLogger(__name__).warning("[coordination] listener error: %s", exc)
+            await asyncio.sleep(Constants.COORDINATION_LISTENER_RETRY_SECONDS)
+
+    async def _listen_once(self) -> None:
+        async with self._db_manager.dedicated_engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            driver_connection = await self._driver_connection(connection)
+            terminated = asyncio.Event()
+            driver_connection.add_termination_listener(lambda _: terminated.set())
+            listeners = {
+                Constants.COORDINATION_INTERRUPT_CHANNEL: self._on_interrupt,
+                Constants.COORDINATION_ANSWER_CHANNEL: self._on_answer,
+                Constants.COORDINATION_ANSWER_CLAIM_CHANNEL: self._on_answer_claim,
+            }
+            for channel, listener in listeners.items():
+                await driver_connection.add_listener(channel, listener)
+            try:
+                await terminated.wait()
+            finally:
+                if not driver_connection.is_closed():
+                    for channel, listener in listeners.items():
+                        await driver_connection.remove_listener(channel, listener)
+
+    def _on_interrupt(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        message = self._decode_notification(payload)
+        if message is None or not message.get("session_id"):
+            return
+        task = asyncio.create_task(self._interrupt_handler(message["session_id"]))
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+
+    def _on_answer(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        message = self._decode_notification(payload)
+        if message is None or not message.get("session_id") or not isinstance(message.get("reply"), dict):
+            return
+        # Only the worker whose turn is waiting on the question delivers it; the rest stay silent.
+        if not self._answer_handler(message["session_id"], message["reply"]):
+            return
+        claim = json.dumps(
+            {"request_id": message.get("request_id"), "origin": self._worker_id, "target": message.get("origin")}
+        )
+        task = asyncio.create_task(self._notify(Constants.COORDINATION_ANSWER_CLAIM_CHANNEL, claim))
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+
+    def _on_answer_claim(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        message = self._decode_notification(payload)
+        if message is None or message.get("target") != self._worker_id:
+            return
+        claim = self._answer_claims.get(message.get("request_id"))
+        if claim is not None and not claim.done():
+            claim.set_result(None)
+
+    def _decode_notification(self, payload: str) -> dict[str, Any] | None:
+        # Notifications this worker sent itself are ignored.
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return None
+        if not isinstance(message, dict) or message.get("origin") == self._worker_id:
+            return None
+        return message
+
+    @classmethod
+    async def _driver_connection(cls, connection: AsyncConnection) -> Any:
+        raw_connection = await connection.get_raw_connection()
+        result = raw_connection.driver_connection
+        return result
+
+    @classmethod
+    def _lock_key(cls, session_id: uuid.UUID) -> int:
+        # Advisory locks take a signed bigint; the first eight bytes of the UUID are well distributed.
+        result = int.from_bytes(session_id.bytes[:8], byteorder="big", signed=True)
+        return result
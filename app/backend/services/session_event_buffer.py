@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from app.backend.core.constants import Constants
+from app.backend.core.sse_frame_encoder import SseFrameEncoder
+
+
+class SessionEventBuffer:
+    # Recent SSE frames of one session, already encoded and numbered with a per-session monotonic id,
+    # so a reconnecting client replays from memory and then follows the live turn.
+    def __init__(self, capacity: int) -> None:
+        self._frames: deque[tuple[int, bytes, bool]] = deque(maxlen=max(1, capacity))
+        self._last_event_id = 0
+        self._changed = asyncio.Condition()
+        self._turn_active = False
+        self.finished_at = time.monotonic()
+
+    @property
+    def turn_active(self) -> bool:
+        return self._turn_active
+
+    @property
+    def last_event_id(self) -> int:
+        return self._last_event_id
+
+    def begin_turn(self) -> int:
+        self._turn_active = True
+        result = self._last_event_id
+        return result
+
+    async def append(self, envelope: dict[str, Any], *, ends_turn: bool = False) -> int:
+        async with self._changed:
+            self._last_event_id += 1
+            event_id = self._last_event_id
+            self._frames.append((event_id, SseFrameEncoder.encode(envelope, event_id=event_id), ends_turn))
+            self._changed.notify_all()
+        return event_id
+
+    async def end_turn(self) -> None:
+        async with self._changed:
+            self._turn_active = False
+            self.finished_at = time.monotonic()
+            self._changed.notify_all()
+
+    async def follow(self, last_event_id: int) -> AsyncGenerator[bytes, None]:
+        cursor = last_event_id
+        while True:
+            async with self._changed:
+                while self._last_event_id == cursor and self._turn_active:
+                    await self._changed.wait()
+                gap = self._is_gap(cursor)
+                if gap:
+                    cursor = self._frames[0][0] - 1 if self._frames else self._last_event_id
+                frames = [(frame, ends_turn) for event_id, frame, ends_turn in self._frames if event_id > cursor]
+                cursor = self._last_event_id
+                finished = not self._turn_active
+
+            if gap:
+                yield self.resync_frame()
+            # A follower stops at the end of the turn it joined, even if the next queued turn already started.
+            for frame, ends_turn in frames:
+                yield frame
+                if ends_turn:
+                    return
+            if finished:
+                return
+
+    def _is_gap(self, last_event_id: int) -> bool:
+        # Ids from another buffer (server restart, other worker) or frames already evicted cannot be replayed.
+        if last_event_id > self._last_event_id:
+            return True
+        if not self._frames:
+            return last_event_id < self._last_event_id
+        oldest_event_id = self._frames[0][0]
+        result = last_event_id < oldest_event_id - 1
+        return result
+
+    @classmethod
+    def resync_frame(cls) -> bytes:
+        result = SseFrameEncoder.encode({"event": Constants.STREAM_EVENT_RESYNC, "payload": {}})
+        return result
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
+from app.backend.core.sse_frame_encoder import SseFrameEncoder
+from app.backend.services.session_event_buffer import SessionEventBuffer
+
+
+class SessionEventHub:
+    # Fans the events of each agent turn out through the session's replay buffer, so HTTP subscribers
+    # can drop and reattach without cancelling or re-running the turn.
+    def __init__(self, *, buffer_size: int, retention_seconds: float) -> None:
+        self._buffer_size = buffer_size
+        self._retention_seconds = retention_seconds
+        self._buffers: dict[str, SessionEventBuffer] = {}
+
+    def begin_turn(self, session_id: str) -> int:
+        self._prune()
+        buffer = self._buffers.get(session_id)
+        if buffer is None:
+            buffer = SessionEventBuffer(self._buffer_size)
+            self._buffers[session_id] = buffer
+        if buffer.turn_active:
+            raise HTTPException(status_code=409, detail="Session is already running a prompt")
+        result = buffer.begin_turn()
+        return result
+
+    async def run_turn(
+        self,
+        session_id: str,
+        events: AsyncIterator[dict[str, Any]],
+        *,
+        done_payload: dict[str, Any],
+    ) -> bool:
+        # Returns False if the turn failed, either by raising or by reporting an error event itself
+        # (an SDK error, or a capacity rejection).
+        buffer = self._buffers[session_id]
+        succeeded = True
+        try:
+            async for envelope in events:
+                if envelope.get("event") == Constants.STREAM_EVENT_ERROR:
+                    succeeded = False
+                await buffer.append(envelope)
+        except Exception as exc:
+            succeeded = False
+            logging.getLogger(__name__).warning("[stream] turn for session %s failed: %s", session_id, exc)
+            await buffer.append(
+                {
+                    "event": Constants.STREAM_EVENT_ERROR,
+                    "payload": {"message": str(exc), "created_at": datetime.now(timezone.utc).isoformat()},
+                }
+            )
+        finally:
+            aclose = getattr(events, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            await buffer.append({"event": Constants.STREAM_EVENT_DONE, "payload": done_payload}, ends_turn=True)
+            await buffer.end_turn()
+        return succeeded
+
+    async def follow(self, session_id: str, last_event_id: int | None) -> AsyncGenerator[bytes, None]:
+        buffer = self._buffers.get(session_id)
+        if buffer is None:
+            # Nothing is running or buffered here; tell a resuming client to reload history instead.
+            if last_event_id is not None:
+                yield SessionEventBuffer.resync_frame()
+            yield SseFrameEncoder.encode({"event": Constants.STREAM_EVENT_DONE, "payload": {}})
+            return
+        async for frame in buffer.follow(buffer.last_event_id if last_event_id is None else last_event_id):
+            # The generator is suspended while the server writes the frame to the client.
+            write_started = time.perf_counter()
+            yield frame
+            Metrics.sse_write_seconds.observe(time.perf_counter() - write_started)
+
+    def stats(self) -> dict[str, int]:
+        result = {
+            "event_buffers": len(self._buffers),
+            "active_turns": sum(1 for buffer in self._buffers.values() if buffer.turn_active),
+        }
+        return result
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [
+            session_id
+            for session_id, buffer in self._buffers.items()
+            if not buffer.turn_active and now - buffer.finished_at > self._retention_seconds
+        ]
+        for session_id in expired:
+            del self._buffers[session_id]
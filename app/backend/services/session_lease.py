@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+class SessionLease:
+    # Ownership of one agent session across workers, held as a session-level Postgres advisory lock.
+    # The lock lives on a dedicated autocommit connection outside the pool. Closing it ends the backend,
+    # so the lock is gone even if the unlock fails or is cancelled, and Postgres drops it if the worker dies.
+    def __init__(self, connection: AsyncConnection | None, lock_key: int) -> None:
+        self._connection = connection
+        self._lock_key = lock_key
+
+    @property
+    def held(self) -> bool:
+        return self._connection is not None
+
+    async def release(self) -> None:
+        connection = self._connection
+        self._connection = None
+        if connection is None:
+            return
+        try:
+            await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self._lock_key})
+        except Exception as exc:
+            logging.getLogger(__name__).warning("[coordination] advisory unlock warning: %s", exc)
+        finally:
+            await connection.close()
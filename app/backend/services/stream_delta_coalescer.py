@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any, ClassVar
+
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
+
+
+class StreamDeltaCoalescer:
+    # With partial messages enabled the SDK yields one StreamEvent per token. Consecutive deltas of the
+    # same content block are merged here and released at most flush_hz times per second; none of them is
+    # persisted, because the SDK follows every block with the complete AssistantMessage.
+    _DELTA_FIELDS: ClassVar[dict[str, str]] = {
+        "text_delta": "text",
+        "thinking_delta": "thinking",
+        "input_json_delta": "partial_json",
+    }
+
+    def __init__(self, *, session_id: str, flush_hz: float) -> None:
+        self._session_id = session_id
+        self._flush_interval_seconds = 1 / flush_hz if flush_hz > 0 else 0.0
+        self._pending: list[dict[str, Any]] = []
+        self._last_flush_at = time.monotonic()
+
+    def add(self, event: Any, *, parent_tool_use_id: str | None) -> dict[str, Any] | None:
+        if not isinstance(event, dict):
+            return None
+        if event.get("type") != Constants.STREAM_SDK_EVENT_CONTENT_BLOCK_DELTA:
+            # Block boundaries and message-level events end the current run.
+            result = self.flush()
+            return result
+
+        delta = event.get("delta")
+        field = self._DELTA_FIELDS.get(delta.get("type")) if isinstance(delta, dict) else None
+        if field is None:
+            return None
+        Metrics.stream_deltas_total.inc()
+
+        key = (parent_tool_use_id, event.get("index"), delta["type"])
+        if self._pending and self._pending[-1]["key"] == key:
+            self._pending[-1]["parts"].append(delta.get(field) or "")
+        else:
+            self._pending.append({"key": key, "field": field, "parts": [delta.get(field) or ""]})
+
+        if time.monotonic() - self._last_flush_at < self._flush_interval_seconds:
+            return None
+        result = self.flush()
+        return result
+
+    async def paced(self, messages: AsyncIterator[Any]) -> AsyncGenerator[Any, None]:
+        # Yields the SDK messages, plus None whenever deltas have been pending for a full flush interval
+        # with no new message; the caller flush()es then, so text does not stall while the model pauses.
+        # The pending read runs as its own task so that a timeout never cancels it.
+        next_message: asyncio.Future[Any] | None = None
+        try:
+            while True:
+                if next_message is None:
+                    next_message = asyncio.ensure_future(anext(messages))
+                timeout = self._flush_timeout()
+                done, _ = await asyncio.wait({next_message}, timeout=timeout)
+                if not done:
+                    yield None
+                    continue
+                finished, next_message = next_message, None
+                try:
+                    message = finished.result()
+                except StopAsyncIteration:
+                    return
+                yield message
+        finally:
+            if next_message is not None:
+                next_message.cancel()
+                await asyncio.gather(next_message, return_exceptions=True)
+
+    def flush(self) -> dict[str, Any] | None:
+        self._last_flush_at = time.monotonic()
+        if not self._pending:
+            return None
+        pending = self._pending
+        self._pending = []
+        Metrics.stream_delta_frames_total.inc()
+        result = {
+            "event": Constants.STREAM_EVENT_DELTA,
+            "payload": {
+                "session_id": self._session_id,
+                "deltas": [self._to_delta(item) for item in pending],
+            },
+        }
+        return result
+
+    def _flush_timeout(self) -> float | None:
+        if not self._pending or self._flush_interval_seconds <= 0:
+            return None
+        result = max(0.0, self._last_flush_at + self._flush_interval_seconds - time.monotonic())
+        return result
+
+    @classmethod
+    def _to_delta(cls, item: dict[str, Any]) -> dict[str, Any]:
+        parent_tool_use_id, index, delta_type = item["key"]
+        result = {
+            "index": index,
+            "type": delta_type,
+            "parent_tool_use_id": parent_tool_use_id,
+            item["field"]: "".join(item["parts"]),
+        }
+        return result
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from typing import Any, ClassVar
+
+from fastapi import HTTPException
+
+from app.backend.core.constants import Constants
+from app.backend.core.metrics import Metrics
+from app.backend.core.sse_frame_encoder import SseFrameEncoder
+from app.backend.services.scheduled_turn import ScheduledTurn
+from app.backend.services.session_event_hub import SessionEventHub
+
+
+class TurnScheduler:
+    # Agent turns are queued FIFO per session and executed by a fixed set of workers, so the number of
+    # turns making progress at once is bounded by the worker count rather than by open requests. A turn
+    # that waits on the user (AskUserQuestion) is suspended: its worker goes back to the queue, and the
+    # turn takes the next free worker, ahead of queued sessions, once the answer is in.
+    COUNTER_STATS: ClassVar[tuple[str, ...]] = ("turns_submitted", "turns_completed", "turns_failed", "turns_rejected")
+
+    def __init__(
+        self,
+        *,
+        event_hub: SessionEventHub,
+        turn_runner: Callable[[ScheduledTurn], AsyncIterator[dict]],
+        worker_count: int,
+        max_pending: int,
+    ) -> None:
+        self._event_hub = event_hub
+        self._turn_runner = turn_runner
+        self._worker_count = max(1, worker_count)
+        self._max_pending = max_pending
+
+        self._pending: dict[uuid.UUID, deque[ScheduledTurn]] = {}
+        # Entries are (priority, sequence, session id or resumed turn); resumed turns sort first.
+        self._ready: asyncio.PriorityQueue[tuple[int, int, uuid.UUID | ScheduledTurn]] = asyncio.PriorityQueue()
+        self._ready_sequence = itertools.count()
+        self._scheduled_sessions: set[uuid.UUID] = set()
+        self._turns: OrderedDict[uuid.UUID, ScheduledTurn] = OrderedDict()
+        self._workers: list[asyncio.Task[None]] = []
+        self._turn_tasks: dict[uuid.UUID, asyncio.Task[None]] = {}
+        self._resume_grants: dict[uuid.UUID, asyncio.Future[None]] = {}
+        self._running = 0
+        self._suspended = 0
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self._worker_count)]
+
+    async def close(self) -> None:
+        tasks = [*self._workers, *self._turn_tasks.values()]
+        self._workers = []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def submit(self, session_id: uuid.UUID, user_id: uuid.UUID, prompt: str) -> ScheduledTurn:
+        if self.queue_depth >= self._max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many queued prompts",
+                headers={"Retry-After": str(Constants.TURN_QUEUE_RETRY_AFTER_SECONDS)},
+            )
+
+        turn = ScheduledTurn(session_id=session_id, user_id=user_id, prompt=prompt)
+        self._pending.setdefault(session_id, deque()).append(turn)
+        self._remember(turn)
+        self._submitted += 1
+        self._schedule(session_id)
+        return turn
+
+    def get_turn(self, session_id: uuid.UUID, turn_id: uuid.UUID) -> ScheduledTurn:
+        turn = self._turns.get(turn_id)
+        if turn is None or turn.session_id != session_id:
+            raise HTTPException(status_code=404, detail="Turn not found")
+        return turn
+
+    def queue_position(self, turn: ScheduledTurn) -> int | None:
+        pending = self._pending.get(turn.session_id)
+        if turn.status != Constants.TURN_STATUS_QUEUED or not pending or turn not in pending:
+            return None
+        result = pending.index(turn)
+        return result
+
+    async def suspend(self, turn: ScheduledTurn, awaitable: Awaitable[Any]) -> Any:
+        turn.mark_suspended()
+        self._suspended += 1
+        try:
+            result = await awaitable
+        finally:
+            self._suspended -= 1
+            await self._resume(turn)
+        return result
+
+    @property
+    def queue_depth(self) -> int:
+        result = sum(len(pending) for pending in self._pending.values())
+        return result
+
+    async def follow(self, turn: ScheduledTurn, last_event_id: int | None) -> AsyncGenerator[bytes, None]:
+        if not turn.started.is_set():
+            yield SseFrameEncoder.encode(
+                {
+                    "event": Constants.STREAM_EVENT_QUEUED,
+                    "payload": {"turn_id": str(turn.turn_id), "queue_position": self.queue_position(turn)},
+                }
+            )
+            await turn.started.wait()
+
+        cursor = turn.first_event_id if last_event_id is None else last_event_id
+        async for frame in self._event_hub.follow(str(turn.session_id), cursor):
+            yield frame
+
+    def stats(self) -> dict[str, int | float]:
+        started = self._completed + self._failed + self._running
+        result = {
+            "turn_workers": self._worker_count,
+            "turns_running": self._running - self._suspended,
+            "turns_suspended": self._suspended,
+            "turn_queue_depth": self.queue_depth,
+            "turn_queue_max_pending": self._max_pending,
+            "turns_submitted": self._submitted,
+            "turns_completed": self._completed,
+            "turns_failed": self._failed,
+            "turns_rejected": self._rejected,
+            "turn_wait_seconds_avg": self._wait_seconds_total / started if started else 0.0,
+            "turn_wait_seconds_max": self._wait_seconds_max,
+        }
+        return result
+
+    def _schedule(self, session_id: uuid.UUID) -> None:
+        # A session is on the ready queue at most once, which keeps its turns strictly sequential.
+        if session_id in self._scheduled_sessions or not self._pending.get(session_id):
+            return
+        self._scheduled_sessions.add(session_id)
+        self._ready.put_nowait((Constants.TURN_READY_PRIORITY_SESSION, next(self._ready_sequence), session_id))
+
+    async def _resume(self, turn: ScheduledTurn) -> None:
+        grant: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._resume_grants[turn.turn_id] = grant
+        self._ready.put_nowait((Constants.TURN_READY_PRIORITY_RESUMED, next(self._ready_sequence), turn))
+        try:
+            await grant
+        finally:
+            self._resume_grants.pop(turn.turn_id, None)
+
+    def _remember(self, turn: ScheduledTurn) -> None:
+        self._turns[turn.turn_id] = turn
+        while len(self._turns) > Constants.TURN_HISTORY_MAX_ENTRIES:
+            oldest_id, oldest = next(iter(self._turns.items()))
+            if oldest.finished_at is None:
+                break
+            del self._turns[oldest_id]
+
+    async def _work(self) -> None:
+        while True:
+            _, _, item = await self._ready.get()
+            if isinstance(item, ScheduledTurn):
+                turn = item
+                task = self._turn_tasks.get(turn.turn_id)
+                grant = self._resume_grants.get(turn.turn_id)
+                # The turn was cancelled while it waited for a worker.
+                if task is None or grant is None or grant.done():
+                    continue
+                turn.mark_resumed()
+                grant.set_result(None)
+            else:
+                turn = self._take_pending(item)
+                task = asyncio.create_task(self._execute(turn))
+                self._turn_tasks[turn.turn_id] = task
+            await self._hold(turn, task)
+
+    async def _hold(self, turn: ScheduledTurn, task: asyncio.Task[None]) -> None:
+        # The worker stays with its turn until the turn finishes or suspends.
+        suspended = asyncio.ensure_future(turn.suspended.wait())
+        try:
+            await asyncio.wait((task, suspended), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            suspended.cancel()
+
+    def _take_pending(self, session_id: uuid.UUID) -> ScheduledTurn:
+        pending = self._pending[session_id]
+        result = pending.popleft()
+        if not pending:
+            del self._pending[session_id]
+        return result
+
+    async def _execute(self, turn: ScheduledTurn) -> None:
+        session_id = turn.session_id
+        self._running += 1
+        status = Constants.TURN_STATUS_FAILED
+        try:
+            first_event_id = self._event_hub.begin_turn(str(session_id))
+            wait_seconds = turn.mark_started(first_event_id)
+            self._wait_seconds_total += wait_seconds
+            self._wait_seconds_max = max(self._wait_seconds_max, wait_seconds)
+            Metrics.turn_queue_wait_seconds.observe(wait_seconds)
+            turn_started = time.perf_counter()
+            succeeded = await self._event_hub.run_turn(
+                str(session_id),
+                self._turn_runner(turn),
+                done_payload={"turn_id": str(turn.turn_id)},
+            )
+            Metrics.turn_seconds.observe(time.perf_counter() - turn_started)
+            if succeeded:
+                status = Constants.TURN_STATUS_COMPLETED
+        except Exception as exc:
+            logging.getLogger(__name__).warning("[scheduler] turn %s failed: %s", turn.turn_id, exc)
+        finally:
+            self._running -= 1
+            self._turn_tasks.pop(turn.turn_id, None)
+            turn.mark_finished(status)
+            if status == Constants.TURN_STATUS_COMPLETED:
+                self._completed += 1
+            else:
+                self._failed += 1
+            self._scheduled_sessions.discard(session_id)
+            self._schedule(session_id)
@@ -1,14 +1,28 @@
+const PAGE_LIMIT = 200;
+const STREAM_RECONNECT_ATTEMPTS = 5;
+const STREAM_RECONNECT_DELAY_MS = 500;
+const SEARCH_LIMIT = 20;
+const SEARCH_DEBOUNCE_MS = 250;
+
 const state = {
   users: [],
   sessions: [],
   currentUserId: null,
   currentSessionId: null,
+  messageCursor: null,
+  logCursor: null,
+  oldestMessageCursor: null,
+  renderedMessageIds: new Set(),
+  lastEventId: null,
+  liveDraft: null,
   isStreaming: false,
   timerIntervalId: null,
   timerStartedAt: null,
   askModalQueue: [],
   askModalIsOpen: false,
   shownAskMessageIds: new Set(),
+  searchTimerId: null,
+  searchSeq: 0,
 };
 
 const elements = {
@@ -17,7 +31,10 @@ const elements = {
   interruptBtn: document.getElementById("interruptBtn"),
   themeToggle: document.getElementById("themeToggle"),
   sessionsList: document.getElementById("sessionsList"),
+  searchInput: document.getElementById("searchInput"),
+  searchResults: document.getElementById("searchResults"),
   messagesList: document.getElementById("messagesList"),
+  loadOlderBtn: document.getElementById("loadOlderBtn"),
   sessionLogsList: document.getElementById("sessionLogsList"),
   promptForm: document.getElementById("promptForm"),
   promptInput: document.getElementById("promptInput"),
@@ -50,6 +67,43 @@ async function fetchJSON(url, options = {}) {
   return response.json();
 }
 
+function pageUrl(base, params) {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== null && value !== undefined) {
+      query.set(key, value);
+    }
+  });
+  const text = query.toString();
+  return text ? `${base}?${text}` : base;
+}
+
+async function fetchPagesAfter(base, cursor) {
+  const items = [];
+  let after = cursor;
+  while (true) {
+    const page = await fetchJSON(pageUrl(base, { limit: PAGE_LIMIT, after }));
+    items.push(...page);
+    if (page.length < PAGE_LIMIT) {
+      return items;
+    }
+    after = page[page.length - 1].cursor;
+  }
+}
+
+async function fetchPagesBefore(base) {
+  const items = [];
+  let before = null;
+  while (true) {
+    const page = await fetchJSON(pageUrl(base, { limit: PAGE_LIMIT, before }));
+    items.push(...page);
+    if (page.length < PAGE_LIMIT) {
+      return items;
+    }
+    before = page[page.length - 1].cursor;
+  }
+}
+
 function applyTheme(theme) {
   document.documentElement.setAttribute("data-theme", theme);
   localStorage.setItem("theme", theme);
@@ -192,7 +246,10 @@ function questionTitle(question, index) {
 }
 
 function buildAskUserAnswer(questions, selectedOptionIndexes, textAnswers) {
+  // Returns the combined text (used when the answer has to be sent as a new prompt) and the
+  // per-question answers keyed by question text, which a suspended turn hands back to the tool.
   const parts = [];
+  const answers = {};
 
   for (let index = 0; index < questions.length; index += 1) {
     const question = questions[index];
@@ -216,13 +273,13 @@ function buildAskUserAnswer(questions, selectedOptionIndexes, textAnswers) {
     }
 
     parts.push({ title, answer });
+    if (question.question) {
+      answers[question.question] = answer;
+    }
   }
 
-  if (parts.length === 1) {
-    return parts[0].answer;
-  }
-
-  return parts.map((item) => `${item.title}: ${item.answer}`).join("\n");
+  const text = parts.length === 1 ? parts[0].answer : parts.map((item) => `${item.title}: ${item.answer}`).join("\n");
+  return { text, answers };
 }
 
 function askMessageKey(message) {
@@ -306,7 +363,7 @@ function renderSessions() {
   state.sessions.forEach((session) => {
     const div = document.createElement("div");
     div.className = "session-item";
-    if (session.id === state.currentSessionId) {
+    if (session.session_id === state.currentSessionId) {
       div.classList.add("active");
     }
 
@@ -317,15 +374,115 @@ function renderSessions() {
     meta.className = "session-meta";
     meta.textContent = `${session.model} | ${session.permission_mode}`;
 
+    const stats = document.createElement("div");
+    stats.className = "session-meta";
+    stats.textContent = [
+      `${session.message_count} msgs`,
+      `${session.turn_count} turns`,
+      `$${session.total_cost_usd.toFixed(4)}`,
+      formatTime(session.last_activity_at),
+    ].join(" | ");
+
     div.appendChild(title);
     div.appendChild(meta);
+    div.appendChild(stats);
+
+    if (session.last_message_preview) {
+      const preview = document.createElement("div");
+      preview.className = "session-meta session-preview";
+      preview.textContent = session.last_message_preview;
+      div.appendChild(preview);
+    }
 
-    div.addEventListener("click", () => selectSession(session.id));
+    div.addEventListener("click", () => selectSession(session.session_id));
     elements.sessionsList.appendChild(div);
   });
 }
 
+function renderSnippet(container, snippet) {
+  // The server marks matches with <mark> tags; everything else is inserted as plain text.
+  snippet.split(/(<mark>.*?<\/mark>)/).forEach((part) => {
+    if (part.startsWith("<mark>") && part.endsWith("</mark>")) {
+      const mark = document.createElement("mark");
+      mark.textContent = part.slice("<mark>".length, -"</mark>".length);
+      container.appendChild(mark);
+    } else if (part) {
+      container.appendChild(document.createTextNode(part));
+    }
+  });
+}
+
+function renderSearchResults(hits) {
+  elements.searchResults.innerHTML = "";
+  elements.searchResults.classList.toggle("is-hidden", hits === null);
+  if (hits === null) {
+    return;
+  }
+  if (hits.length === 0) {
+    const empty = document.createElement("div");
+    empty.className = "session-meta";
+    empty.textContent = "No matches";
+    elements.searchResults.appendChild(empty);
+    return;
+  }
+
+  hits.forEach((hit) => {
+    const div = document.createElement("div");
+    div.className = "session-item";
+
+    const title = document.createElement("div");
+    title.textContent = hit.session_title;
+
+    const meta = document.createElement("div");
+    meta.className = "session-meta";
+    meta.textContent = [hit.kind === "session" ? "title" : hit.role, formatTime(hit.created_at)].join(" | ");
+
+    const snippet = document.createElement("div");
+    snippet.className = "session-meta search-snippet";
+    renderSnippet(snippet, hit.snippet);
+
+    div.appendChild(title);
+    div.appendChild(meta);
+    div.appendChild(snippet);
+    div.addEventListener("click", () => selectSession(hit.session_id));
+    elements.searchResults.appendChild(div);
+  });
+}
+
+function scheduleSearch() {
+  clearTimeout(state.searchTimerId);
+  state.searchTimerId = setTimeout(runSearch, SEARCH_DEBOUNCE_MS);
+}
+
+async function runSearch() {
+  // Responses can arrive out of order while typing; only the latest query is rendered.
+  const seq = ++state.searchSeq;
+  const query = elements.searchInput.value.trim();
+  if (!query || !state.currentUserId) {
+    renderSearchResults(null);
+    return;
+  }
+  try {
+    const url = pageUrl(`/api/users/${state.currentUserId}/search`, { q: query, limit: SEARCH_LIMIT });
+    const hits = await fetchJSON(url);
+    if (seq === state.searchSeq) {
+      renderSearchResults(hits);
+    }
+  } catch (error) {
+    if (seq === state.searchSeq) {
+      renderSearchResults([]);
+    }
+  }
+}
+
 function renderMessage(message, options = {}) {
+  if (message.id) {
+    if (state.renderedMessageIds.has(message.id)) {
+      return;
+    }
+    state.renderedMessageIds.add(message.id);
+  }
+
   const fragment = elements.messageTemplate.content.cloneNode(true);
   const wrapper = fragment.querySelector(".message-item");
   const role = fragment.querySelector(".message-role");
@@ -345,25 +502,37 @@ function renderMessage(message, options = {}) {
     wrapper.classList.add("is-error");
   }
 
+  if (options.older) {
+    elements.messagesList.append(fragment);
+    return;
+  }
   elements.messagesList.prepend(fragment);
   elements.messagesList.scrollTop = 0;
 }
 
 function renderMessages(messages) {
   elements.messagesList.innerHTML = "";
+  state.renderedMessageIds = new Set();
+  state.liveDraft = null;
   messages.forEach((message) => renderMessage(message, { showAskModal: false }));
 }
 
+function renderLog(log) {
+  const fragment = elements.logTemplate.content.cloneNode(true);
+  fragment.querySelector(".log-type").textContent = log.event_type;
+  fragment.querySelector(".log-time").textContent = formatTime(log.created_at);
+  fragment.querySelector(".log-content").textContent = JSON.stringify(log.details || {}, null, 2);
+  elements.sessionLogsList.prepend(fragment);
+  elements.sessionLogsList.scrollTop = 0;
+}
+
 function renderLogs(logs) {
   elements.sessionLogsList.innerHTML = "";
-  logs.forEach((log) => {
-    const fragment = elements.logTemplate.content.cloneNode(true);
-    fragment.querySelector(".log-type").textContent = log.event_type;
-    fragment.querySelector(".log-time").textContent = formatTime(log.created_at);
-    fragment.querySelector(".log-content").textContent = JSON.stringify(log.details || {}, null, 2);
-    elements.sessionLogsList.prepend(fragment);
-  });
-  elements.sessionLogsList.scrollTop = 0;
+  logs.forEach(renderLog);
+}
+
+function setLoadOlderVisible(visible) {
+  elements.loadOlderBtn.classList.toggle("is-hidden", !visible);
 }
 
 async function loadUsers() {
@@ -389,36 +558,98 @@ async function loadSessions() {
   if (!state.currentUserId) {
     return;
   }
-  state.sessions = await fetchJSON(`/api/users/${state.currentUserId}/sessions`);
-  renderSessions();
+  await refreshSessionList();
 
-  if (!state.currentSessionId || !state.sessions.some((item) => item.id === state.currentSessionId)) {
-    state.currentSessionId = state.sessions[0] ? state.sessions[0].id : null;
+  if (!state.currentSessionId || !state.sessions.some((item) => item.session_id === state.currentSessionId)) {
+    state.currentSessionId = state.sessions[0] ? state.sessions[0].session_id : null;
   }
 
   renderSessions();
   if (state.currentSessionId) {
+    warmSession(state.currentSessionId);
     await refreshConversation(state.currentSessionId);
   } else {
     renderMessages([]);
     renderLogs([]);
+    setLoadOlderVisible(false);
   }
 }
 
+async function refreshSessionList() {
+  // The sidebar reads the per-session summary rows only, newest activity first.
+  state.sessions = await fetchPagesBefore(`/api/users/${state.currentUserId}/session-summaries`);
+  renderSessions();
+}
+
 async function selectSession(sessionId) {
   resetAskModalState();
   state.currentSessionId = sessionId;
   renderSessions();
+  warmSession(sessionId);
   await refreshConversation(sessionId);
 }
 
-async function refreshConversation(sessionId) {
+function warmSession(sessionId) {
+  // Best effort: lets the server connect a Claude client while the user is still reading or typing.
+  if (!sessionId || state.isStreaming) {
+    return;
+  }
+  fetchJSON(`/api/sessions/${sessionId}/warm`, { method: "POST" }).catch(() => {});
+}
+
+async function refreshConversation(sessionId, options = {}) {
+  // Incremental refreshes only fetch rows after the last cursor; rows already streamed are skipped by id.
+  const incremental = Boolean(options.incremental);
+  const messagesUrl = `/api/sessions/${sessionId}/messages`;
+  const logsUrl = `/api/sessions/${sessionId}/logs`;
+
   const [messages, logs] = await Promise.all([
-    fetchJSON(`/api/sessions/${sessionId}/messages`),
-    fetchJSON(`/api/sessions/${sessionId}/logs`),
+    incremental
+      ? fetchPagesAfter(messagesUrl, state.messageCursor)
+      : fetchJSON(pageUrl(messagesUrl, { limit: PAGE_LIMIT })),
+    incremental ? fetchPagesAfter(logsUrl, state.logCursor) : fetchJSON(pageUrl(logsUrl, { limit: PAGE_LIMIT })),
   ]);
-  renderMessages(messages);
-  renderLogs(logs);
+
+  if (incremental) {
+    messages.forEach((message) => renderMessage(message, { showAskModal: false }));
+    logs.forEach(renderLog);
+  } else {
+    renderMessages(messages);
+    renderLogs(logs);
+    state.messageCursor = null;
+    state.logCursor = null;
+    state.oldestMessageCursor = messages.length > 0 ? messages[0].cursor : null;
+    setLoadOlderVisible(messages.length >= PAGE_LIMIT);
+  }
+
+  if (messages.length > 0) {
+    state.messageCursor = messages[messages.length - 1].cursor;
+  }
+  if (logs.length > 0) {
+    state.logCursor = logs[logs.length - 1].cursor;
+  }
+}
+
+async function loadOlderMessages() {
+  if (!state.currentSessionId || !state.oldestMessageCursor) {
+    return;
+  }
+
+  const messages = await fetchJSON(
+    pageUrl(`/api/sessions/${state.currentSessionId}/messages`, {
+      limit: PAGE_LIMIT,
+      before: state.oldestMessageCursor,
+    }),
+  );
+  messages
+    .slice()
+    .reverse()
+    .forEach((message) => renderMessage(message, { showAskModal: false, older: true }));
+
+  if (messages.length > 0) {
+    state.oldestMessageCursor = messages[0].cursor;
+  }
+  setLoadOlderVisible(messages.length >= PAGE_LIMIT);
 }
 
 async function createSession() {
@@ -444,7 +675,12 @@ function setStreaming(enabled) {
 
 function parseSSEChunk(rawChunk, onEnvelope) {
   const lines = rawChunk.split("\n");
+  let eventId = null;
   for (const line of lines) {
+    if (line.startsWith("id: ")) {
+      eventId = Number(line.slice(4).trim());
+      continue;
+    }
     if (!line.startsWith("data: ")) {
       continue;
     }
@@ -452,25 +688,71 @@ function parseSSEChunk(rawChunk, onEnvelope) {
     if (!payload) {
       continue;
     }
-    onEnvelope(JSON.parse(payload));
+    onEnvelope(JSON.parse(payload), eventId);
   }
 }
 
-async function streamPrompt(prompt) {
-  const response = await fetch(`/api/sessions/${state.currentSessionId}/messages/stream`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ prompt }),
-  });
+function renderDelta(payload) {
+  // Partial output is shown in a transient bubble that the complete assistant message replaces.
+  const text = (payload.deltas || [])
+    .filter((delta) => delta.type === "text_delta" && !delta.parent_tool_use_id)
+    .map((delta) => delta.text)
+    .join("");
+  if (!text) {
+    return;
+  }
 
-  if (!response.ok || !response.body) {
-    const errorBody = await response.text();
-    throw new Error(`Streaming failed: ${response.status} ${response.statusText} ${errorBody}`);
+  if (!state.liveDraft) {
+    const fragment = elements.messageTemplate.content.cloneNode(true);
+    const wrapper = fragment.querySelector(".message-item");
+    fragment.querySelector(".message-role").textContent = "assistant · typing";
+    fragment.querySelector(".message-time").textContent = formatTime(new Date().toISOString());
+    state.liveDraft = { wrapper, content: fragment.querySelector(".message-content"), text: "" };
+    elements.messagesList.prepend(fragment);
   }
+  state.liveDraft.text += text;
+  state.liveDraft.content.textContent = state.liveDraft.text;
+}
 
+function clearLiveDraft() {
+  if (state.liveDraft) {
+    state.liveDraft.wrapper.remove();
+    state.liveDraft = null;
+  }
+}
+
+function handleStreamEnvelope(envelope) {
+  if (envelope.event === "delta") {
+    renderDelta(envelope.payload);
+  }
+  if (envelope.event === "message" || envelope.event === "error" || envelope.event === "done") {
+    clearLiveDraft();
+  }
+  if (envelope.event === "message") {
+    renderMessage(envelope.payload);
+    if (envelope.payload && envelope.payload.message_type === "ResultMessage") {
+      stopResponseTimer();
+    }
+  }
+  if (envelope.event === "error") {
+    const errorPayload = {
+      role: "system",
+      message_type: "error",
+      created_at: envelope.payload.created_at,
+      payload: { content: envelope.payload.message },
+      raw_text: envelope.payload.message,
+    };
+    renderMessage(errorPayload);
+    stopResponseTimer();
+  }
+}
+
+async function readEventStream(response, sessionId) {
+  // Returns true once the server reports the turn as done; false means the connection dropped early.
   const reader = response.body.getReader();
   const decoder = new TextDecoder("utf-8");
   let buffer = "";
+  let turnDone = false;
 
   while (true) {
     const { done, value } = await reader.read();
@@ -483,36 +765,115 @@ async function streamPrompt(prompt) {
     buffer = blocks.pop() || "";
 
     for (const block of blocks) {
-      parseSSEChunk(block, (envelope) => {
-        if (envelope.event === "message") {
-          renderMessage(envelope.payload);
-          if (envelope.payload && envelope.payload.message_type === "ResultMessage") {
-            stopResponseTimer();
-          }
+      let resync = false;
+      parseSSEChunk(block, (envelope, eventId) => {
+        if (eventId !== null) {
+          state.lastEventId = eventId;
         }
-        if (envelope.event === "error") {
-          const errorPayload = {
-            role: "system",
-            message_type: "error",
-            created_at: envelope.payload.created_at,
-            payload: { content: envelope.payload.message },
-            raw_text: envelope.payload.message,
-          };
-          renderMessage(errorPayload);
-          stopResponseTimer();
+        if (envelope.event === "done") {
+          turnDone = true;
         }
+        if (envelope.event === "resync") {
+          resync = true;
+        }
+        handleStreamEnvelope(envelope);
       });
+      if (resync) {
+        await refreshConversation(sessionId, { incremental: true });
+      }
+    }
+  }
+  return turnDone;
+}
+
+async function streamPrompt(prompt) {
+  const sessionId = state.currentSessionId;
+  const response = await fetch(`/api/sessions/${sessionId}/messages/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ prompt }),
+  });
+
+  if (!response.ok || !response.body) {
+    const errorBody = await response.text();
+    throw new Error(`Streaming failed: ${response.status} ${response.statusText} ${errorBody}`);
+  }
+
+  const turnId = response.headers.get("X-Turn-Id");
+  const resumeUrl = turnId
+    ? `/api/sessions/${sessionId}/turns/${turnId}/events`
+    : `/api/sessions/${sessionId}/events`;
+  await followTurnStream(response, sessionId, resumeUrl);
+}
+
+async function streamTurn(turnId) {
+  const sessionId = state.currentSessionId;
+  const url = `/api/sessions/${sessionId}/turns/${turnId}/events`;
+  const response = await fetch(url);
+
+  if (!response.ok || !response.body) {
+    const errorBody = await response.text();
+    throw new Error(`Streaming failed: ${response.status} ${response.statusText} ${errorBody}`);
+  }
+
+  await followTurnStream(response, sessionId, url);
+}
+
+async function followTurnStream(response, sessionId, resumeUrl) {
+  state.lastEventId = null;
+  let turnDone = false;
+  try {
+    turnDone = await readEventStream(response, sessionId);
+  } catch (error) {
+    turnDone = false;
+  }
+
+  // The turn keeps running on the server; reattach and replay from the last event id we saw.
+  let attempts = 0;
+  while (!turnDone && attempts < STREAM_RECONNECT_ATTEMPTS && state.currentSessionId === sessionId) {
+    attempts += 1;
+    await new Promise((resolve) => setTimeout(resolve, STREAM_RECONNECT_DELAY_MS * attempts));
+    try {
+      const headers = state.lastEventId === null ? {} : { "Last-Event-ID": String(state.lastEventId) };
+      const resumed = await fetch(resumeUrl, { headers });
+      if (!resumed.ok || !resumed.body) {
+        continue;
+      }
+      const previousEventId = state.lastEventId;
+      turnDone = await readEventStream(resumed, sessionId);
+      if (state.lastEventId !== previousEventId) {
+        attempts = 0;
+      }
+    } catch (error) {
+      // Retry until the attempt budget is spent; the final refresh picks up anything missed.
     }
   }
 }
 
 async function submitPrompt(prompt) {
+  await runTurn(() => streamPrompt(prompt));
+}
+
+async function submitAnswer(answer) {
+  const result = await fetchJSON(`/api/sessions/${state.currentSessionId}/answers`, {
+    method: "POST",
+    body: JSON.stringify({ answer: answer.text, answers: answer.answers }),
+  });
+  // A delivered answer resumes the suspended turn, whose stream is still open.
+  if (result.delivered) {
+    return;
+  }
+  await runTurn(() => streamTurn(result.turn.turn_id));
+}
+
+async function runTurn(stream) {
   startResponseTimer();
   setStreaming(true);
 
   try {
-    await streamPrompt(prompt);
-    await refreshConversation(state.currentSessionId);
+    await stream();
+    await refreshConversation(state.currentSessionId, { incremental: true });
+    await refreshSessionList();
   } catch (error) {
     const payload = {
       role: "system",
@@ -610,7 +971,7 @@ function renderAskUserRequest(request, requestIndex, onSubmitted) {
   actions.appendChild(status);
 
   submitButton.addEventListener("click", async () => {
-    if (state.isStreaming || !state.currentSessionId) {
+    if (!state.currentSessionId) {
       return;
     }
 
@@ -626,7 +987,7 @@ function renderAskUserRequest(request, requestIndex, onSubmitted) {
     submitButton.disabled = true;
 
     try {
-      await submitPrompt(answer);
+      await submitAnswer(answer);
       status.textContent = "Submitted.";
       if (onSubmitted) {
         onSubmitted();
@@ -663,7 +1024,7 @@ async function interruptCurrentSession() {
   }
   try {
     await fetchJSON(`/api/sessions/${state.currentSessionId}/interrupt`, { method: "POST" });
-    await refreshConversation(state.currentSessionId);
+    await refreshConversation(state.currentSessionId, { incremental: true });
   } catch (error) {
     const payload = {
       role: "system",
@@ -680,6 +1041,7 @@ function bindEvents() {
   elements.themeToggle.addEventListener("click", toggleTheme);
   elements.newSessionBtn.addEventListener("click", createSession);
   elements.interruptBtn.addEventListener("click", interruptCurrentSession);
+  elements.loadOlderBtn.addEventListener("click", loadOlderMessages);
   elements.askModalCloseBtn.addEventListener("click", closeAskModal);
   elements.askModal.addEventListener("click", (event) => {
     if (event.target === elements.askModal) {
@@ -695,9 +1057,13 @@ function bindEvents() {
     resetAskModalState();
     state.currentUserId = event.target.value;
     state.currentSessionId = null;
+    elements.searchInput.value = "";
+    renderSearchResults(null);
     await loadSessions();
   });
+  elements.searchInput.addEventListener("input", scheduleSearch);
   elements.promptForm.addEventListener("submit", handlePromptSubmit);
+  elements.promptInput.addEventListener("focus", () => warmSession(state.currentSessionId));
 }
 
 async function bootstrap() {
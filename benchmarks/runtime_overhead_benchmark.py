@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+
+from app.backend.claude_sdk.claude_config_file_manager import ClaudeConfigFileManager
+from app.backend.claude_sdk.claude_options_factory import ClaudeOptionsFactory
+from app.backend.claude_sdk.claude_session_runtime import ClaudeSessionRuntime
+
+
+class RuntimeOverheadBenchmark:
+    # Per-attempt bookkeeping of ClaudeSessionRuntime.query_stream before any SDK work: making sure the
+    # CLI config files exist and building the options for a client.
+    def __init__(self, rounds: int) -> None:
+        self._rounds = rounds
+        self._runtime = ClaudeSessionRuntime(
+            model="claude-sonnet-4-5",
+            permission_mode="bypassPermissions",
+            max_turns=16,
+            system_prompt="You are a careful assistant.",
+            allowed_tools=["Read", "Edit", "Bash"],
+            debug_stderr=False,
+            include_partial_messages=False,
+            resume="3f1c2a9e-6b1d-4a55-9c1e-2d7c1f0a9b11",
+        )
+
+    def run(self) -> None:
+        legacy_seconds = self._measure(self._legacy_attempt)
+        ClaudeConfigFileManager.reset()
+        current_seconds = self._measure(self._current_attempt)
+
+        print(f"attempts per run: {self._rounds}")
+        print(f"legacy  : {legacy_seconds * 1e6 / self._rounds:8.2f} us/attempt")
+        print(f"current : {current_seconds * 1e6 / self._rounds:8.2f} us/attempt")
+        print(f"speedup : {legacy_seconds / current_seconds:8.2f}x")
+
+    def _legacy_attempt(self) -> None:
+        # What every attempt did before: a full filesystem check and a fresh options object.
+        ClaudeConfigFileManager._write_missing_files()
+        ClaudeOptionsFactory.build(
+            model="claude-sonnet-4-5",
+            permission_mode="bypassPermissions",
+            max_turns=16,
+            system_prompt="You are a careful assistant.",
+            allowed_tools=["Read", "Edit", "Bash"],
+            debug_stderr=False,
+            include_partial_messages=False,
+            resume="3f1c2a9e-6b1d-4a55-9c1e-2d7c1f0a9b11",
+        )
+
+    def _current_attempt(self) -> None:
+        ClaudeConfigFileManager.ensure_files()
+        self._runtime._build_options()
+
+    def _measure(self, attempt: Callable[[], None]) -> float:
+        best = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(self._rounds):
+                attempt()
+            best = min(best, time.perf_counter() - started)
+        return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-attempt runtime overhead before and after caching.")
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as home:
+        # Keep the benchmark away from the real ~/.claude files.
+        os.environ["HOME"] = home
+        RuntimeOverheadBenchmark(args.rounds).run()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from claude_code_sdk._internal.message_parser import parse_message
+
+from app.backend.claude_sdk.claude_message_serializer import ClaudeMessageSerializer
+
+
+class LegacyClaudeMessageSerializer(ClaudeMessageSerializer):
+    # The recursive isinstance/asdict walk the serializer used before per-type converters.
+    @classmethod
+    def _to_jsonable(cls, value: Any, memo: dict[int, tuple[Any, Any]] | None = None) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, (str, int, float, bool)):
+            return value
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, list):
+            return [cls._to_jsonable(item) for item in value]
+        if isinstance(value, dict):
+            return {str(key): cls._to_jsonable(item) for key, item in value.items()}
+        if is_dataclass(value):
+            return cls._to_jsonable(asdict(value))
+        if hasattr(value, "model_dump"):
+            return cls._to_jsonable(value.model_dump(mode="json"))
+        if hasattr(value, "__dict__"):
+            return cls._to_jsonable(vars(value))
+        return str(value)
+
+
+class SerializerBenchmark:
+    def __init__(self, fixture_path: Path, rounds: int) -> None:
+        self._messages = [
+            parse_message(json.loads(line))
+            for line in fixture_path.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+        self._rounds = rounds
+
+    def run(self) -> None:
+        for message in self._messages:
+            legacy = LegacyClaudeMessageSerializer.serialize(message)
+            current = ClaudeMessageSerializer.serialize(message)
+            if json.dumps(legacy, sort_keys=True) != json.dumps(current, sort_keys=True):
+                raise AssertionError(f"serializer output changed for {type(message).__name__}")
+
+        legacy_seconds = self._measure(LegacyClaudeMessageSerializer)
+        current_seconds = self._measure(ClaudeMessageSerializer)
+        message_count = len(self._messages) * self._rounds
+
+        print(f"messages serialized per run: {message_count}")
+        print(f"legacy  : {legacy_seconds * 1e6 / message_count:8.2f} us/message")
+        print(f"current : {current_seconds * 1e6 / message_count:8.2f} us/message")
+        print(f"speedup : {legacy_seconds / current_seconds:8.2f}x")
+
+    def _measure(self, serializer: type[ClaudeMessageSerializer]) -> float:
+        best = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(self._rounds):
+                for message in self._messages:
+                    serializer.serialize(message)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare serializer throughput on a recorded SDK stream.")
+    parser.add_argument(
+        "--fixture",
+        type=Path,
+        default=Path(__file__).resolve().parent / "fixtures" / "sdk_stream.jsonl",
+    )
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    SerializerBenchmark(args.fixture, args.rounds).run()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.backend.services.answer_broker import AnswerBroker
+
+
+def test_answer_without_a_running_turn_is_not_delivered() -> None:
+    broker = AnswerBroker(timeout_seconds=1.0)
+
+    assert not broker.deliver(uuid.uuid4(), {"answer": "yes"})
+
+
+def test_answer_to_a_waiting_turn_resumes_it() -> None:
+    async def scenario() -> None:
+        broker = AnswerBroker(timeout_seconds=1.0)
+        session_id = uuid.uuid4()
+        broker.begin_turn(session_id)
+
+        waiter = asyncio.create_task(broker.wait_for_answer(session_id))
+        await asyncio.sleep(0)
+        assert broker.deliver(session_id, {"answer": "yes"})
+
+        assert await waiter == {"answer": "yes"}
+        assert broker.end_turn(session_id) is None
+
+    asyncio.run(scenario())
+
+
+def test_early_answer_is_held_until_the_turn_asks() -> None:
+    async def scenario() -> None:
+        broker = AnswerBroker(timeout_seconds=1.0)
+        session_id = uuid.uuid4()
+        broker.begin_turn(session_id)
+
+        assert broker.deliver(session_id, {"answer": "early"})
+        assert broker.stats()["answers_pending"] == 1
+
+        assert await broker.wait_for_answer(session_id) == {"answer": "early"}
+        assert broker.stats()["answers_pending"] == 0
+        assert broker.end_turn(session_id) is None
+
+    asyncio.run(scenario())
+
+
+def test_held_answer_is_handed_back_when_the_turn_ends_without_asking() -> None:
+    broker = AnswerBroker(timeout_seconds=1.0)
+    session_id = uuid.uuid4()
+    broker.begin_turn(session_id)
+    broker.deliver(session_id, {"answer": "late"})
+
+    assert broker.end_turn(session_id) == {"answer": "late"}
+    assert not broker.deliver(session_id, {"answer": "after"})
+
+
+def test_interrupt_drops_a_held_answer() -> None:
+    broker = AnswerBroker(timeout_seconds=1.0)
+    session_id = uuid.uuid4()
+    broker.begin_turn(session_id)
+    broker.deliver(session_id, {"answer": "stale"})
+
+    broker.cancel(session_id)
+
+    assert broker.end_turn(session_id) is None
+
+
+def test_unanswered_question_times_out_and_parks() -> None:
+    async def scenario() -> None:
+        broker = AnswerBroker(timeout_seconds=0.01)
+        session_id = uuid.uuid4()
+        broker.begin_turn(session_id)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await broker.wait_for_answer(session_id)
+
+        assert broker.stats()["questions_parked"] == 1
+        assert not broker.is_waiting(session_id)
+
+    asyncio.run(scenario())
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.backend.claude_sdk.claude_capacity_error import ClaudeCapacityError
+from app.backend.claude_sdk.claude_process_slots import ClaudeProcessSlots
+
+
+def test_try_acquire_stops_at_the_cap_and_release_frees_a_slot() -> None:
+    slots = ClaudeProcessSlots(max_processes=2, wait_timeout_seconds=1.0)
+
+    assert slots.try_acquire()
+    assert slots.try_acquire()
+    assert not slots.try_acquire()
+    slots.release()
+    assert slots.try_acquire()
+
+    stats = slots.stats()
+    assert stats["process_slots_in_use"] == 2
+    assert stats["process_slots_peak"] == 2
+    assert stats["process_slot_skipped"] == 1
+
+
+def test_release_never_goes_below_zero() -> None:
+    slots = ClaudeProcessSlots(max_processes=1, wait_timeout_seconds=1.0)
+
+    slots.release()
+
+    assert slots.stats()["process_slots_in_use"] == 0
+    assert slots.try_acquire()
+
+
+def test_waiting_acquire_takes_the_released_slot_before_try_acquire() -> None:
+    async def scenario() -> None:
+        slots = ClaudeProcessSlots(max_processes=1, wait_timeout_seconds=1.0)
+        assert slots.try_acquire()
+
+        waiter = asyncio.create_task(slots.acquire())
+        await asyncio.sleep(0)
+        assert slots.stats()["process_slot_waiting"] == 1
+        # A speculative starter must not jump ahead of the waiting turn.
+        slots.release()
+        assert not slots.try_acquire()
+
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert slots.stats()["process_slots_in_use"] == 1
+        assert slots.stats()["process_slot_waiting"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_acquire_reclaims_in_registration_order() -> None:
+    async def scenario() -> None:
+        slots = ClaudeProcessSlots(max_processes=1, wait_timeout_seconds=1.0)
+        assert slots.try_acquire()
+        calls: list[str] = []
+
+        async def nothing_idle() -> bool:
+            calls.append("spare")
+            return False
+
+        async def close_idle_client() -> bool:
+            calls.append("idle")
+            slots.release()
+            return True
+
+        async def never_reached() -> bool:
+            calls.append("never")
+            return True
+
+        slots.add_reclaimer(nothing_idle)
+        slots.add_reclaimer(close_idle_client)
+        slots.add_reclaimer(never_reached)
+
+        await asyncio.wait_for(slots.acquire(), timeout=1.0)
+
+        assert calls == ["spare", "idle"]
+        assert slots.stats()["process_slots_reclaimed"] == 1
+        assert slots.stats()["process_slots_in_use"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_acquire_times_out_when_nothing_can_be_reclaimed() -> None:
+    async def scenario() -> None:
+        slots = ClaudeProcessSlots(max_processes=1, wait_timeout_seconds=0.05)
+        assert slots.try_acquire()
+
+        with pytest.raises(ClaudeCapacityError):
+            await slots.acquire()
+
+        stats = slots.stats()
+        assert stats["process_slot_timeouts"] == 1
+        assert stats["process_slot_waiting"] == 0
+        assert stats["process_slots_in_use"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_acquire_does_not_take_a_slot() -> None:
+    async def scenario() -> None:
+        slots = ClaudeProcessSlots(max_processes=1, wait_timeout_seconds=1.0)
+        assert slots.try_acquire()
+
+        waiter = asyncio.create_task(slots.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        slots.release()
+        assert slots.stats()["process_slot_waiting"] == 0
+        assert slots.try_acquire()
+
+    asyncio.run(scenario())
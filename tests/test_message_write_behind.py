@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from app.backend.services import message_write_behind
+from app.backend.services.message_write_behind import MessageWriteBehind
+
+
+class FlakyMessageRepository:
+    # Stands in for MessageRepository: fails the first `failures` batches, then records what it is given.
+    failures = 0
+    written: list[list[dict[str, Any]]] = []
+
+    def __init__(self, db: Any) -> None:
+        self._db = db
+
+    async def create_messages(self, rows: list[dict[str, Any]]) -> None:
+        if FlakyMessageRepository.failures > 0:
+            FlakyMessageRepository.failures -= 1
+            raise ConnectionError("database went away")
+        FlakyMessageRepository.written.append(rows)
+
+
+class SessionOnlyDatabase:
+    @asynccontextmanager
+    async def session(self) -> AsyncGenerator[object, None]:
+        yield object()
+
+
+@pytest.fixture
+def flaky_repository(monkeypatch: pytest.MonkeyPatch) -> type[FlakyMessageRepository]:
+    monkeypatch.setattr(FlakyMessageRepository, "failures", 0)
+    monkeypatch.setattr(FlakyMessageRepository, "written", [])
+    monkeypatch.setattr(message_write_behind, "MessageRepository", FlakyMessageRepository)
+    return FlakyMessageRepository
+
+
+def add_message(write_behind: MessageWriteBehind, session_id: uuid.UUID, text: str) -> uuid.UUID:
+    message = write_behind.add(
+        session_id=session_id,
+        role="assistant",
+        message_type="AssistantMessage",
+        payload={"text": text},
+        raw_text=text,
+    )
+    return message.id
+
+
+def test_failed_batch_is_retried_ahead_of_newer_rows(flaky_repository: type[FlakyMessageRepository]) -> None:
+    async def scenario() -> None:
+        write_behind = MessageWriteBehind(SessionOnlyDatabase(), batch_size=100, flush_interval_seconds=60.0)
+        session_id = uuid.uuid4()
+        flaky_repository.failures = 1
+        first = [add_message(write_behind, session_id, text) for text in ("a", "b")]
+
+        with pytest.raises(ConnectionError):
+            await write_behind.flush()
+        later = add_message(write_behind, session_id, "c")
+        await write_behind.close()
+
+        assert len(flaky_repository.written) == 1
+        rows = flaky_repository.written[0]
+        assert [row["id"] for row in rows] == [*first, later]
+        created_at = [row["created_at"] for row in rows]
+        assert created_at == sorted(created_at)
+        assert len(set(created_at)) == len(created_at)
+
+    asyncio.run(scenario())
+
+
+def test_background_flush_retries_after_a_failure(flaky_repository: type[FlakyMessageRepository]) -> None:
+    async def scenario() -> None:
+        write_behind = MessageWriteBehind(SessionOnlyDatabase(), batch_size=100, flush_interval_seconds=0.01)
+        session_id = uuid.uuid4()
+        flaky_repository.failures = 2
+        ids = [add_message(write_behind, session_id, text) for text in ("a", "b", "c")]
+
+        async def drained() -> None:
+            while not flaky_repository.written:
+                await asyncio.sleep(0.005)
+
+        await asyncio.wait_for(drained(), timeout=2.0)
+        await write_behind.close()
+
+        assert [row["id"] for rows in flaky_repository.written for row in rows] == ids
+
+    asyncio.run(scenario())
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from app.backend.core.constants import Constants
+from app.backend.services.stream_delta_coalescer import StreamDeltaCoalescer
+
+
+def text_delta(text: str, *, index: int = 0) -> dict[str, Any]:
+    result = {
+        "type": Constants.STREAM_SDK_EVENT_CONTENT_BLOCK_DELTA,
+        "index": index,
+        "delta": {"type": "text_delta", "text": text},
+    }
+    return result
+
+
+def test_consecutive_deltas_of_one_block_are_merged() -> None:
+    coalescer = StreamDeltaCoalescer(session_id="s", flush_hz=1.0)
+
+    assert coalescer.add(text_delta("Hel"), parent_tool_use_id=None) is None
+    assert coalescer.add(text_delta("lo"), parent_tool_use_id=None) is None
+    assert coalescer.add(text_delta("!", index=1), parent_tool_use_id=None) is None
+    frame = coalescer.flush()
+
+    assert frame is not None
+    assert [(delta["index"], delta["text"]) for delta in frame["payload"]["deltas"]] == [(0, "Hello"), (1, "!")]
+    assert coalescer.flush() is None
+
+
+def test_pending_deltas_are_released_while_the_model_pauses() -> None:
+    async def scenario() -> None:
+        coalescer = StreamDeltaCoalescer(session_id="s", flush_hz=20.0)
+        loop = asyncio.get_running_loop()
+        flushed_at: list[tuple[str, float]] = []
+
+        async def sdk_messages() -> AsyncIterator[Any]:
+            yield text_delta("thinking about it")
+            await asyncio.sleep(0.5)
+            yield "result"
+
+        started = loop.time()
+        async for message in coalescer.paced(sdk_messages()):
+            if message is None:
+                frame = coalescer.flush()
+                if frame is not None:
+                    flushed_at.append((frame["payload"]["deltas"][0]["text"], loop.time() - started))
+            elif isinstance(message, dict):
+                coalescer.add(message, parent_tool_use_id=None)
+
+        assert len(flushed_at) == 1
+        text, elapsed = flushed_at[0]
+        assert text == "thinking about it"
+        assert elapsed < 0.4
+
+    asyncio.run(scenario())
+
+
+def test_paced_leaves_no_pending_read_behind_when_closed_early() -> None:
+    async def scenario() -> None:
+        coalescer = StreamDeltaCoalescer(session_id="s", flush_hz=20.0)
+        closed = asyncio.Event()
+
+        async def sdk_messages() -> AsyncIterator[Any]:
+            try:
+                yield "first"
+                await asyncio.sleep(10)
+                yield "never"
+            finally:
+                closed.set()
+
+        paced = coalescer.paced(sdk_messages())
+        assert await anext(paced) == "first"
+        pending_read = asyncio.create_task(anext(paced))
+        await asyncio.sleep(0.01)
+        pending_read.cancel()
+        await asyncio.gather(pending_read, return_exceptions=True)
+        await paced.aclose()
+
+        assert closed.is_set()
+
+    asyncio.run(scenario())
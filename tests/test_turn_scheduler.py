@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from app.backend.core.constants import Constants
+from app.backend.services.scheduled_turn import ScheduledTurn
+from app.backend.services.session_event_hub import SessionEventHub
+from app.backend.services.turn_scheduler import TurnScheduler
+
+TurnBody = Callable[[ScheduledTurn], Awaitable[None]]
+
+
+class ScriptedTurns:
+    # Runs each turn's body by prompt and records when turns start and end.
+    def __init__(self) -> None:
+        self.bodies: dict[str, TurnBody] = {}
+        self.events: list[str] = []
+
+    async def run(self, turn: ScheduledTurn) -> AsyncIterator[dict[str, Any]]:
+        self.events.append(f"{turn.prompt} start")
+        body = self.bodies.get(turn.prompt)
+        if body is not None:
+            await body(turn)
+        self.events.append(f"{turn.prompt} end")
+        yield {"event": Constants.STREAM_EVENT_MESSAGE, "payload": {}}
+
+
+def build_scheduler(turns: ScriptedTurns, *, worker_count: int) -> TurnScheduler:
+    result = TurnScheduler(
+        event_hub=SessionEventHub(buffer_size=64, retention_seconds=60.0),
+        turn_runner=turns.run,
+        worker_count=worker_count,
+        max_pending=16,
+    )
+    return result
+
+
+async def wait_finished(*turns: ScheduledTurn) -> None:
+    async def finished() -> None:
+        while any(turn.finished_at is None for turn in turns):
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(finished(), timeout=2.0)
+
+
+def test_turns_of_one_session_run_in_submission_order() -> None:
+    async def scenario() -> None:
+        turns = ScriptedTurns()
+        gate = asyncio.Event()
+
+        async def first(_: ScheduledTurn) -> None:
+            await gate.wait()
+
+        turns.bodies["1"] = first
+        scheduler = build_scheduler(turns, worker_count=2)
+        scheduler.start()
+        session_id, user_id = uuid.uuid4(), uuid.uuid4()
+        turn_1 = scheduler.submit(session_id, user_id, "1")
+        turn_2 = scheduler.submit(session_id, user_id, "2")
+        await asyncio.sleep(0.02)
+
+        # The second worker is free, but the session's next turn waits for the running one.
+        assert turns.events == ["1 start"]
+        assert scheduler.queue_position(turn_2) == 0
+        gate.set()
+        await wait_finished(turn_1, turn_2)
+        await scheduler.close()
+
+        assert turns.events == ["1 start", "1 end", "2 start", "2 end"]
+        assert turn_1.status == turn_2.status == Constants.TURN_STATUS_COMPLETED
+
+    asyncio.run(scenario())
+
+
+def test_suspended_turn_frees_its_worker_and_resumes_ahead_of_queued_sessions() -> None:
+    async def scenario() -> None:
+        turns = ScriptedTurns()
+        answer: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        release_b = asyncio.Event()
+        scheduler = build_scheduler(turns, worker_count=1)
+
+        async def asks_user(turn: ScheduledTurn) -> None:
+            reply = await scheduler.suspend(turn, answer)
+            turns.events.append(f"A got {reply}")
+
+        async def holds_worker(_: ScheduledTurn) -> None:
+            await release_b.wait()
+
+        turns.bodies["A"] = asks_user
+        turns.bodies["B"] = holds_worker
+        scheduler.start()
+        turn_a = scheduler.submit(uuid.uuid4(), uuid.uuid4(), "A")
+        await asyncio.sleep(0.02)
+        turn_b = scheduler.submit(uuid.uuid4(), uuid.uuid4(), "B")
+        await asyncio.sleep(0.02)
+
+        # A waits on its user without holding the only worker, so B runs.
+        assert turn_a.status == Constants.TURN_STATUS_SUSPENDED
+        assert turns.events == ["A start", "B start"]
+        assert scheduler.stats()["turns_suspended"] == 1
+
+        turn_c = scheduler.submit(uuid.uuid4(), uuid.uuid4(), "C")
+        answer.set_result("yes")
+        await asyncio.sleep(0.02)
+        # The answered turn waits for a worker like everyone else...
+        assert "A got yes" not in turns.events
+        release_b.set()
+        await wait_finished(turn_a, turn_b, turn_c)
+        await scheduler.close()
+
+        # ...but takes it before C, which was queued earlier than A's resume.
+        assert turns.events == ["A start", "B start", "B end", "A got yes", "A end", "C start", "C end"]
+        assert scheduler.stats()["turns_suspended"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_turn_that_raises_is_reported_failed_and_the_session_continues() -> None:
+    async def scenario() -> None:
+        turns = ScriptedTurns()
+
+        async def broken(_: ScheduledTurn) -> None:
+            raise RuntimeError("boom")
+
+        turns.bodies["broken"] = broken
+        scheduler = build_scheduler(turns, worker_count=1)
+        scheduler.start()
+        session_id, user_id = uuid.uuid4(), uuid.uuid4()
+        failed = scheduler.submit(session_id, user_id, "broken")
+        following = scheduler.submit(session_id, user_id, "next")
+        await wait_finished(failed, following)
+        await scheduler.close()
+
+        assert failed.status == Constants.TURN_STATUS_FAILED
+        assert following.status == Constants.TURN_STATUS_COMPLETED
+        assert scheduler.stats()["turns_failed"] == 1
+
+    asyncio.run(scenario())